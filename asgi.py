@@ -0,0 +1,38 @@
+"""
+ASGI configuration for Hobby Budget Tracker.
+
+Run the asyncio variant of the web interface with any ASGI server, e.g.
+``uvicorn asgi:application``. It serves the same page and API as the
+Flask app in wsgi.py, but holds idle connections without a thread each.
+"""
+import sys
+import os
+
+# Add your project directory to the sys.path
+# You can set the PROJECT_HOME environment variable, or edit the default path below
+project_home = os.environ.get('PROJECT_HOME', os.path.dirname(os.path.abspath(__file__)))
+if project_home not in sys.path:
+    sys.path = [project_home] + sys.path
+
+# Set the database path to a writable location
+db_path = os.environ.get('DB_PATH', os.path.join(project_home, 'hobby_budget.db'))
+
+# Threads running database calls, each with its own connection
+db_workers = int(os.environ.get('DB_WORKERS', '4'))
+
+# SQLite storage profile: 'default', 'wal' or 'wal-durable'
+# The same default as wsgi.py, so a database behaves alike under either
+# server. Use 'wal' with more than one worker so reads do not wait for
+# writes, when the database lives on a local disk (WAL does not work on
+# network file systems)
+storage_profile = os.environ.get('DB_STORAGE_PROFILE', 'default')
+
+# Summary, stats and chart results kept in the query cache; 0 disables it
+cache_size = int(os.environ.get('CACHE_SIZE', '256'))
+
+# Import the ASGI app
+from hobby_budget_tracker.asgi import create_asgi_app
+
+# Create the application instance
+application = create_asgi_app(db_path=db_path, workers=db_workers, storage_profile=storage_profile,
+                              cache_size=cache_size)
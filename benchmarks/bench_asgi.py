@@ -0,0 +1,169 @@
+"""
+Benchmark: the ASGI app against the Flask (WSGI) app under concurrent load.
+
+A threaded WSGI server runs one thread per open connection, while an ASGI
+server keeps each connection as a coroutine. Both apps are driven
+in-process, so no server needs to be installed:
+
+* load: ``--clients`` concurrent clients each send requests to
+  ``/api/summary`` back to back; WSGI clients are threads calling the
+  Flask app, ASGI clients are tasks awaiting the ASGI app.
+* idle: ``--idle`` keep-alive connections wait for their next request,
+  as threads blocked on a socket or as tasks awaiting ``receive()``; the
+  resident memory they add is reported.
+
+Usage: python benchmarks/bench_asgi.py [--hobbies N] [--clients N] [--requests N] [--idle N]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.asgi import create_asgi_app  # noqa: E402
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense, Activity  # noqa: E402
+from hobby_budget_tracker.web import create_app  # noqa: E402
+
+PATH = "/api/summary"
+
+
+def populate(db_path: str, hobbies: int):
+    """Fill the database with a few entries per hobby."""
+    db = Database(db_path, storage_profile="wal")
+    for i in range(hobbies):
+        hobby_id = db.add_hobby(Hobby(id=None, name=f"Hobby {i:04d}"))
+        db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=25.0))
+        db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=2.0))
+    db.close()
+
+
+def rss_kib() -> int:
+    """Resident memory of this process in KiB (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def wsgi_load(db_path: str, clients: int, requests: int) -> float:
+    """Return requests per second with one thread per client."""
+    app = create_app(db_path, pool_size=clients, storage_profile="wal")
+
+    def client(count):
+        test_client = app.test_client()
+        for _ in range(count):
+            assert test_client.get(PATH).status_code == 200
+
+    client(1)  # warm up
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, [requests // clients] * clients))
+    elapsed = time.perf_counter() - start
+    app.extensions['db_pool'].close()
+    return (requests // clients * clients) / elapsed
+
+
+async def asgi_get(app, path: str) -> int:
+    """Send a GET request to the ASGI app and return the status."""
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'headers': []}
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]['status']
+
+
+def asgi_load(db_path: str, clients: int, requests: int, workers: int) -> float:
+    """Return requests per second with one task per client."""
+    app = create_asgi_app(db_path, workers=workers, storage_profile="wal")
+
+    async def client(count):
+        for _ in range(count):
+            assert await asgi_get(app, PATH) == 200
+
+    async def run():
+        await client(1)  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(client(requests // clients) for _ in range(clients)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    app.db.close()
+    return (requests // clients * clients) / elapsed
+
+
+def wsgi_idle(connections: int) -> int:
+    """Return the KiB added by threads waiting on idle connections."""
+    release = threading.Event()
+    before = rss_kib()
+    threads = [threading.Thread(target=release.wait) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    used = rss_kib() - before
+    release.set()
+    for thread in threads:
+        thread.join()
+    return used
+
+
+def asgi_idle(connections: int) -> int:
+    """Return the KiB added by tasks waiting on idle connections."""
+    async def run():
+        release = asyncio.Event()
+
+        async def connection():
+            await release.wait()
+
+        before = rss_kib()
+        tasks = [asyncio.ensure_future(connection()) for _ in range(connections)]
+        await asyncio.sleep(0)
+        used = rss_kib() - before
+        release.set()
+        await asyncio.gather(*tasks)
+        return used
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hobbies", type=int, default=20)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4, help="ASGI database threads")
+    parser.add_argument("--idle", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Measure memory first, before the load tests grow the heap
+    print(f"{args.idle} idle keep-alive connections")
+    print(f"  ASGI tasks:  {asgi_idle(args.idle) / 1024:>10.1f} MiB")
+    print(f"  WSGI threads:{wsgi_idle(args.idle) / 1024:>10.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        populate(db_path, args.hobbies)
+        wsgi = wsgi_load(db_path, args.clients, args.requests)
+        asgi = asgi_load(db_path, args.clients, args.requests, args.workers)
+
+    print(f"{args.clients} concurrent clients, {PATH}")
+    print(f"  WSGI ({args.clients} threads):{wsgi:>10.0f} req/s")
+    print(f"  ASGI ({args.workers} db threads):{asgi:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
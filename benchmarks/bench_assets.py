@@ -0,0 +1,89 @@
+"""
+Benchmark: cold and repeat page loads, inline template against static assets.
+
+The baseline is the former single-file page, rendered by Jinja on every
+request and sent uncompressed without validators. The current app sends
+a small shell page plus its script and styles, gzipped once at startup;
+a repeat visit revalidates the shell (304) and takes the hashed assets
+from the browser cache without asking. Chart.js is counted when it is
+vendored in static/vendor/.
+
+Usage: python benchmarks/bench_assets.py [--requests N]
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from flask import Flask, render_template  # noqa: E402
+
+from hobby_budget_tracker.assets import AssetBundle, CHART_JS, STATIC_DIR  # noqa: E402
+from hobby_budget_tracker.web import create_app  # noqa: E402
+
+GZIP = {'Accept-Encoding': 'gzip, deflate, br'}
+
+
+def inline_app(template_dir: str) -> Flask:
+    """Build the former page, with styles and script inline, and an app rendering it."""
+    page = (STATIC_DIR / "index.html").read_text(encoding="utf-8")
+    css = (STATIC_DIR / "app.css").read_text(encoding="utf-8")
+    js = (STATIC_DIR / "app.js").read_text(encoding="utf-8")
+    page = page.replace('<link rel="stylesheet" href="/static/app.css">', f"<style>\n{css}</style>")
+    page = page.replace('<script src="/static/app.js"></script>', f"<script>\n{js}</script>")
+    with open(os.path.join(template_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+
+    app = Flask(__name__, template_folder=template_dir, static_folder=None)
+    app.add_url_rule('/', 'index', lambda: render_template('index.html'))
+    return app
+
+
+def timed(client, requests: int, urls, headers=None):
+    """Return (ms per page load, bytes per page load) fetching ``urls`` in turn."""
+    size = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        size = 0
+        for url, extra in urls:
+            response = client.get(url, headers={**(headers or {}), **extra})
+            size += len(response.data)
+    return (time.perf_counter() - start) / requests * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    bundle = AssetBundle()
+    print(f"Bundle built at startup in {(time.perf_counter() - start) * 1000:.1f} ms"
+          f" (Chart.js {'vendored' if CHART_JS in bundle.assets else 'from CDN'})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old = inline_app(tmp).test_client()
+        app = create_app(os.path.join(tmp, "bench.db"))
+        new = app.test_client()
+        assets = app.extensions['assets']
+        page = assets.index.body.decode()
+        urls = [('/', {})] + [(url, {}) for url in re.findall(r'"(/static/[^"]+)"', page)]
+        etag = new.get('/').headers['ETag']
+
+        shell = [('/', {'If-None-Match': etag})]
+        rows = [
+            ("cold, inline template", 1, timed(old, args.requests, [('/', {})], GZIP)),
+            ("cold, static assets", len(urls), timed(new, args.requests, urls, GZIP)),
+            ("repeat, inline template", 1, timed(old, args.requests, [('/', {})], GZIP)),
+            ("repeat, static assets", 1, timed(new, args.requests, shell, GZIP)),
+        ]
+    print(f"{'page load':<26}{'requests':>10}{'server':>12}{'bytes':>10}")
+    for label, count, (ms, size) in rows:
+        print(f"{label:<26}{count:>10}{ms:>9.2f} ms{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: logging sessions with separate POSTs against one /api/batch request.
+
+Each session is one expense and one activity. Sent separately they take
+two requests, two connection checkouts and two commits; sent as a batch
+they take one of each. By default connections are opened per request
+(pool size 0) with the durable "wal-durable" profile.
+
+Usage: python benchmarks/bench_batch.py [--sessions N] [--pool-size N] [--profile NAME]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.web import create_app  # noqa: E402
+
+
+def separate(client, hobby_id: int, sessions: int):
+    """Log each session as two POSTs."""
+    for i in range(sessions):
+        client.post('/api/expenses', json={'hobby_id': hobby_id, 'amount': 12.5,
+                                           'date': '2024-03-01T09:00:00', 'description': f'Session {i}'})
+        client.post('/api/activities', json={'hobby_id': hobby_id, 'duration_hours': 1.5,
+                                             'date': '2024-03-01T09:00:00', 'description': f'Session {i}'})
+
+
+def batched(client, hobby_id: int, sessions: int):
+    """Log each session as one batch."""
+    for i in range(sessions):
+        client.post('/api/batch', json={'operations': [
+            {'op': 'create', 'type': 'expense', 'data': {'hobby_id': hobby_id, 'amount': 12.5,
+                                                         'description': f'Session {i}'}},
+            {'op': 'create', 'type': 'activity', 'data': {'hobby_id': hobby_id, 'duration_hours': 1.5,
+                                                          'description': f'Session {i}'}},
+        ]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--pool-size", type=int, default=0)
+    parser.add_argument("--profile", default="wal-durable")
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions, pool size {args.pool_size}, profile {args.profile}")
+    for label, log in (("separate POSTs", separate), ("/api/batch", batched)):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app(os.path.join(tmp, "bench.db"), pool_size=args.pool_size,
+                             storage_profile=args.profile)
+            client = app.test_client()
+            hobby_id = client.post('/api/hobbies', json={'name': 'Rowing'}).get_json()['id']
+            start = time.perf_counter()
+            log(client, hobby_id, args.sessions)
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<16}{args.sessions / elapsed:>10.0f} sessions/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: writes/sec from many threads, committing per row or through BatchWriter.
+
+Each thread adds expenses one at a time and waits for the id, like a web
+request handler. Per-row writes use one connection per thread and commit
+every insert; batched writes hand the entries to a single BatchWriter.
+
+Usage: python benchmarks/bench_batch_writer.py [--threads N] [--rows N] [--batch N] [--delay MS]
+                                              [--profile NAME]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database, STORAGE_PROFILES  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense  # noqa: E402
+from hobby_budget_tracker.writer import BatchWriter  # noqa: E402
+
+
+def run_threads(threads: int, rows: int, write) -> float:
+    """Call ``write`` ``rows`` times from each of ``threads`` threads; return rows/sec."""
+    def work():
+        for _ in range(rows):
+            write()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * rows / (time.perf_counter() - start)
+
+
+def per_row(db_path: str, profile: str, hobby_id: int, threads: int, rows: int) -> float:
+    """Each thread commits its own inserts on its own connection."""
+    local = threading.local()
+
+    def write():
+        if not hasattr(local, "db"):
+            local.db = Database(db_path, storage_profile=profile)
+        local.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=1.0))
+
+    return run_threads(threads, rows, write)
+
+
+def batched(db_path: str, profile: str, hobby_id: int, threads: int, rows: int,
+            batch: int, delay: float) -> float:
+    """All threads submit to one BatchWriter and wait for their ids."""
+    writer = BatchWriter(db_path, max_batch=batch, max_delay_ms=delay, storage_profile=profile)
+    try:
+        return run_threads(threads, rows, lambda: writer.submit(
+            Expense(id=None, hobby_id=hobby_id, amount=1.0)).result())
+    finally:
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--profile", choices=sorted(STORAGE_PROFILES), default="default")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = Database(db_path, storage_profile=args.profile)
+        hobby_id = db.add_hobby(Hobby(id=None, name="Bench"))
+        single = per_row(db_path, args.profile, hobby_id, args.threads, args.rows)
+        group = batched(db_path, args.profile, hobby_id, args.threads, args.rows, args.batch, args.delay)
+        assert db.get_hobby_totals(hobby_id)['expense_count'] == 2 * args.threads * args.rows
+        db.close()
+
+    print(f"{args.threads} threads x {args.rows} rows, profile '{args.profile}'")
+    print(f"per-row commit: {single:>10,.0f} rows/s")
+    print(f"BatchWriter (batch {args.batch}, delay {args.delay:g} ms): {group:>10,.0f} rows/s")
+    print(f"speedup: {group / single:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: rows/sec for per-row inserts versus the bulk insert API.
+
+Per-row add_expense() commits after every row, so it is measured on a
+smaller sample (--single-rows) and reported as a rate.
+
+Usage: python benchmarks/bench_bulk_insert.py [--rows N] [--single-rows N] [--chunk-size N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense  # noqa: E402
+
+
+def make_expenses(hobby_id: int, count: int):
+    """Generate ``count`` expenses spread over consecutive minutes."""
+    start = datetime(2020, 1, 1)
+    for i in range(count):
+        yield Expense(id=None, hobby_id=hobby_id, amount=1.0 + i % 50,
+                      description=f"Row {i}", date=start + timedelta(minutes=i))
+
+
+def rate(db_path: str, count: int, insert) -> float:
+    """Insert ``count`` expenses into a fresh database and return rows/sec."""
+    db = Database(db_path)
+    hobby_id = db.add_hobby(Hobby(id=None, name="Bench"))
+    start = time.perf_counter()
+    insert(db, make_expenses(hobby_id, count))
+    elapsed = time.perf_counter() - start
+    assert db.get_hobby_totals(hobby_id)['expense_count'] == count
+    db.close()
+    os.unlink(db_path)
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single-rows", type=int, default=2_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        single = rate(db_path, args.single_rows,
+                      lambda db, expenses: [db.add_expense(expense) for expense in expenses])
+        bulk = rate(db_path, args.rows,
+                    lambda db, expenses: db.add_expenses_many(expenses, chunk_size=args.chunk_size))
+
+    print(f"add_expense (per-row commit, {args.single_rows} rows): {single:>12,.0f} rows/s")
+    print(f"add_expenses_many ({args.rows} rows, chunk {args.chunk_size}):  {bulk:>12,.0f} rows/s")
+    print(f"speedup: {bulk / single:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: `expense list` with a hobby lookup per row against one joined cursor.
+
+The former listing loaded every expense into a list, then ran get_hobby()
+for each one and printed it line by line. The current one streams
+(expense, hobby name) pairs from a single query through a buffered
+writer. Output goes to /dev/null; time and peak traced memory are shown.
+
+Usage: python benchmarks/bench_cli_list.py [--rows N]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.cli import CLI  # noqa: E402
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense  # noqa: E402
+
+
+def populate(db_path: str, rows: int):
+    """Add ``rows`` expenses spread over ten hobbies."""
+    db = Database(db_path)
+    ids = db.add_hobbies_many(Hobby(id=None, name=f"Hobby {i}") for i in range(10))
+    start = datetime(2020, 1, 1)
+    db.add_expenses_many(
+        Expense(id=None, hobby_id=ids[i % 10], amount=12.5, description=f"Item {i}",
+                date=start + timedelta(minutes=i))
+        for i in range(rows)
+    )
+    db.close()
+
+
+def per_row_lookup(cli: CLI):
+    """The former listing: full list, one get_hobby() and print() per expense."""
+    expenses = cli.db.list_expenses()
+    print("\n💶 Expenses:")
+    print("-" * 60)
+    for expense in expenses:
+        hobby = cli.db.get_hobby(expense.hobby_id)
+        date_str = expense.date.strftime("%Y-%m-%d")
+        print(f"{date_str} | {hobby.name:20s} | €{expense.amount:8.2f}")
+        if expense.description:
+            print(f"           {expense.description}")
+    print()
+
+
+def measure(function):
+    """Return (seconds, peak MiB) of ``function`` with stdout sent to /dev/null.
+
+    Memory is traced in a second run, since tracing slows the code down.
+    """
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        populate(db_path, args.rows)
+        cli = CLI(db_path)
+        print(f"{args.rows} expenses")
+        print(f"{'listing':<26}{'time':>10}{'peak memory':>15}")
+        runs = [("get_hobby per row", lambda: per_row_lookup(cli))]
+        runs += [(f"joined cursor, {fmt}", lambda fmt=fmt: cli.run(["expense", "list", "--format", fmt]))
+                 for fmt in ("table", "csv", "jsonl")]
+        for label, function in runs:
+            elapsed, peak = measure(function)
+            print(f"{label:<26}{elapsed:>8.2f} s{peak:>11.1f} MiB")
+        cli.db.close()
+
+
+if __name__ == "__main__":
+    main()
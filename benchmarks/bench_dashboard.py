@@ -0,0 +1,69 @@
+"""
+Benchmark: loading the page's data with separate requests or with /api/dashboard.
+
+Before the dashboard endpoint the page fetched /api/summary, /api/hobbies,
+/api/expenses and /api/activities and joined hobby names in the browser;
+now it fetches /api/dashboard once. Both are timed through the Flask test
+client, with the query cache disabled and enabled.
+
+Usage: python benchmarks/bench_dashboard.py [--hobbies N] [--entries N] [--requests N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense, Activity  # noqa: E402
+from hobby_budget_tracker.web import create_app  # noqa: E402
+
+SEPARATE = ('/api/summary', '/api/hobbies', '/api/expenses', '/api/activities')
+DASHBOARD = ('/api/dashboard',)
+
+
+def populate(db_path: str, hobbies: int, entries: int):
+    """Add ``entries`` expenses and activities spread over ``hobbies`` hobbies."""
+    db = Database(db_path)
+    ids = db.add_hobbies_many(Hobby(id=None, name=f"Hobby {i:03d}") for i in range(hobbies))
+    start = datetime(2020, 1, 1)
+    db.add_expenses_many(Expense(id=None, hobby_id=ids[i % hobbies], amount=12.5,
+                                 date=start + timedelta(hours=i)) for i in range(entries))
+    db.add_activities_many(Activity(id=None, hobby_id=ids[i % hobbies], duration_hours=1.5,
+                                    date=start + timedelta(hours=i)) for i in range(entries))
+    db.close()
+
+
+def measure(client, urls, requests: int) -> float:
+    """Return milliseconds to fetch all ``urls`` once."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        for url in urls:
+            client.get(url)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hobbies", type=int, default=20)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        populate(db_path, args.hobbies, args.entries)
+        print(f"{args.hobbies} hobbies, {args.entries} expenses and activities")
+        print(f"{'cache':<10}{'4 requests':>14}{'dashboard':>14}")
+        for cache_size in (0, 256):
+            client = create_app(db_path, cache_size=cache_size).test_client()
+            separate = measure(client, SEPARATE, args.requests)
+            dashboard = measure(client, DASHBOARD, args.requests)
+            print(f"{'on' if cache_size else 'off':<10}{separate:>11.2f} ms{dashboard:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
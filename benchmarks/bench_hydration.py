@@ -0,0 +1,110 @@
+"""
+Benchmark: per-row cost and memory of loading expenses into model objects.
+
+Compares the previous hydration (sqlite3.Row lookups by name, eager
+datetime.fromisoformat, dataclass with a __dict__) with the current one
+(tuple rows passed positionally to slotted models, dates parsed lazily),
+both for loading alone and for loading plus serializing to API dicts.
+
+Usage: python benchmarks/bench_hydration.py [--rows N]
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database, EXPENSE_COLUMNS  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense, isoformat  # noqa: E402
+
+
+@dataclass
+class DictExpense:
+    """The Expense model as it was before it was slotted."""
+    id: int
+    hobby_id: int
+    amount: float
+    description: str = ""
+    date: datetime = field(default_factory=datetime.now)
+
+
+def load_previous(conn):
+    """Hydrate like the old _row_to_expense did."""
+    conn.row_factory = sqlite3.Row
+    return [DictExpense(id=row["id"], hobby_id=row["hobby_id"], amount=row["amount"],
+                        description=row["description"], date=datetime.fromisoformat(row["date"]))
+            for row in conn.execute("SELECT * FROM expenses")]
+
+
+def load_current(conn):
+    """Hydrate like Database._iter_rows does now."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return [Expense._from_row(*row) for row in cursor.execute(f"SELECT {EXPENSE_COLUMNS} FROM expenses")]
+
+
+def serialize_previous(expenses):
+    return [{'id': e.id, 'hobby_id': e.hobby_id, 'amount': e.amount,
+             'description': e.description, 'date': e.date.isoformat()} for e in expenses]
+
+
+def serialize_current(expenses):
+    return [{'id': e.id, 'hobby_id': e.hobby_id, 'amount': e.amount,
+             'description': e.description, 'date': isoformat(e, 'date')} for e in expenses]
+
+
+def measure(db_path: str, load, serialize):
+    """Return (load ns/row, load+serialize ns/row, bytes/row) for one hydration path."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+
+    gc.collect()
+    start = time.perf_counter()
+    expenses = load(conn)
+    loaded = time.perf_counter() - start
+    serialize(expenses)
+    total = time.perf_counter() - start
+    del expenses
+
+    gc.collect()
+    tracemalloc.start()
+    expenses = load(conn)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del expenses
+    conn.close()
+    return loaded / rows * 1e9, total / rows * 1e9, size / rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        db = Database(db_path)
+        hobby_id = db.add_hobby(Hobby(id=None, name="Bench"))
+        start = datetime(2020, 1, 1)
+        db.add_expenses_many(Expense(id=None, hobby_id=hobby_id, amount=1.0 + i % 50,
+                                     description="Row", date=start + timedelta(minutes=i))
+                             for i in range(args.rows))
+        db.close()
+
+        print(f"{args.rows:,} rows")
+        print(f"{'hydration':<10}{'load ns/row':>14}{'+serialize':>14}{'bytes/row':>12}")
+        for name, load, serialize in (("previous", load_previous, serialize_previous),
+                                      ("current", load_current, serialize_current)):
+            load_ns, total_ns, size = measure(db_path, load, serialize)
+            print(f"{name:<10}{load_ns:>14.0f}{total_ns:>14.0f}{size:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
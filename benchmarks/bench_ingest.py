@@ -0,0 +1,89 @@
+"""
+Benchmark: `ingest` of a CSV file against a row-by-row import loop.
+
+The loop is what a script on top of the CLI did before: read the file with
+csv.DictReader, look up each row's hobby with get_hobby_by_name() and add
+it with add_expense(), one commit per row. `ingest` parses chunks in
+worker processes, resolves hobbies through a map loaded once and commits
+once per chunk; it is run in-process (0 workers) and with a pool.
+
+Usage: python benchmarks/bench_ingest.py [--rows N] [--loop-rows N] [--workers N]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.ingest import IngestSpec, ingest_file  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense  # noqa: E402
+
+HOBBIES = [f"Hobby {i}" for i in range(10)]
+
+
+def write_csv(path: str, rows: int):
+    """Write ``rows`` expenses in the ``expense list --format csv`` layout."""
+    start = datetime(2020, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["id", "date", "hobby_id", "hobby_name", "amount", "description"])
+        for i in range(rows):
+            writer.writerow([i + 1, (start + timedelta(minutes=i)).isoformat(), i % 10 + 1,
+                             HOBBIES[i % 10], 12.5, f"Item {i}"])
+
+
+def new_database(path: str) -> Database:
+    db = Database(path)
+    db.add_hobbies_many(Hobby(id=None, name=name) for name in HOBBIES)
+    return db
+
+
+def row_by_row(db: Database, path: str) -> int:
+    """The former import loop: one lookup and one commit per row."""
+    count = 0
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            hobby = db.get_hobby_by_name(row["hobby_name"])
+            db.add_expense(Expense(id=None, hobby_id=hobby.id, amount=float(row["amount"]),
+                                   description=row["description"],
+                                   date=datetime.fromisoformat(row["date"])))
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--loop-rows", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'import':<24}{'rows':>10}{'time':>10}{'rows/s':>12}")
+        loop_csv = os.path.join(tmp, "loop.csv")
+        write_csv(loop_csv, args.loop_rows)
+        db = new_database(os.path.join(tmp, "loop.db"))
+        start = time.perf_counter()
+        count = row_by_row(db, loop_csv)
+        elapsed = time.perf_counter() - start
+        db.close()
+        print(f"{'row by row':<24}{count:>10}{elapsed:>8.2f} s{count / elapsed:>12,.0f}")
+
+        path = os.path.join(tmp, "expenses.csv")
+        write_csv(path, args.rows)
+        spec = IngestSpec(entry_type="expense", input_format="csv")
+        for workers in (0, args.workers):
+            db = new_database(os.path.join(tmp, f"ingest{workers}.db"))
+            stats = ingest_file(db, path, spec, workers=workers)
+            db.close()
+            label = f"ingest, {workers} workers"
+            print(f"{label:<24}{stats['added']:>10}{stats['seconds']:>8.2f} s{stats['rows_per_second']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
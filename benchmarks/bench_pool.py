@@ -0,0 +1,61 @@
+"""
+Benchmark: requests per second with and without the connection pool.
+
+Usage: python benchmarks/bench_pool.py [--hobbies N] [--requests N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense, Activity  # noqa: E402
+from hobby_budget_tracker.web import create_app  # noqa: E402
+
+
+def populate(db_path: str, hobbies: int):
+    """Fill the database with a few entries per hobby."""
+    db = Database(db_path)
+    for i in range(hobbies):
+        hobby_id = db.add_hobby(Hobby(id=None, name=f"Hobby {i:04d}"))
+        db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=25.0))
+        db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=2.0))
+    db.close()
+
+
+def measure(db_path: str, pool_size: int, path: str, requests: int) -> float:
+    """Return requests per second for ``path``."""
+    app = create_app(db_path, pool_size=pool_size)
+    client = app.test_client()
+    client.get(path)  # warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    elapsed = time.perf_counter() - start
+    pool = app.extensions.get('db_pool')
+    if pool is not None:
+        pool.close()
+    return requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hobbies", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        populate(db_path, args.hobbies)
+        print(f"{'endpoint':<16}{'no pool':>12}{'pool':>12}{'speedup':>10}")
+        for path in ("/api/summary", "/api/hobbies"):
+            without = measure(db_path, 0, path, args.requests)
+            with_pool = measure(db_path, 5, path, args.requests)
+            print(f"{path:<16}{without:>10.0f}/s{with_pool:>10.0f}/s{with_pool / without:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
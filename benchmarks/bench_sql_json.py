@@ -0,0 +1,67 @@
+"""
+Benchmark: /api/expenses encoded by the serializers or built by SQLite.
+
+Times the full list and a page of 500 expenses through the Flask app,
+once with the default path (rows to models to dicts to jsonify) and once
+with SQL_JSON, where SQLite returns the JSON text.
+
+Usage: python benchmarks/bench_sql_json.py [--rows N] [--requests N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense  # noqa: E402
+from hobby_budget_tracker.web import create_app  # noqa: E402
+
+
+def populate(db_path: str, rows: int):
+    """Add one hobby with ``rows`` expenses."""
+    db = Database(db_path)
+    hobby_id = db.add_hobby(Hobby(id=None, name="Photography"))
+    start = datetime(2020, 1, 1)
+    db.add_expenses_many(
+        Expense(id=None, hobby_id=hobby_id, amount=round(5 + i % 97 * 1.37, 2),
+                description=f"Item {i}", date=start + timedelta(hours=i))
+        for i in range(rows)
+    )
+    db.close()
+
+
+def measure(db_path: str, sql_json: bool, path: str, requests: int) -> float:
+    """Return milliseconds per request for ``path``."""
+    app = create_app(db_path, sql_json=sql_json)
+    client = app.test_client()
+    client.get(path)  # warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    elapsed = time.perf_counter() - start
+    app.extensions['db_pool'].close()
+    return elapsed / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        populate(db_path, args.rows)
+        print(f"{'request':<28}{'serializers':>14}{'SQL_JSON':>12}{'speedup':>10}")
+        for path in ("/api/expenses", "/api/expenses?limit=500"):
+            default = measure(db_path, False, path, args.requests)
+            fast = measure(db_path, True, path, args.requests)
+            print(f"{path:<28}{default:>11.1f} ms{fast:>9.1f} ms{default / fast:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
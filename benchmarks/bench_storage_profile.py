@@ -0,0 +1,96 @@
+"""
+Benchmark: concurrent read/write throughput for each storage profile.
+
+Writer processes add expenses one transaction at a time while reader
+processes fetch the summary and a page of expenses, like web workers
+sharing one database file. Operations that fail with "database is
+locked" are counted as errors.
+
+Usage: python benchmarks/bench_storage_profile.py [--writers N] [--readers N] [--seconds S]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database, STORAGE_PROFILES  # noqa: E402
+from hobby_budget_tracker.models import Hobby, Expense  # noqa: E402
+
+
+def populate(db_path: str, profile: str, hobbies: int = 20, expenses: int = 5000):
+    """Create a database with some history to read."""
+    db = Database(db_path, storage_profile=profile)
+    hobby_ids = [db.add_hobby(Hobby(id=None, name=f"Hobby {i:03d}")) for i in range(hobbies)]
+    db.add_expenses_many(Expense(id=None, hobby_id=hobby_ids[i % hobbies], amount=10.0)
+                         for i in range(expenses))
+    db.close()
+
+
+def worker(db_path: str, profile: str, role: str, deadline: float, results):
+    """Run reads or writes until ``deadline`` and report (role, ops, errors)."""
+    db = Database(db_path, storage_profile=profile)
+    hobby_id = db.list_hobbies()[0].id
+    ops = errors = 0
+    while time.time() < deadline:
+        try:
+            if role == "write":
+                db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=1.0))
+            else:
+                db.get_summary()
+                db.list_expenses(limit=50)
+            ops += 1
+        except sqlite3.OperationalError:
+            if db.conn.in_transaction:
+                db.conn.rollback()
+            errors += 1
+    db.close()
+    results.put((role, ops, errors))
+
+
+def run(profile: str, writers: int, readers: int, seconds: float) -> dict:
+    """Run the workload against a fresh database and sum the results per role."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        populate(db_path, profile)
+        results = multiprocessing.Queue()
+        deadline = time.time() + 1.0 + seconds  # give the processes time to start
+        processes = [
+            multiprocessing.Process(target=worker, args=(db_path, profile, role, deadline, results))
+            for role in ["write"] * writers + ["read"] * readers
+        ]
+        for process in processes:
+            process.start()
+        totals = {"write": [0, 0], "read": [0, 0]}
+        for _ in processes:
+            role, ops, errors = results.get()
+            totals[role][0] += ops
+            totals[role][1] += errors
+        for process in processes:
+            process.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f}s per profile")
+    print(f"{'profile':<14}{'writes/s':>10}{'reads/s':>10}{'errors':>8}")
+    for profile in STORAGE_PROFILES:
+        totals = run(profile, args.writers, args.readers, args.seconds)
+        writes, write_errors = totals["write"]
+        reads, read_errors = totals["read"]
+        print(f"{profile:<14}{writes / args.seconds:>10.0f}{reads / args.seconds:>10.0f}"
+              f"{write_errors + read_errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: query count and latency of the hobby summary as hobbies grow.
+
+Compares Database.get_summary() with the previous per-hobby loop that ran
+list_hobbies() plus separate total/hour/KPI queries for every hobby.
+
+Usage: python benchmarks/bench_summary.py [--sizes 10,100,1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby  # noqa: E402
+
+
+def per_hobby_summary(db: Database):
+    """Previous implementation: N+1 queries."""
+    summary = []
+    for hobby in db.list_hobbies():
+        total_expenses = db.get_total_expenses(hobby.id)
+        total_hours = db.get_total_hours(hobby.id)
+        expense_per_hour = db.get_expense_per_hour(hobby.id)
+        summary.append({
+            'id': hobby.id,
+            'name': hobby.name,
+            'description': hobby.description,
+            'total_expenses': total_expenses,
+            'total_hours': total_hours,
+            'expense_per_hour': expense_per_hour,
+            'target_value': hobby.target_value
+        })
+    return summary
+
+
+def populate(db: Database, hobbies: int):
+    """Add ``hobbies`` hobbies with ten expenses and activities each."""
+    for i in range(hobbies):
+        hobby_id = db.add_hobby(Hobby(id=None, name=f"Hobby {i:05d}"))
+        db.conn.executemany(
+            "INSERT INTO expenses (hobby_id, amount, description, date) VALUES (?, ?, '', '2024-01-01T00:00:00')",
+            [(hobby_id, 10.0 + j) for j in range(10)])
+        db.conn.executemany(
+            "INSERT INTO activities (hobby_id, duration_hours, description, date) VALUES (?, ?, '', '2024-01-01T00:00:00')",
+            [(hobby_id, 1.0 + j) for j in range(10)])
+    db.conn.commit()
+
+
+def measure(db: Database, func, repeat: int = 5):
+    """Return (queries per call, best latency in ms, result)."""
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    result = func()
+    db.conn.set_trace_callback(None)
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return len(statements), best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,100,1000")
+    args = parser.parse_args()
+
+    print(f"{'hobbies':>8}{'old queries':>13}{'old ms':>10}{'new queries':>13}{'new ms':>10}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(os.path.join(tmp, "bench.db"))
+            populate(db, size)
+            old_queries, old_ms, old = measure(db, lambda: per_hobby_summary(db))
+            new_queries, new_ms, new = measure(db, db.get_summary)
+            db.close()
+        assert old == new, "summaries differ"
+        print(f"{size:>8}{old_queries:>13}{old_ms:>10.2f}{new_queries:>13}{new_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
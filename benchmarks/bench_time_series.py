@@ -0,0 +1,92 @@
+"""
+Benchmark: cumulative expense-per-hour time series for a long-running hobby.
+
+Compares the single-pass window-function query with the previous
+implementation that issued two SUM queries per distinct day.
+
+Usage: python benchmarks/bench_time_series.py [--years N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from hobby_budget_tracker.database import Database  # noqa: E402
+from hobby_budget_tracker.models import Hobby  # noqa: E402
+
+
+def per_day_time_series(db: Database, hobby_id: int):
+    """Previous implementation: one SUM query per day and table."""
+    cursor = db.conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT date(date) as day
+        FROM (
+            SELECT date FROM expenses WHERE hobby_id = ?
+            UNION
+            SELECT date FROM activities WHERE hobby_id = ?
+        )
+        ORDER BY day
+    """, (hobby_id, hobby_id))
+    dates = [row["day"] for row in cursor.fetchall()]
+
+    time_series = []
+    for date_str in dates:
+        cursor.execute("SELECT SUM(amount) as total FROM expenses WHERE hobby_id = ? AND date(date) <= ?",
+                       (hobby_id, date_str))
+        cumulative_expenses = cursor.fetchone()["total"] or 0.0
+        cursor.execute("SELECT SUM(duration_hours) as total FROM activities WHERE hobby_id = ? AND date(date) <= ?",
+                       (hobby_id, date_str))
+        cumulative_hours = cursor.fetchone()["total"] or 0.0
+        if cumulative_hours > 0:
+            time_series.append({'date': date_str,
+                                'expense_per_hour': round(cumulative_expenses / cumulative_hours, 2)})
+    return time_series
+
+
+def populate(db: Database, years: int) -> int:
+    """Add one expense and one activity per day for ``years`` years."""
+    hobby_id = db.add_hobby(Hobby(id=None, name="Long-running hobby"))
+    start = datetime(2015, 1, 1, 18)
+    days = 365 * years
+    expenses = ((hobby_id, 5.0 + i % 17, "", (start + timedelta(days=i)).isoformat()) for i in range(days))
+    activities = ((hobby_id, 0.5 + i % 5, "", (start + timedelta(days=i)).isoformat()) for i in range(days))
+    db.conn.executemany(
+        "INSERT INTO expenses (hobby_id, amount, description, date) VALUES (?, ?, ?, ?)", expenses)
+    db.conn.executemany(
+        "INSERT INTO activities (hobby_id, duration_hours, description, date) VALUES (?, ?, ?, ?)", activities)
+    db.conn.commit()
+    return hobby_id
+
+
+def timed(func, *args):
+    """Return (result, seconds) for a single call."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        hobby_id = populate(db, args.years)
+
+        old, old_time = timed(per_day_time_series, db, hobby_id)
+        new, new_time = timed(db.get_expense_per_hour_time_series, hobby_id)
+        db.close()
+
+    print(f"{len(new)} points over {args.years} years of daily entries")
+    print(f"per-day queries: {old_time * 1000:10.1f} ms")
+    print(f"single pass:     {new_time * 1000:10.1f} ms  ({old_time / new_time:.0f}x faster)")
+    print(f"identical output: {old == new}")
+
+
+if __name__ == "__main__":
+    main()
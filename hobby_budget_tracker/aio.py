@@ -0,0 +1,125 @@
+"""
+Asyncio front end to the database for Hobby Budget Tracker.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, List, Optional
+
+from .cache import QueryCache
+from .database import Database, STORAGE_PROFILES
+
+
+# Threads, and so connections, serving an AsyncDatabase by default
+DEFAULT_WORKERS = 4
+
+
+class AsyncDatabase:
+    """Runs Database operations on a dedicated thread pool.
+    
+    Every public Database method that returns a value is available as a
+    coroutine with the same name and arguments, e.g. ``await
+    db.list_hobbies()``. Each worker thread opens its own connection the
+    first time it runs a call, so at most ``workers`` queries run at once
+    and the event loop never blocks on SQLite. Use the "wal" storage
+    profile when several workers write concurrently.
+    
+    Generators such as ``iter_expenses`` are consumed with ``stream()``,
+    and several operations that must share a connection (for instance a
+    ``transaction()``) are grouped in a function passed to ``run()``.
+    """
+    
+    def __init__(self, db_path: str = "hobby_budget.db", workers: int = DEFAULT_WORKERS,
+                 storage_profile: str = "default", cache: Optional[QueryCache] = None):
+        """Start a pool of ``workers`` threads for the given database file.
+        
+        The threads' connections share the query ``cache``, if any.
+        """
+        if workers < 1:
+            raise ValueError("Workers must be at least 1")
+        if storage_profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {storage_profile}")
+        self.db_path = db_path
+        self.workers = workers
+        self.storage_profile = storage_profile
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hobby-db")
+        self._local = threading.local()
+        self._connections: List[Database] = []
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def _open(self) -> Database:
+        """Open a connection; it is only used by one thread but closed by another."""
+        return Database(self.db_path, check_same_thread=False, storage_profile=self.storage_profile,
+                        cache=self.cache)
+    
+    def _thread_database(self) -> Database:
+        """Return the calling worker thread's connection, opening it on first use."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = self._open()
+            with self._lock:
+                self._connections.append(db)
+        return db
+    
+    def _call(self, function: Callable, args: tuple, kwargs: dict):
+        """Run ``function`` with the worker thread's connection as first argument."""
+        return function(self._thread_database(), *args, **kwargs)
+    
+    async def run(self, function: Callable, *args, **kwargs):
+        """Run ``function(db, *args, **kwargs)`` on a worker thread and return its result."""
+        if self._closed:
+            raise RuntimeError("Async database is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, function, args, kwargs)
+    
+    async def stream(self, function: Callable, *args, **kwargs) -> AsyncIterator:
+        """Yield the items of the iterator returned by ``function(db, *args, **kwargs)``.
+        
+        The iterator gets a connection of its own, which is closed once it
+        is exhausted or the caller stops early. Items are fetched one per
+        thread hop, so this suits iterators yielding batches or fragments.
+        """
+        if self._closed:
+            raise RuntimeError("Async database is closed")
+        loop = asyncio.get_running_loop()
+        done = object()
+        db = await loop.run_in_executor(self._executor, self._open)
+        try:
+            call = functools.partial(function, db, *args, **kwargs)
+            items = iter(await loop.run_in_executor(self._executor, call))
+            while True:
+                item = await loop.run_in_executor(self._executor, next, items, done)
+                if item is done:
+                    break
+                yield item
+        finally:
+            await loop.run_in_executor(self._executor, db.close)
+    
+    def __getattr__(self, name: str):
+        """Expose Database methods as coroutines."""
+        method = inspect.getattr_static(Database, name, None)
+        if (name.startswith('_') or name.startswith('iter_') or not inspect.isfunction(method)
+                or inspect.isgeneratorfunction(method) or name in ('transaction', 'close')):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+        
+        setattr(self, name, call)
+        return call
+    
+    def close(self):
+        """Wait for running calls to finish, then close every connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        for db in self._connections:
+            db.close()
+        self._connections = []
@@ -0,0 +1,211 @@
+"""
+Rolling-window, monthly and weekday KPIs for Hobby Budget Tracker.
+
+Daily per-hobby sums are loaded into columns (hobby index, epoch day,
+expenses, hours) and every KPI is computed for all hobbies in one pass
+over them. NumPy is used when installed (``pip install
+hobby-budget-tracker[analytics]``); otherwise the same sums are computed
+in pure Python.
+"""
+from datetime import date, datetime
+from typing import List, NamedTuple, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .database import Database
+
+
+# Trailing windows, in days, for the rolling expense per hour
+ROLLING_WINDOWS = (30, 90, 365)
+
+# Number of calendar months in the month-over-month table by default
+DEFAULT_MONTHS = 12
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class Columns(NamedTuple):
+    """Daily sums as parallel columns, one entry per hobby and day."""
+    hobby_index: Sequence[int]
+    day: Sequence[int]
+    expenses: Sequence[float]
+    hours: Sequence[float]
+
+
+class Sums(NamedTuple):
+    """Per-hobby sums behind the KPIs, as nested lists indexed by hobby first."""
+    rolling: List[tuple]      # per window: (expenses per hobby, hours per hobby)
+    monthly_expenses: List[List[float]]
+    monthly_hours: List[List[float]]
+    weekday_expenses: List[List[float]]
+    weekday_hours: List[List[float]]
+
+
+def _epoch_day(day: date) -> int:
+    """Days since 1970-01-01."""
+    return day.toordinal() - _EPOCH_ORDINAL
+
+
+def _epoch_month(day: date) -> int:
+    """Calendar months since January 1970."""
+    return (day.year - 1970) * 12 + day.month - 1
+
+
+def _month_label(epoch_month: int) -> str:
+    """Format months since January 1970 as YYYY-MM."""
+    return f"{1970 + epoch_month // 12:04d}-{epoch_month % 12 + 1:02d}"
+
+
+def load_columns(db: Database, hobby_ids: List[int], as_of: date, use_numpy: bool = True) -> Columns:
+    """Load the daily sums of the given hobbies up to ``as_of`` as columns.
+    
+    With NumPy available (and ``use_numpy``) the columns are arrays,
+    otherwise lists. Hobbies are identified by their position in
+    ``hobby_ids``.
+    """
+    position = {hobby_id: index for index, hobby_id in enumerate(hobby_ids)}
+    hobby_id = hobby_ids[0] if len(hobby_ids) == 1 else None
+    last_day = _epoch_day(as_of)
+    rows = [row for row in db.get_daily_totals(hobby_id) if row[0] in position and row[1] <= last_day]
+    
+    if np is not None and use_numpy:
+        data = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        index = np.array([position[row[0]] for row in rows], dtype=np.int64)
+        return Columns(index, data[:, 1].astype(np.int64), data[:, 2], data[:, 3])
+    return Columns([position[row[0]] for row in rows], [row[1] for row in rows],
+                   [row[2] for row in rows], [row[3] for row in rows])
+
+
+def _numpy_sums(columns: Columns, hobbies: int, last_day: int, first_month: int,
+                months: int, windows: Sequence[int]) -> Sums:
+    """Compute the KPI sums with one bincount per KPI."""
+    index, day, expenses, hours = columns
+    
+    def per_hobby(keys, mask, size):
+        return (np.bincount(keys[mask], weights=expenses[mask], minlength=size),
+                np.bincount(keys[mask], weights=hours[mask], minlength=size))
+    
+    rolling = []
+    for window in windows:
+        spent, spent_hours = per_hobby(index, day > last_day - window, hobbies)
+        rolling.append((spent.tolist(), spent_hours.tolist()))
+    
+    month = day.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) - first_month
+    spent, spent_hours = per_hobby(index * months + month, month >= 0, hobbies * months)
+    monthly = (spent.reshape(hobbies, months).tolist(), spent_hours.reshape(hobbies, months).tolist())
+    
+    # 1970-01-01 was a Thursday, so Monday is 0 after shifting by three days
+    weekday = (day + 3) % 7
+    spent, spent_hours = per_hobby(index * 7 + weekday, np.ones(len(day), dtype=bool), hobbies * 7)
+    weekdays = (spent.reshape(hobbies, 7).tolist(), spent_hours.reshape(hobbies, 7).tolist())
+    
+    return Sums(rolling, *monthly, *weekdays)
+
+
+def _python_sums(columns: Columns, hobbies: int, last_day: int, first_month: int,
+                 months: int, windows: Sequence[int]) -> Sums:
+    """Compute the KPI sums in a single loop over the columns."""
+    rolling = [([0.0] * hobbies, [0.0] * hobbies) for _ in windows]
+    monthly_expenses = [[0.0] * months for _ in range(hobbies)]
+    monthly_hours = [[0.0] * months for _ in range(hobbies)]
+    weekday_expenses = [[0.0] * 7 for _ in range(hobbies)]
+    weekday_hours = [[0.0] * 7 for _ in range(hobbies)]
+    
+    for index, day, spent, hours in zip(*columns):
+        for (window_expenses, window_hours), window in zip(rolling, windows):
+            if day > last_day - window:
+                window_expenses[index] += spent
+                window_hours[index] += hours
+        month = _epoch_month(date.fromordinal(_EPOCH_ORDINAL + day)) - first_month
+        if month >= 0:
+            monthly_expenses[index][month] += spent
+            monthly_hours[index][month] += hours
+        weekday = (day + 3) % 7
+        weekday_expenses[index][weekday] += spent
+        weekday_hours[index][weekday] += hours
+    
+    return Sums(rolling, monthly_expenses, monthly_hours, weekday_expenses, weekday_hours)
+
+
+def _kpi(expenses: float, hours: float) -> dict:
+    """Rounded totals and expense per hour (None without hours)."""
+    return {
+        'expenses': round(expenses, 2),
+        'hours': round(hours, 2),
+        'expense_per_hour': round(expenses / hours, 2) if hours > 0 else None,
+    }
+
+
+def _change(current, previous):
+    """Difference to the previous value, or None if either is missing."""
+    if current is None or previous is None:
+        return None
+    return round(current - previous, 2)
+
+
+def build_report(db: Database, as_of: Optional[date] = None, months: int = DEFAULT_MONTHS,
+                 hobby_id: Optional[int] = None, windows: Sequence[int] = ROLLING_WINDOWS,
+                 use_numpy: bool = True) -> dict:
+    """Compute rolling, month-over-month and weekday KPIs for every hobby.
+    
+    Only entries dated on or before ``as_of`` (default: today) count.
+    ``rolling`` covers the trailing ``windows`` days up to ``as_of``;
+    ``monthly`` lists the last ``months`` calendar months with the change
+    against the month before; ``weekdays`` breaks all history down by
+    weekday. Pass ``hobby_id`` to report on a single hobby.
+    """
+    if months < 1:
+        raise ValueError("Months must be at least 1")
+    if as_of is None:
+        as_of = date.today()
+    elif isinstance(as_of, datetime):
+        as_of = as_of.date()
+    
+    hobbies = db.list_hobbies()
+    if hobby_id is not None:
+        hobbies = [hobby for hobby in hobbies if hobby.id == hobby_id]
+    
+    report = {'as_of': as_of.isoformat(), 'hobbies': []}
+    if not hobbies:
+        return report
+    
+    columns = load_columns(db, [hobby.id for hobby in hobbies], as_of, use_numpy)
+    # One extra month in front gives the first listed month its change
+    first_month = _epoch_month(as_of) - months
+    compute = _numpy_sums if np is not None and use_numpy else _python_sums
+    sums = compute(columns, len(hobbies), _epoch_day(as_of), first_month, months + 1, windows)
+    
+    for index, hobby in enumerate(hobbies):
+        monthly = []
+        previous = _kpi(sums.monthly_expenses[index][0], sums.monthly_hours[index][0])
+        for month in range(1, months + 1):
+            current = _kpi(sums.monthly_expenses[index][month], sums.monthly_hours[index][month])
+            monthly.append(dict(
+                current,
+                month=_month_label(first_month + month),
+                expenses_change=_change(current['expenses'], previous['expenses']),
+                hours_change=_change(current['hours'], previous['hours']),
+                expense_per_hour_change=_change(current['expense_per_hour'], previous['expense_per_hour']),
+            ))
+            previous = current
+        
+        report['hobbies'].append({
+            'id': hobby.id,
+            'name': hobby.name,
+            'rolling': [
+                dict(_kpi(expenses[index], hours[index]), days=window)
+                for window, (expenses, hours) in zip(windows, sums.rolling)
+            ],
+            'monthly': monthly,
+            'weekdays': [
+                dict(_kpi(sums.weekday_expenses[index][weekday], sums.weekday_hours[index][weekday]),
+                     weekday=name)
+                for weekday, name in enumerate(WEEKDAYS)
+            ],
+        })
+    return report
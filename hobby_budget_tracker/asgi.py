@@ -0,0 +1,515 @@
+"""
+ASGI interface for Hobby Budget Tracker.
+
+Serves the same page and ``/api/*`` routes as the Flask app in web.py,
+but as a plain ASGI application on top of AsyncDatabase. Idle keep-alive
+connections cost the server a socket and no thread, so one process can
+hold thousands of open dashboards. Run it with any ASGI server, e.g.
+``uvicorn asgi:application``.
+"""
+import asyncio
+import io
+import json
+import re
+from datetime import date, datetime
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from .aio import AsyncDatabase, DEFAULT_WORKERS
+from .analytics import DEFAULT_MONTHS, build_report
+from .assets import AssetBundle
+from .batch import BatchError, run_batch
+from .cache import DEFAULT_CACHE_SIZE, QueryCache
+from .database import Database, DuplicateHobbyError, DEFAULT_CHUNK_SIZE, DEFAULT_DASHBOARD_SIZE
+from .models import Hobby, Expense, Activity, finite_float
+from .transfer import InvalidImportError, import_stream, iter_export
+from .web import (MAX_PAGE_SIZE, _batch_error, _decode_cursor, _encode_cursor, _serialize_activity,
+                  _serialize_dashboard, _serialize_expense, _serialize_hobby, _table_etag)
+
+# Tables read by the summary and per-hobby endpoints
+ALL_TABLES = ('hobbies', 'expenses', 'activities')
+
+
+class HTTPError(Exception):
+    """Raised by a handler to answer with a JSON error message."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Request:
+    """The parts of an HTTP request the handlers need."""
+    
+    def __init__(self, scope: dict, receive: Callable):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', [])}
+        self.args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        self.receive = receive
+    
+    def arg(self, name: str, type: Callable = str, default=None):
+        """Return a query parameter converted by ``type``, or ``default`` if missing or invalid."""
+        try:
+            return type(self.args[name])
+        except (KeyError, ValueError):
+            return default
+    
+    def date_range(self) -> Tuple[Optional[date], Optional[date]]:
+        """Parse the optional ``from``/``to`` query parameters as dates."""
+        try:
+            return tuple(date.fromisoformat(self.args[name]) if self.args.get(name) else None
+                         for name in ('from', 'to'))
+        except ValueError:
+            raise HTTPError(400, 'Invalid date, expected YYYY-MM-DD') from None
+    
+    def if_none_match(self, etag: str) -> bool:
+        """Whether the If-None-Match header lists ``etag`` (or is ``*``)."""
+        header = self.headers.get('if-none-match')
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(',')]
+        return '*' in tags or f'"{etag}"' in tags or f'W/"{etag}"' in tags
+    
+    async def body(self) -> bytes:
+        """Read the whole request body."""
+        chunks = []
+        more = True
+        while more:
+            message = await self.receive()
+            chunks.append(message.get('body', b''))
+            more = message.get('more_body', False)
+        return b''.join(chunks)
+    
+    async def json(self):
+        """Read and decode a JSON request body."""
+        try:
+            return json.loads(await self.body())
+        except ValueError:
+            raise HTTPError(400, 'Invalid JSON body') from None
+
+
+class _BodyReader(io.RawIOBase):
+    """Blocking file-like view of an ASGI request body, read from a worker thread."""
+    
+    def __init__(self, receive: Callable, loop: asyncio.AbstractEventLoop):
+        self._receive = receive
+        self._loop = loop
+        self._chunk = b''
+        self._more = True
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        while not self._chunk and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            self._chunk = message.get('body', b'')
+            self._more = message.get('more_body', False)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def _json_response(payload, status: int = 200) -> Tuple[int, str, bytes]:
+    """Encode a payload exactly like Flask's jsonify does in production."""
+    body = (json.dumps(payload, sort_keys=True, separators=(",", ":")) + "\n").encode()
+    return status, 'application/json', body
+
+
+class ASGIApp:
+    """ASGI application serving the Hobby Budget Tracker page and API.
+    
+    Database calls run on an AsyncDatabase with ``workers`` threads and
+    connections opened with the named ``storage_profile``, sharing a
+    QueryCache of ``cache_size`` results (0 disables it).
+    """
+    
+    def __init__(self, db_path: str = "hobby_budget.db", workers: int = DEFAULT_WORKERS,
+                 storage_profile: str = "default", cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache = QueryCache(cache_size) if cache_size > 0 else None
+        self.db = AsyncDatabase(db_path, workers, storage_profile, self.cache)
+        self.import_batch_size = DEFAULT_CHUNK_SIZE
+        self.assets = AssetBundle()
+        self.routes: List[Tuple[str, re.Pattern, Callable, tuple]] = []
+        self.route('GET', r'/', self.index)
+        self.route('GET', r'/static/.+', self.static_file)
+        self.route('GET', r'/api/hobbies', self.get_hobbies, tables=('hobbies',))
+        self.route('POST', r'/api/hobbies', self.add_hobby)
+        self.route('DELETE', r'/api/hobbies/(?P<hobby_id>\d+)', self.delete_hobby)
+        self.route('PUT', r'/api/hobbies/(?P<hobby_id>\d+)', self.update_hobby)
+        self.route('GET', r'/api/hobbies/(?P<hobby_id>\d+)/stats', self.get_hobby_stats, tables=ALL_TABLES)
+        self.route('GET', r'/api/hobbies/(?P<hobby_id>\d+)/chart-data', self.get_hobby_chart_data,
+                   tables=ALL_TABLES)
+        self.route('GET', r'/api/expenses', self.get_expenses, tables=('expenses',))
+        self.route('POST', r'/api/expenses', self.add_expense)
+        self.route('GET', r'/api/activities', self.get_activities, tables=('activities',))
+        self.route('POST', r'/api/activities', self.add_activity)
+        self.route('POST', r'/api/batch', self.batch)
+        self.route('GET', r'/api/summary', self.get_summary, tables=ALL_TABLES)
+        self.route('GET', r'/api/dashboard', self.get_dashboard, tables=ALL_TABLES)
+        self.route('GET', r'/api/analytics', self.get_analytics)
+        self.route('GET', r'/api/cache', self.get_cache_stats)
+        self.route('GET', r'/api/export', self.export_data)
+        self.route('POST', r'/api/import', self.import_data)
+    
+    def route(self, method: str, pattern: str, handler: Callable, tables: tuple = ()):
+        """Register ``handler`` for ``method`` requests to paths matching ``pattern``.
+        
+        Named groups are passed to the handler as integer keyword arguments.
+        Responses of routes reading ``tables`` carry an ETag and are answered
+        with 304, without running the handler, while it still matches.
+        """
+        self.routes.append((method, re.compile(pattern + '$'), handler, tables))
+    
+    async def __call__(self, scope: dict, receive: Callable, send: Callable):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+    
+    async def _lifespan(self, receive: Callable, send: Callable):
+        """Close the database connections when the server shuts down."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await asyncio.get_running_loop().run_in_executor(None, self.db.close)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    async def _http(self, scope: dict, receive: Callable, send: Callable):
+        """Dispatch a request to its handler and send the response."""
+        request = Request(scope, receive)
+        etag = None
+        try:
+            response, etag = await self._dispatch(request)
+        except HTTPError as e:
+            response = _json_response({'error': e.message}, e.status)
+        status, content_type, body = response
+        if isinstance(content_type, list):
+            # Static assets come with all of their headers
+            headers = [(name.lower().encode(), value.encode()) for name, value in content_type]
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        
+        headers = [(b'content-type', content_type.encode())]
+        if etag is not None:
+            headers += [(b'etag', f'"{etag}"'.encode()), (b'cache-control', b'no-cache')]
+        if status == 304:
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers[1:]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        if isinstance(body, bytes):
+            headers.append((b'content-length', str(len(body)).encode()))
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        
+        # Streamed body: an async iterator of text fragments
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        try:
+            async for fragment in body:
+                await send({'type': 'http.response.body', 'body': fragment.encode(), 'more_body': True})
+        finally:
+            await body.aclose()
+        await send({'type': 'http.response.body', 'body': b''})
+    
+    async def _dispatch(self, request: Request):
+        """Find the route matching the request and run its handler.
+        
+        Returns the response and its ETag, if the route has one.
+        """
+        allowed = False
+        for method, pattern, handler, tables in self.routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed = True
+                continue
+            params = {name: int(value) for name, value in match.groupdict().items()}
+            if not tables:
+                return await handler(request, **params), None
+            etag = _table_etag(await self.db.get_table_versions(), tables)
+            if request.if_none_match(etag):
+                return (304, '', b''), etag
+            response = await handler(request, **params)
+            return response, etag if response[0] == 200 else None
+        if allowed:
+            raise HTTPError(405, 'Method not allowed')
+        raise HTTPError(404, 'Not found')
+    
+    async def _get_hobby(self, hobby_id: int) -> Hobby:
+        """Load a hobby, answering 404 if it does not exist."""
+        hobby = await self.db.get_hobby(hobby_id)
+        if not hobby:
+            raise HTTPError(404, 'Hobby not found')
+        return hobby
+    
+    @staticmethod
+    def _asset_response(request: Request, asset, immutable: bool):
+        """Serve an asset, gzipped when the client accepts it."""
+        return asset.respond(immutable, request.headers.get('accept-encoding', ''),
+                             request.if_none_match(asset.etag))
+    
+    async def index(self, request: Request):
+        """Serve the main page."""
+        return self._asset_response(request, self.assets.index, False)
+    
+    async def static_file(self, request: Request):
+        """Serve a static asset; content-hashed URLs may be cached forever."""
+        asset, immutable = self.assets.find(request.path)
+        if asset is None:
+            raise HTTPError(404, 'Not found')
+        return self._asset_response(request, asset, immutable)
+    
+    # API routes for hobbies
+    async def get_hobbies(self, request: Request):
+        """Get all hobbies."""
+        hobbies = await self.db.list_hobbies()
+        return _json_response([_serialize_hobby(h) for h in hobbies])
+    
+    async def add_hobby(self, request: Request):
+        """Add a new hobby."""
+        data = await request.json()
+        try:
+            # Parse target_value if provided
+            target_value = None
+            if 'target_value' in data and data['target_value']:
+                try:
+                    target_value = float(data['target_value'])
+                except (ValueError, TypeError):
+                    pass
+            
+            hobby = Hobby(
+                id=None,
+                name=data['name'],
+                description=data.get('description', ''),
+                target_value=target_value
+            )
+            hobby_id = await self.db.add_hobby(hobby)
+            return _json_response({'id': hobby_id, 'message': 'Hobby added successfully'}, 201)
+        except DuplicateHobbyError as e:
+            raise HTTPError(400, str(e))
+        except KeyError:
+            raise HTTPError(400, 'Missing required field: name')
+    
+    async def delete_hobby(self, request: Request, hobby_id: int):
+        """Delete a hobby."""
+        await self._get_hobby(hobby_id)
+        await self.db.delete_hobby(hobby_id)
+        return _json_response({'message': 'Hobby deleted successfully'})
+    
+    async def update_hobby(self, request: Request, hobby_id: int):
+        """Update a hobby."""
+        await self._get_hobby(hobby_id)
+        data = await request.json()
+        try:
+            # Parse target_value if provided
+            target_value = data.get('target_value')
+            if target_value is not None and target_value != '':
+                try:
+                    target_value = float(target_value)
+                except (ValueError, TypeError):
+                    target_value = None
+            
+            await self.db.update_hobby(
+                hobby_id,
+                name=data.get('name'),
+                description=data.get('description'),
+                target_value=target_value
+            )
+            return _json_response({'message': 'Hobby updated successfully'})
+        except Exception as e:
+            raise HTTPError(400, str(e))
+    
+    async def get_hobby_stats(self, request: Request, hobby_id: int):
+        """Get statistics for a hobby, optionally for a ``from``/``to`` date range."""
+        hobby = await self._get_hobby(hobby_id)
+        start, end = request.date_range()
+        totals = await self.db.get_hobby_totals(hobby_id, start, end)
+        return _json_response({
+            'hobby': {
+                'id': hobby.id,
+                'name': hobby.name,
+                'description': hobby.description,
+                'target_value': hobby.target_value
+            },
+            'total_expenses': totals['total_expenses'],
+            'total_hours': totals['total_hours'],
+            'expense_per_hour': totals['expense_per_hour']
+        })
+    
+    async def get_hobby_chart_data(self, request: Request, hobby_id: int):
+        """Get time series data for hobby chart."""
+        hobby = await self._get_hobby(hobby_id)
+        time_series = await self.db.get_expense_per_hour_time_series(hobby_id)
+        return _json_response({
+            'time_series': time_series,
+            'target_value': hobby.target_value
+        })
+    
+    # API routes for expenses and activities
+    async def _list_response(self, request: Request, list_entries: Callable, serialize: Callable):
+        """Respond with expenses or activities, paginated when ``limit`` is given.
+        
+        Same parameters and response shape as the Flask endpoints.
+        """
+        hobby_id = request.arg('hobby_id', int)
+        start, end = request.date_range()
+        if 'limit' not in request.args:
+            entries = await self.db.run(list_entries, hobby_id, start=start, end=end)
+            return _json_response([serialize(entry) for entry in entries])
+        
+        limit = request.arg('limit', int)
+        if limit is None or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f'limit must be between 1 and {MAX_PAGE_SIZE}')
+        cursor = request.args.get('cursor')
+        try:
+            before = _decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPError(400, 'Invalid cursor') from None
+        
+        # Fetch one extra row to learn whether another page follows
+        entries = await self.db.run(list_entries, hobby_id, limit=limit + 1, before=before,
+                                    start=start, end=end)
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = _encode_cursor(Database.page_key(entries[-1]))
+        return _json_response({
+            'items': [serialize(entry) for entry in entries],
+            'next_cursor': next_cursor
+        })
+    
+    async def get_expenses(self, request: Request):
+        """Get expenses, optionally filtered by hobby and paginated."""
+        return await self._list_response(request, Database.list_expenses, _serialize_expense)
+    
+    async def get_activities(self, request: Request):
+        """Get activities, optionally filtered by hobby and paginated."""
+        return await self._list_response(request, Database.list_activities, _serialize_activity)
+    
+    async def add_expense(self, request: Request):
+        """Add a new expense."""
+        data = await request.json()
+        try:
+            # Parse date if provided, otherwise use current datetime
+            expense_date = None
+            if 'date' in data and data['date']:
+                expense_date = datetime.fromisoformat(data['date'])
+            
+            expense = Expense(
+                id=None,
+                hobby_id=data['hobby_id'],
+                amount=finite_float(data['amount']),
+                description=data.get('description', ''),
+                date=expense_date
+            )
+        except KeyError as e:
+            raise HTTPError(400, f'Missing required field: {str(e)}')
+        except ValueError:
+            raise HTTPError(400, 'Invalid amount value')
+        expense_id = await self.db.add_expense(expense)
+        return _json_response({'id': expense_id, 'message': 'Expense added successfully'}, 201)
+    
+    async def add_activity(self, request: Request):
+        """Add a new activity."""
+        data = await request.json()
+        try:
+            # Parse date if provided, otherwise use current datetime
+            activity_date = None
+            if 'date' in data and data['date']:
+                activity_date = datetime.fromisoformat(data['date'])
+            
+            activity = Activity(
+                id=None,
+                hobby_id=data['hobby_id'],
+                duration_hours=finite_float(data['duration_hours']),
+                description=data.get('description', ''),
+                date=activity_date
+            )
+        except KeyError as e:
+            raise HTTPError(400, f'Missing required field: {str(e)}')
+        except ValueError:
+            raise HTTPError(400, 'Invalid duration value')
+        activity_id = await self.db.add_activity(activity)
+        return _json_response({'id': activity_id, 'message': 'Activity added successfully'}, 201)
+    
+    async def batch(self, request: Request):
+        """Apply several create, update and delete operations in one transaction."""
+        data = await request.json()
+        operations = data.get('operations') if isinstance(data, dict) else None
+        try:
+            results = await self.db.run(run_batch, operations)
+        except BatchError as e:
+            return _json_response(_batch_error(e), e.status)
+        return _json_response({'results': results})
+    
+    # Summary, analytics and transfer endpoints
+    async def get_summary(self, request: Request):
+        """Get summary of all hobbies."""
+        return _json_response(await self.db.get_summary())
+    
+    async def get_dashboard(self, request: Request):
+        """Get hobbies, the summary and the newest expenses and activities in one response."""
+        limit = request.arg('limit', int, DEFAULT_DASHBOARD_SIZE)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPError(400, f'limit must be between 1 and {MAX_PAGE_SIZE}')
+        return _json_response(_serialize_dashboard(await self.db.get_dashboard(limit)))
+    
+    async def get_analytics(self, request: Request):
+        """Get rolling, month-over-month and weekday KPIs for all hobbies."""
+        try:
+            as_of = request.args.get('as_of')
+            as_of = date.fromisoformat(as_of) if as_of else None
+        except ValueError:
+            raise HTTPError(400, 'Invalid date, expected YYYY-MM-DD') from None
+        months = request.arg('months', int, DEFAULT_MONTHS)
+        if not 1 <= months <= 120:
+            raise HTTPError(400, 'months must be between 1 and 120')
+        hobby_id = request.arg('hobby_id', int)
+        if hobby_id is not None:
+            await self._get_hobby(hobby_id)
+        report = await self.db.run(build_report, as_of=as_of, months=months, hobby_id=hobby_id)
+        return _json_response(report)
+    
+    async def get_cache_stats(self, request: Request):
+        """Get the hit and miss counters of the query cache."""
+        if self.cache is None:
+            return _json_response({'enabled': False})
+        return _json_response({'enabled': True, **self.cache.stats()})
+    
+    async def export_data(self, request: Request):
+        """Export data as JSON, streamed in batches from a dedicated connection."""
+        start, end = request.date_range()
+        hobby_id = request.arg('hobby_id', int)
+        return 200, 'application/json', self.db.stream(iter_export, hobby_id, start, end)
+    
+    async def import_data(self, request: Request):
+        """Import data from JSON, parsing the body as it arrives."""
+        reader = io.BufferedReader(_BodyReader(request.receive, asyncio.get_running_loop()))
+        try:
+            counts = await self.db.run(import_stream, reader, batch_size=self.import_batch_size)
+        except InvalidImportError:
+            raise HTTPError(400, 'Invalid import file format') from None
+        except Exception as e:
+            raise HTTPError(400, f'Import failed: {str(e)}') from None
+        return _json_response({'message': 'Data imported successfully', **counts})
+
+
+def create_asgi_app(db_path: str = "hobby_budget.db", workers: int = DEFAULT_WORKERS,
+                    storage_profile: str = "default", cache_size: int = DEFAULT_CACHE_SIZE) -> ASGIApp:
+    """Create the ASGI application.
+    
+    ``workers`` threads, each with its own connection, run the database
+    calls; with more than one, use the "wal" ``storage_profile`` so
+    concurrent writes wait for each other instead of failing.
+    """
+    return ASGIApp(db_path, workers, storage_profile, cache_size)
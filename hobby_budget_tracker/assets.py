@@ -0,0 +1,187 @@
+"""
+Static front-end assets for Hobby Budget Tracker.
+"""
+import argparse
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import sys
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Directory holding the shell page and the files it loads
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Chart.js build loaded by the shell page, and where it is vendored from
+# (``python -m hobby_budget_tracker.assets``). The page only falls back to
+# the CDN, which needs internet access on the client, when it is missing.
+CHART_JS = "vendor/chart.umd.min.js"
+CHART_JS_VERSION = "4.4.0"
+CHART_JS_CDN = f"https://cdn.jsdelivr.net/npm/chart.js@{CHART_JS_VERSION}/dist/chart.umd.min.js"
+
+# sha256 of the CHART_JS_VERSION build, updated together with the version.
+# Downloads that do not match it are discarded; while it is unset, the
+# digest must be passed to ``python -m hobby_budget_tracker.assets --sha256``.
+CHART_JS_SHA256 = None
+
+# Cache-Control for URLs whose content never changes
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Content types worth compressing
+_COMPRESSIBLE = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+logger = logging.getLogger(__name__)
+
+# Static folders already warned about a missing Chart.js
+_warned_missing_chart_js = set()
+
+
+class Asset:
+    """A static file held in memory with its gzip encoding and ETag."""
+    
+    def __init__(self, name: str, body: bytes, content_type: str):
+        self.name = name
+        self.body = body
+        self.content_type = content_type
+        digest = hashlib.sha256(body).hexdigest()
+        self.etag = digest[:16]
+        stem, dot, suffix = name.rpartition(".")
+        self.url = f"/static/{stem}.{digest[:10]}.{suffix}" if dot else f"/static/{name}.{digest[:10]}"
+        self.gzipped = None
+        if content_type.startswith(_COMPRESSIBLE):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.gzipped = compressed
+    
+    def respond(self, immutable: bool, accept_encoding: str,
+                not_modified: bool = False) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """Return the status, headers and body answering a request for the asset.
+        
+        Hashed URLs are ``immutable``; any other URL is tagged with the
+        ETag and must be revalidated, answering 304 when ``not_modified``.
+        """
+        headers = [("Cache-Control", IMMUTABLE if immutable else "no-cache"),
+                   ("ETag", f'"{self.etag}"')]
+        if self.gzipped is not None:
+            headers.append(("Vary", "Accept-Encoding"))
+        if not_modified and not immutable:
+            return 304, headers, b""
+        body = self.body
+        if self.gzipped is not None and "gzip" in accept_encoding.lower():
+            body = self.gzipped
+            headers.append(("Content-Encoding", "gzip"))
+        headers += [("Content-Type", self.content_type), ("Content-Length", str(len(body)))]
+        return 200, headers, body
+
+
+class AssetBundle:
+    """The shell page and every file under ``static_dir``, loaded once.
+    
+    Each file is served at a URL carrying a hash of its content, which
+    can be cached forever, and at its plain ``/static/<name>`` URL, which
+    must be revalidated. References to ``/static/<name>`` in the shell
+    page are rewritten to the hashed URLs. When the vendored Chart.js is
+    missing the page links the CDN copy instead and a warning is logged.
+    Compressible files are gzipped once here instead of on every request.
+    """
+    
+    def __init__(self, static_dir: Path = STATIC_DIR):
+        """Read, hash and compress the files under ``static_dir``."""
+        self.assets: Dict[str, Asset] = {}
+        self._urls: Dict[str, Asset] = {}
+        page = None
+        for path in sorted(Path(static_dir).rglob("*")):
+            name = path.relative_to(static_dir).as_posix()
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            if name == "index.html":
+                page = path.read_text(encoding="utf-8")
+                continue
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type == "application/javascript":
+                content_type += "; charset=utf-8"
+            self._add(Asset(name, path.read_bytes(), content_type))
+        if page is None:
+            raise FileNotFoundError(f"No index.html in {static_dir}")
+        
+        links = {f"/static/{name}": asset.url for name, asset in self.assets.items()}
+        if CHART_JS not in self.assets:
+            links[f"/static/{CHART_JS}"] = CHART_JS_CDN
+            if str(static_dir) not in _warned_missing_chart_js:
+                _warned_missing_chart_js.add(str(static_dir))
+                logger.warning("Chart.js is not vendored at %s; the page loads it from %s, so charts "
+                               "need internet access on the client. Run 'python -m "
+                               "hobby_budget_tracker.assets' to vendor it.",
+                               Path(static_dir) / CHART_JS, CHART_JS_CDN)
+        for link in sorted(links, key=len, reverse=True):
+            page = page.replace(f'"{link}"', f'"{links[link]}"')
+        self.index = Asset("index.html", page.encode("utf-8"), "text/html; charset=utf-8")
+    
+    def _add(self, asset: Asset):
+        self.assets[asset.name] = asset
+        self._urls[asset.url] = asset
+    
+    def find(self, url: str):
+        """Return ``(asset, immutable)`` for a ``/static/`` URL, or ``(None, False)``."""
+        asset = self._urls.get(url)
+        if asset is not None:
+            return asset, True
+        if url.startswith("/static/"):
+            return self.assets.get(url[len("/static/"):]), False
+        return None, False
+    
+    def url_for(self, name: str) -> Optional[str]:
+        """Return the hashed URL of the asset called ``name``, if it exists."""
+        asset = self.assets.get(name)
+        return asset.url if asset is not None else None
+
+
+def fetch_chart_js(static_dir: Path = STATIC_DIR, url: str = CHART_JS_CDN,
+                   sha256: Optional[str] = CHART_JS_SHA256) -> Path:
+    """Download the pinned Chart.js build into ``static_dir`` and return its path.
+    
+    Raises ValueError, leaving any vendored copy in place, unless the
+    download matches ``sha256``: the file is served with immutable caching.
+    """
+    if not sha256:
+        raise ValueError(f"No sha256 is pinned for Chart.js {CHART_JS_VERSION}; pass the digest of {url}")
+    target = Path(static_dir) / CHART_JS
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the target first so a failed download leaves no partial file
+    partial = target.with_name(f".{target.name}.partial")
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response, open(partial, "wb") as f:
+            digest = hashlib.sha256()
+            for block in iter(lambda: response.read(64 * 1024), b""):
+                digest.update(block)
+                f.write(block)
+        if digest.hexdigest() != sha256.lower():
+            raise ValueError(f"Chart.js from {url} has sha256 {digest.hexdigest()}, expected {sha256.lower()}")
+        os.replace(partial, target)
+    finally:
+        if partial.exists():
+            partial.unlink()
+    return target
+
+
+def main(argv: Optional[List[str]] = None):
+    """Vendor Chart.js so the page works without internet access."""
+    parser = argparse.ArgumentParser(description=f"Download Chart.js {CHART_JS_VERSION} into {STATIC_DIR / CHART_JS}")
+    parser.add_argument("--sha256", default=CHART_JS_SHA256,
+                        help="Expected digest of the download (default: the pinned one)")
+    args = parser.parse_args(argv)
+    try:
+        path = fetch_chart_js(sha256=args.sha256)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"✓ Saved Chart.js {CHART_JS_VERSION} to {path} (sha256 verified)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
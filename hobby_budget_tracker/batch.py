@@ -0,0 +1,159 @@
+"""
+Transactional batches of create, update and delete operations for Hobby Budget Tracker.
+"""
+import re
+from datetime import datetime
+from typing import List
+
+from .database import Database, DuplicateHobbyError
+from .models import Hobby, Expense, Activity, finite_float
+
+
+# Most operations accepted in one batch
+MAX_BATCH_OPERATIONS = 1000
+
+# "$2" in an id field stands for the id created by operation 2 of the batch
+_REFERENCE = re.compile(r"^\$(\d+)$")
+
+_ENTRY_FIELDS = {"expense": "amount", "activity": "duration_hours"}
+
+
+class BatchError(Exception):
+    """Raised when an operation of a batch fails; nothing of the batch is kept."""
+    
+    def __init__(self, index: int, status: int, message: str):
+        super().__init__(message)
+        self.index = index
+        self.status = status
+        self.message = message
+
+
+def run_batch(db: Database, operations: list) -> List[dict]:
+    """Apply ``operations`` in order, in one transaction, and return their results.
+    
+    Each operation is an object such as ``{"op": "create", "type":
+    "expense", "data": {...}}`` or ``{"op": "update", "type": "hobby",
+    "id": 3, "data": {...}}``; ``delete`` takes an ``id`` only. ``data``
+    holds the same fields as the single-item endpoints, and updates change
+    only the fields given. An ``id`` or ``hobby_id`` of ``"$N"`` refers to
+    the id created by operation N, so a new hobby and its first expense
+    can be sent together.
+    
+    Results are ``{"status": 201, "type": ..., "id": ...}`` for creates
+    and ``{"status": 200}`` otherwise. A reference must name a create of
+    the right type: ``hobby_id`` a hobby, an ``id`` the operation's own
+    type. The first failing operation raises BatchError and rolls back the
+    whole batch.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise BatchError(-1, 400, "Expected a non-empty list of operations")
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise BatchError(-1, 400, f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+    
+    results = []
+    with db.transaction():
+        for index, operation in enumerate(operations):
+            try:
+                results.append(_apply(db, operation, results))
+            except BatchError as e:
+                e.index = index
+                raise
+            except DuplicateHobbyError as e:
+                raise BatchError(index, 400, str(e)) from None
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                raise BatchError(index, 400, _describe(e)) from None
+    return results
+
+
+def _describe(error: Exception) -> str:
+    """Turn a parsing error into a client-facing message."""
+    if isinstance(error, KeyError):
+        return f"Missing required field: {error}"
+    return f"Invalid operation: {error}"
+
+
+def _resolve(value, results: List[dict], kind: str) -> int:
+    """Return an id, looking up ``"$N"`` references to earlier creates of a ``kind``."""
+    if isinstance(value, str):
+        match = _REFERENCE.match(value)
+        if match is None:
+            raise ValueError(f"invalid id {value!r}")
+        index = int(match.group(1))
+        if index >= len(results) or "id" not in results[index]:
+            raise ValueError(f"{value} does not refer to an earlier create")
+        if results[index]["type"] != kind:
+            raise ValueError(f"{value} refers to a {results[index]['type']}, not a {kind}")
+        return results[index]["id"]
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"invalid id {value!r}")
+    return value
+
+
+def _create_target_value(value):
+    """Parse a new hobby's target value as POST /api/hobbies does, ignoring invalid ones."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _update_target_value(value):
+    """Parse a changed target value as PUT /api/hobbies/<id> does; None keeps the old one."""
+    if value is None or value == "":
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _apply(db: Database, operation: dict, results: List[dict]) -> dict:
+    """Apply a single operation and return its result."""
+    op, kind = operation["op"], operation["type"]
+    data = operation.get("data") or {}
+    if kind not in ("hobby", "expense", "activity"):
+        raise BatchError(-1, 400, f"Unknown type: {kind}")
+    if op not in ("create", "update", "delete"):
+        raise BatchError(-1, 400, f"Unknown op: {op}")
+    
+    if op == "create":
+        if kind == "hobby":
+            hobby = Hobby(id=None, name=data["name"], description=data.get("description", ""),
+                          target_value=_create_target_value(data.get("target_value")))
+            return {"status": 201, "type": kind, "id": db.add_hobby(hobby)}
+        hobby_id = _resolve(data["hobby_id"], results, "hobby")
+        if db.get_hobby(hobby_id) is None:
+            raise BatchError(-1, 404, "Hobby not found")
+        value = finite_float(data[_ENTRY_FIELDS[kind]])
+        fields = {"id": None, "hobby_id": hobby_id, _ENTRY_FIELDS[kind]: value,
+                  "description": data.get("description", "")}
+        if data.get("date"):
+            fields["date"] = datetime.fromisoformat(data["date"])
+        if kind == "expense":
+            return {"status": 201, "type": kind, "id": db.add_expense(Expense(**fields))}
+        return {"status": 201, "type": kind, "id": db.add_activity(Activity(**fields))}
+    
+    entry_id = _resolve(operation["id"], results, kind)
+    if getattr(db, f"get_{kind}")(entry_id) is None:
+        raise BatchError(-1, 404, f"{kind.capitalize()} not found")
+    if op == "delete":
+        getattr(db, f"delete_{kind}")(entry_id)
+    elif kind == "hobby":
+        db.update_hobby(entry_id, name=data.get("name"), description=data.get("description"),
+                        target_value=_update_target_value(data.get("target_value")))
+    else:
+        hobby_id = data.get("hobby_id")
+        if hobby_id is not None:
+            hobby_id = _resolve(hobby_id, results, "hobby")
+            if db.get_hobby(hobby_id) is None:
+                raise BatchError(-1, 404, "Hobby not found")
+        value = data.get(_ENTRY_FIELDS[kind])
+        getattr(db, f"update_{kind}")(
+            entry_id, hobby_id=hobby_id,
+            description=data.get("description"),
+            date=datetime.fromisoformat(data["date"]) if data.get("date") else None,
+            **{_ENTRY_FIELDS[kind]: None if value is None else finite_float(value)}
+        )
+    return {"status": 200}
@@ -0,0 +1,104 @@
+"""
+Query result cache for Hobby Budget Tracker.
+"""
+import functools
+import itertools
+import threading
+from collections import OrderedDict
+
+
+# Number of results a QueryCache keeps by default
+DEFAULT_CACHE_SIZE = 256
+
+# Distinguishes connections in cache keys; ids of closed objects are reused
+_connection_ids = itertools.count()
+
+
+def next_connection_id() -> int:
+    """Return a process-wide unique number for a new connection."""
+    return next(_connection_ids)
+
+
+class QueryCache:
+    """Bounded LRU cache for the results of read-only Database methods.
+    
+    Results are keyed by connection, method and arguments and stamped with
+    the connection's ``PRAGMA data_version`` and the cache's write counter.
+    A result is served only while both are unchanged: data_version changes
+    when any other connection, in this or another process, commits, and
+    the write counter is bumped by every commit through a Database sharing
+    this cache, which data_version does not report to the committing
+    connection itself. Cached results are shared, so callers must not
+    modify them.
+    """
+    
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """Create an empty cache holding at most ``maxsize`` results."""
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.writes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def record_write(self):
+        """Invalidate every cached result after a commit in this process."""
+        with self._lock:
+            self.writes += 1
+    
+    def call(self, db, method, args: tuple, kwargs: dict):
+        """Return ``method(db, *args, **kwargs)``, from the cache while it is current."""
+        writes = self.writes
+        stamp = (db.conn.execute("PRAGMA data_version").fetchone()[0], writes)
+        key = (db.connection_id, method.__name__, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        value = method(db, *args, **kwargs)
+        with self._lock:
+            self._entries[key] = (stamp, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Drop all cached results and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+    
+    def stats(self) -> dict:
+        """Return the size and hit/miss counters of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'writes': self.writes,
+            }
+
+
+def cached(method):
+    """Serve a read-only Database method through the connection's QueryCache.
+    
+    Calls bypass the cache when the Database has none or is inside a
+    transaction, where it may see its own uncommitted changes.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.cache is None or self.conn.in_transaction:
+            return method(self, *args, **kwargs)
+        return self.cache.call(self, method, args, kwargs)
+    
+    return wrapper
@@ -2,12 +2,59 @@
 Command-line interface for Hobby Budget Tracker.
 """
 import argparse
+import csv
+import json
+import os
 import sys
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from itertools import chain
+from typing import Iterator, Optional
 
+from .analytics import DEFAULT_MONTHS, build_report
 from .database import Database, DuplicateHobbyError
-from .models import Hobby, Expense, Activity
+from .ingest import (DEFAULT_INGEST_CHUNK_SIZE, ENTRY_VALUES, INGEST_FORMATS, IngestSpec,
+                     detect_format, ingest_file, parse_column_map)
+from .models import Hobby, Expense, Activity, finite_float, isoformat
+
+
+# Characters of output collected before each write to stdout
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# Output formats of the expense and activity listings
+LIST_FORMATS = ("table", "csv", "jsonl")
+
+
+def _positive_int(text: str) -> int:
+    """Parse a command-line count that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{text}'")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return value
+
+
+class _BufferedWriter:
+    """Collects output and writes it to a stream in large blocks."""
+    
+    def __init__(self, stream, size: int = OUTPUT_BUFFER_SIZE):
+        self._stream = stream
+        self._size = size
+        self._parts = []
+        self._pending = 0
+    
+    def write(self, text: str):
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self._size:
+            self.flush()
+    
+    def flush(self):
+        self._stream.write("".join(self._parts))
+        self._stream.flush()
+        self._parts = []
+        self._pending = 0
 
 
 class CLI:
@@ -51,6 +98,10 @@ class CLI:
         # hobby stats
         stats_hobby = hobby_subparsers.add_parser("stats", help="Show hobby statistics")
         stats_hobby.add_argument("name", help="Hobby name")
+        stats_hobby.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                 help="Only count entries dated on or after this day")
+        stats_hobby.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                 help="Only count entries dated on or before this day")
         
         # Expense commands
         expense_parser = subparsers.add_parser("expense", help="Manage expenses")
@@ -59,12 +110,21 @@ class CLI:
         # expense add
         add_expense = expense_subparsers.add_parser("add", help="Add an expense")
         add_expense.add_argument("hobby", help="Hobby name")
-        add_expense.add_argument("amount", type=float, help="Expense amount")
+        add_expense.add_argument("amount", type=finite_float, help="Expense amount")
         add_expense.add_argument("--description", "-d", default="", help="Expense description")
         
         # expense list
         list_expense = expense_subparsers.add_parser("list", help="List expenses")
         list_expense.add_argument("--hobby", help="Filter by hobby name")
+        list_expense.add_argument("--limit", type=_positive_int, help="Show at most this many expenses")
+        list_expense.add_argument("--before", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                   help="Only show expenses dated before this day")
+        list_expense.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                   help="Only show expenses dated on or after this day")
+        list_expense.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                   help="Only show expenses dated on or before this day")
+        list_expense.add_argument("--format", choices=LIST_FORMATS, default="table",
+                                   help="Output format (default: table)")
         
         # Activity commands
         activity_parser = subparsers.add_parser("activity", help="Manage activities")
@@ -73,16 +133,65 @@ class CLI:
         # activity add
         add_activity = activity_subparsers.add_parser("add", help="Add an activity")
         add_activity.add_argument("hobby", help="Hobby name")
-        add_activity.add_argument("hours", type=float, help="Duration in hours")
+        add_activity.add_argument("hours", type=finite_float, help="Duration in hours")
         add_activity.add_argument("--description", "-d", default="", help="Activity description")
         
         # activity list
         list_activity = activity_subparsers.add_parser("list", help="List activities")
         list_activity.add_argument("--hobby", help="Filter by hobby name")
+        list_activity.add_argument("--limit", type=_positive_int, help="Show at most this many activities")
+        list_activity.add_argument("--before", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                    help="Only show activities dated before this day")
+        list_activity.add_argument("--since", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                    help="Only show activities dated on or after this day")
+        list_activity.add_argument("--until", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                    help="Only show activities dated on or before this day")
+        list_activity.add_argument("--format", choices=LIST_FORMATS, default="table",
+                                    help="Output format (default: table)")
+        
+        # Ingest command
+        ingest_parser = subparsers.add_parser("ingest", help="Add expenses or activities from a CSV or JSON lines file")
+        ingest_parser.add_argument("file", help="CSV or JSON lines file")
+        ingest_parser.add_argument("--type", choices=tuple(ENTRY_VALUES), required=True, dest="entry_type",
+                                   help="Kind of entries in the file")
+        ingest_parser.add_argument("--format", choices=INGEST_FORMATS,
+                                   help="Input format (default: from the file extension)")
+        ingest_parser.add_argument("--map", default="", metavar="FIELD=COLUMN,...",
+                                   help="Columns of the hobby, value, date and description fields "
+                                        "(default: hobby_name, amount or duration_hours, date, description)")
+        ingest_parser.add_argument("--hobby", help="Hobby of records without a hobby column")
+        ingest_parser.add_argument("--create-hobbies", action="store_true",
+                                   help="Create hobbies not found instead of rejecting their rows")
+        ingest_parser.add_argument("--date-format", metavar="FORMAT",
+                                   help="strptime format of the dates (default: ISO 8601)")
+        ingest_parser.add_argument("--decimal-comma", action="store_true",
+                                   help="Numbers are written like 1.234,50")
+        ingest_parser.add_argument("--delimiter", default=",", help="CSV field delimiter (default: ,)")
+        ingest_parser.add_argument("--encoding", default="utf-8-sig", help="File encoding (default: utf-8-sig)")
+        ingest_parser.add_argument("--workers", type=int,
+                                   help="Parse processes (default: one per CPU; 0 parses in this process)")
+        ingest_parser.add_argument("--chunk-size", type=int, default=DEFAULT_INGEST_CHUNK_SIZE,
+                                   help=f"Records per parse task and transaction (default: {DEFAULT_INGEST_CHUNK_SIZE})")
+        ingest_parser.add_argument("--rejects", metavar="PATH",
+                                   help="File for rejected records (default: FILE.rejects next to the input)")
         
         # Summary command
         subparsers.add_parser("summary", help="Show summary of all hobbies")
         
+        # Report command
+        report_parser = subparsers.add_parser("report", help="Show rolling, monthly and weekday KPIs")
+        report_parser.add_argument("--hobby", help="Only report on this hobby")
+        report_parser.add_argument("--as-of", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                                   help="Report as of this day (default: today)")
+        report_parser.add_argument("--months", type=int, default=DEFAULT_MONTHS,
+                                   help=f"Number of months to list (default: {DEFAULT_MONTHS})")
+        
+        # Totals maintenance commands
+        totals_parser = subparsers.add_parser("totals", help="Check or rebuild stored hobby totals")
+        totals_subparsers = totals_parser.add_subparsers(dest="totals_command")
+        totals_subparsers.add_parser("verify", help="Compare stored totals with expenses and activities")
+        totals_subparsers.add_parser("rebuild", help="Recompute stored totals from expenses and activities")
+        
         parsed_args = parser.parse_args(args)
         
         if not parsed_args.command:
@@ -96,11 +205,23 @@ class CLI:
                 return self._handle_expense_command(parsed_args)
             elif parsed_args.command == "activity":
                 return self._handle_activity_command(parsed_args)
+            elif parsed_args.command == "ingest":
+                return self._handle_ingest_command(parsed_args)
             elif parsed_args.command == "summary":
                 return self._handle_summary_command()
+            elif parsed_args.command == "report":
+                return self._handle_report_command(parsed_args)
+            elif parsed_args.command == "totals":
+                return self._handle_totals_command(parsed_args)
             else:
                 parser.print_help()
                 return 1
+        except BrokenPipeError:
+            # The reader of a pipe (e.g. ``head``) exited early; discard
+            # what is left so the interpreter does not fail flushing it
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 1
         except Exception as e:
             print(f"Error: {e}", file=sys.stderr)
             return 1
@@ -141,12 +262,17 @@ class CLI:
         elif args.hobby_command == "stats":
             hobby = self._get_hobby_or_exit(args.name)
             
-            total_expenses = self.db.get_total_expenses(hobby.id)
-            total_hours = self.db.get_total_hours(hobby.id)
-            expense_per_hour = self.db.get_expense_per_hour(hobby.id)
+            totals = self.db.get_hobby_totals(hobby.id, args.since, args.until)
+            total_expenses = totals['total_expenses']
+            total_hours = totals['total_hours']
+            expense_per_hour = totals['expense_per_hour']
             
             print(f"\n📊 Statistics for '{hobby.name}'")
             print("=" * 60)
+            if args.since or args.until:
+                since = args.since.isoformat() if args.since else "…"
+                until = args.until.isoformat() if args.until else "…"
+                print(f"Period:            {since} – {until}")
             print(f"Total Expenses:    €{total_expenses:.2f}")
             print(f"Total Hours:       {total_hours:.2f}h")
             if expense_per_hour is not None:
@@ -176,26 +302,12 @@ class CLI:
             return 0
         
         elif args.expense_command == "list":
-            hobby_id = None
-            if args.hobby:
-                hobby = self._get_hobby_or_exit(args.hobby)
-                hobby_id = hobby.id
-            
-            expenses = self.db.list_expenses(hobby_id)
-            if not expenses:
-                print("No expenses found.")
-                return 0
-            
-            print("\n💶 Expenses:")
-            print("-" * 60)
-            for expense in expenses:
-                hobby = self.db.get_hobby(expense.hobby_id)
-                date_str = expense.date.strftime("%Y-%m-%d")
-                print(f"{date_str} | {hobby.name:20s} | €{expense.amount:8.2f}")
-                if expense.description:
-                    print(f"           {expense.description}")
-            print()
-            return 0
+            hobby_id = self._get_hobby_or_exit(args.hobby).id if args.hobby else None
+            before = (args.before.isoformat(), 0) if args.before else None
+            expenses = self.db.iter_expenses_with_hobby(hobby_id, start=args.since, end=args.until,
+                                                        before=before, limit=args.limit)
+            return self._write_listing(expenses, "amount", args.format, "No expenses found.",
+                                       "\n💶 Expenses:", lambda amount: f"€{amount:8.2f}")
         
         else:
             print("Unknown expense command", file=sys.stderr)
@@ -217,35 +329,89 @@ class CLI:
             return 0
         
         elif args.activity_command == "list":
-            hobby_id = None
-            if args.hobby:
-                hobby = self._get_hobby_or_exit(args.hobby)
-                hobby_id = hobby.id
-            
-            activities = self.db.list_activities(hobby_id)
-            if not activities:
-                print("No activities found.")
-                return 0
-            
-            print("\n⏱️  Activities:")
-            print("-" * 60)
-            for activity in activities:
-                hobby = self.db.get_hobby(activity.hobby_id)
-                date_str = activity.date.strftime("%Y-%m-%d")
-                print(f"{date_str} | {hobby.name:20s} | {activity.duration_hours:6.2f}h")
-                if activity.description:
-                    print(f"           {activity.description}")
-            print()
-            return 0
+            hobby_id = self._get_hobby_or_exit(args.hobby).id if args.hobby else None
+            before = (args.before.isoformat(), 0) if args.before else None
+            activities = self.db.iter_activities_with_hobby(hobby_id, start=args.since, end=args.until,
+                                                            before=before, limit=args.limit)
+            return self._write_listing(activities, "duration_hours", args.format, "No activities found.",
+                                       "\n⏱️  Activities:", lambda hours: f"{hours:6.2f}h")
         
         else:
             print("Unknown activity command", file=sys.stderr)
             return 1
     
+    def _write_listing(self, entries: Iterator, field: str, output_format: str, empty: str,
+                       title: str, format_value) -> int:
+        """Stream ``(entry, hobby name)`` pairs to stdout as a table, CSV or JSON lines.
+        
+        ``field`` names the entry's amount or duration, shown in the table by
+        ``format_value``. Rows are written as they are read, so memory use
+        does not grow with the number of entries.
+        """
+        first = next(entries, None)
+        if first is None and output_format == "table":
+            print(empty)
+            return 0
+        
+        out = _BufferedWriter(sys.stdout)
+        rows = chain([first], entries) if first is not None else ()
+        if output_format == "csv":
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(["id", "date", "hobby_id", "hobby_name", field, "description"])
+            for entry, hobby_name in rows:
+                writer.writerow([entry.id, isoformat(entry, "date"), entry.hobby_id, hobby_name,
+                                 getattr(entry, field), entry.description])
+        elif output_format == "jsonl":
+            encode = json.JSONEncoder(ensure_ascii=False).encode
+            for entry, hobby_name in rows:
+                out.write(encode({
+                    'id': entry.id,
+                    'date': isoformat(entry, "date"),
+                    'hobby_id': entry.hobby_id,
+                    'hobby_name': hobby_name,
+                    field: getattr(entry, field),
+                    'description': entry.description
+                }) + "\n")
+        else:
+            out.write(f"{title}\n{'-' * 60}\n")
+            for entry, hobby_name in rows:
+                out.write(f"{isoformat(entry, 'date')[:10]} | {hobby_name:20s} | "
+                          f"{format_value(getattr(entry, field))}\n")
+                if entry.description:
+                    out.write(f"           {entry.description}\n")
+            out.write("\n")
+        out.flush()
+        return 0
+    
+    def _handle_ingest_command(self, args):
+        """Add expenses or activities from a file and report the throughput."""
+        spec = IngestSpec(
+            entry_type=args.entry_type,
+            input_format=args.format or detect_format(args.file),
+            columns=parse_column_map(args.map),
+            date_format=args.date_format,
+            decimal_comma=args.decimal_comma,
+            delimiter=args.delimiter,
+            default_hobby=args.hobby,
+        )
+        stats = ingest_file(self.db, args.file, spec, workers=args.workers, chunk_size=args.chunk_size,
+                            rejects_path=args.rejects, create_hobbies=args.create_hobbies,
+                            encoding=args.encoding)
+        
+        kind = "expenses" if args.entry_type == "expense" else "activities"
+        print(f"✓ Added {stats['added']} {kind} from {stats['rows']} rows in {stats['seconds']:.2f}s "
+              f"({stats['rows_per_second']:,.0f} rows/s)")
+        if stats['hobbies_created']:
+            print(f"  Created {stats['hobbies_created']} hobbies")
+        if stats['rejected']:
+            print(f"✗ Rejected {stats['rejected']} rows, written to {stats['rejects_path']}", file=sys.stderr)
+            return 1
+        return 0
+    
     def _handle_summary_command(self):
         """Show summary of all hobbies."""
-        hobbies = self.db.list_hobbies()
-        if not hobbies:
+        summary = self.db.get_summary()
+        if not summary:
             print("No hobbies found. Add one with 'hobby add <name>'")
             return 0
         
@@ -254,12 +420,12 @@ class CLI:
         print("=" * 80)
         print()
         
-        for hobby in hobbies:
-            total_expenses = self.db.get_total_expenses(hobby.id)
-            total_hours = self.db.get_total_hours(hobby.id)
-            expense_per_hour = self.db.get_expense_per_hour(hobby.id)
+        for entry in summary:
+            total_expenses = entry['total_expenses']
+            total_hours = entry['total_hours']
+            expense_per_hour = entry['expense_per_hour']
             
-            print(f"🎯 {hobby.name}")
+            print(f"🎯 {entry['name']}")
             print("-" * 80)
             print(f"   Total Expenses:    €{total_expenses:>10.2f}")
             print(f"   Total Hours:       {total_hours:>10.2f}h")
@@ -271,6 +437,65 @@ class CLI:
         
         print("=" * 80)
         return 0
+    
+    def _handle_report_command(self, args):
+        """Show rolling, month-over-month and weekday KPIs."""
+        hobby_id = self._get_hobby_or_exit(args.hobby).id if args.hobby else None
+        report = build_report(self.db, as_of=args.as_of, months=args.months, hobby_id=hobby_id)
+        if not report['hobbies']:
+            print("No hobbies found. Add one with 'hobby add <name>'")
+            return 0
+        
+        def per_hour(value):
+            return f"€{value:>8.2f}/h" if value is not None else f"{'N/A':>11s}"
+        
+        def change(value):
+            return f"{value:>+10.2f}" if value is not None else f"{'':>10s}"
+        
+        print(f"\n📈 KPI report as of {report['as_of']}")
+        for hobby in report['hobbies']:
+            print("=" * 80)
+            print(f"🎯 {hobby['name']}")
+            print("-" * 80)
+            for kpi in hobby['rolling']:
+                print(f"   Last {kpi['days']:>3} days: €{kpi['expenses']:>10.2f} {kpi['hours']:>8.2f}h "
+                      f"{per_hour(kpi['expense_per_hour'])}")
+            print()
+            print(f"   {'Month':<9}{'Expenses':>11}{'Change':>10}{'Hours':>9}{'Change':>10}{'Per hour':>13}")
+            for kpi in hobby['monthly']:
+                print(f"   {kpi['month']:<9}€{kpi['expenses']:>10.2f}{change(kpi['expenses_change'])}"
+                      f"{kpi['hours']:>8.2f}h{change(kpi['hours_change'])}  {per_hour(kpi['expense_per_hour'])}")
+            print()
+            print(f"   {'Weekday':<11}{'Expenses':>11}{'Hours':>9}{'Per hour':>13}")
+            for kpi in hobby['weekdays']:
+                print(f"   {kpi['weekday']:<11}€{kpi['expenses']:>10.2f}{kpi['hours']:>8.2f}h  "
+                      f"{per_hour(kpi['expense_per_hour'])}")
+        print("=" * 80)
+        return 0
+    
+    def _handle_totals_command(self, args):
+        """Handle totals maintenance subcommands."""
+        if args.totals_command == "verify":
+            mismatches = self.db.verify_hobby_totals()
+            if not mismatches:
+                print("✓ Stored hobby totals are consistent")
+                return 0
+            
+            for mismatch in mismatches:
+                hobby = self.db.get_hobby(mismatch['hobby_id'])
+                print(f"✗ {hobby.name}: stored {mismatch['stored']}, expected {mismatch['expected']}",
+                      file=sys.stderr)
+            print("Run 'totals rebuild' to repair them", file=sys.stderr)
+            return 1
+        
+        elif args.totals_command == "rebuild":
+            count = self.db.rebuild_hobby_totals()
+            print(f"✓ Rebuilt totals for {count} hobbies")
+            return 0
+        
+        else:
+            print("Unknown totals command", file=sys.stderr)
+            return 1
 
 
 def main():
@@ -2,11 +2,14 @@
 Database management for Hobby Budget Tracker using SQLite.
 """
 import sqlite3
+from contextlib import contextmanager
+from itertools import islice, starmap
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 
-from .models import Hobby, Expense, Activity
+from .cache import QueryCache, cached, next_connection_id
+from .models import Hobby, Expense, Activity, isoformat
 
 
 class DuplicateHobbyError(Exception):
@@ -14,147 +17,578 @@ class DuplicateHobbyError(Exception):
     pass
 
 
+def _migrate_initial_schema(conn):
+    """Create the hobbies, expenses and activities tables."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS hobbies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            description TEXT,
+            created_at TEXT NOT NULL,
+            target_value REAL
+        )
+    """)
+    
+    # Databases created before target values existed lack the column
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(hobbies)")]
+    if "target_value" not in columns:
+        conn.execute("ALTER TABLE hobbies ADD COLUMN target_value REAL")
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS expenses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            hobby_id INTEGER NOT NULL,
+            amount REAL NOT NULL,
+            description TEXT,
+            date TEXT NOT NULL,
+            FOREIGN KEY (hobby_id) REFERENCES hobbies (id)
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            hobby_id INTEGER NOT NULL,
+            duration_hours REAL NOT NULL,
+            description TEXT,
+            date TEXT NOT NULL,
+            FOREIGN KEY (hobby_id) REFERENCES hobbies (id)
+        )
+    """)
+
+
+def _migrate_add_indexes(conn):
+    """Index expenses and activities by hobby and date.
+    
+    The (hobby_id, date, value) indexes cover the per-hobby totals and time
+    series queries; the date indexes serve the unfiltered, date-ordered lists.
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_expenses_hobby_date ON expenses (hobby_id, date, amount)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_activities_hobby_date ON activities (hobby_id, date, duration_hours)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_activities_date ON activities (date)")
+
+
+# Actual per-hobby totals, used to backfill, rebuild and verify hobby_totals
+_ACTUAL_TOTALS_SQL = """
+    SELECT h.id AS hobby_id,
+           COALESCE(e.total, 0.0) AS total_expenses,
+           COALESCE(a.total, 0.0) AS total_hours,
+           COALESCE(e.count, 0) AS expense_count,
+           COALESCE(a.count, 0) AS activity_count
+    FROM hobbies h
+    LEFT JOIN (
+        SELECT hobby_id, SUM(amount) AS total, COUNT(*) AS count
+        FROM expenses GROUP BY hobby_id
+    ) e ON e.hobby_id = h.id
+    LEFT JOIN (
+        SELECT hobby_id, SUM(duration_hours) AS total, COUNT(*) AS count
+        FROM activities GROUP BY hobby_id
+    ) a ON a.hobby_id = h.id
+"""
+
+
+def _rebuild_hobby_totals(conn):
+    """Recompute every row of hobby_totals from the source tables."""
+    conn.execute("DELETE FROM hobby_totals")
+    conn.execute(
+        "INSERT INTO hobby_totals (hobby_id, total_expenses, total_hours, expense_count, activity_count) "
+        + _ACTUAL_TOTALS_SQL
+    )
+
+
+def _migrate_add_hobby_totals(conn):
+    """Keep per-hobby totals in a table maintained by triggers.
+    
+    The totals must equal ``SUM()`` over the (hobby_id, date, value) index,
+    which adds a hobby's rows in index order. An insert that sorts last in
+    that order, as new entries usually do, extends the running total with
+    the same addition ``SUM()`` would make last; any other insert, update or
+    delete recomputes the hobby's total and count over the index, since
+    subtracting a value would leave floating point residue behind.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS hobby_totals (
+            hobby_id INTEGER PRIMARY KEY,
+            total_expenses REAL NOT NULL DEFAULT 0.0,
+            total_hours REAL NOT NULL DEFAULT 0.0,
+            expense_count INTEGER NOT NULL DEFAULT 0,
+            activity_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS hobby_totals_hobby_insert AFTER INSERT ON hobbies
+        BEGIN
+            INSERT OR IGNORE INTO hobby_totals (hobby_id) VALUES (NEW.id);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS hobby_totals_hobby_delete AFTER DELETE ON hobbies
+        BEGIN
+            DELETE FROM hobby_totals WHERE hobby_id = OLD.id;
+        END
+    """)
+    
+    for table, column, total, count in (
+        ("expenses", "amount", "total_expenses", "expense_count"),
+        ("activities", "duration_hours", "total_hours", "activity_count"),
+    ):
+        recompute = f"""
+            UPDATE hobby_totals
+            SET ({total}, {count}) = (
+                SELECT COALESCE(SUM({column}), 0.0), COUNT(*) FROM {table} WHERE hobby_id = hobby_totals.hobby_id
+            )
+        """
+        # Index entries are ordered by (hobby_id, date, value, rowid)
+        later_rows = f"""
+            EXISTS (
+                SELECT 1 FROM {table}
+                WHERE hobby_id = NEW.hobby_id AND (date, {column}, id) > (NEW.date, NEW.{column}, NEW.id)
+            )
+        """
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS hobby_totals_{table}_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE hobby_totals
+                SET {total} = {total} + NEW.{column}, {count} = {count} + 1
+                WHERE hobby_id = NEW.hobby_id AND NOT {later_rows};
+                {recompute} WHERE hobby_id = NEW.hobby_id AND {later_rows};
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS hobby_totals_{table}_delete AFTER DELETE ON {table}
+            BEGIN {recompute} WHERE hobby_id = OLD.hobby_id; END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS hobby_totals_{table}_update
+            AFTER UPDATE OF hobby_id, {column}, date ON {table}
+            BEGIN {recompute} WHERE hobby_id IN (OLD.hobby_id, NEW.hobby_id); END
+        """)
+    
+    _rebuild_hobby_totals(conn)
+
+
+# Tables whose changes are tracked by get_table_versions()
+VERSIONED_TABLES = ("hobbies", "expenses", "activities")
+
+
+def _migrate_add_table_versions(conn):
+    """Count updated and deleted rows per table in a table maintained by triggers.
+    
+    Inserts are not counted: the tables use AUTOINCREMENT, so the highest
+    id ever issued, kept in sqlite_sequence, already grows with every
+    insert, and bulk inserts stay free of trigger overhead. Counters start
+    at the creation time in microseconds, so a database recreated from
+    scratch does not repeat the versions of the one it replaces.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    for table in VERSIONED_TABLES:
+        conn.execute(
+            "INSERT OR IGNORE INTO table_versions (name, version) "
+            "VALUES (?, CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER))",
+            (table,)
+        )
+        bump = f"UPDATE table_versions SET version = version + 1 WHERE name = '{table}';"
+        for event in ("UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS table_versions_{table}_{event.lower()} AFTER {event} ON {table}
+                BEGIN {bump} END
+            """)
+
+
+# Ordered schema migrations. Each step must be idempotent so that databases
+# created before versioning (user_version 0) can safely replay all of them.
+# Never reorder or remove entries; append new steps to the end.
+MIGRATIONS = [
+    _migrate_initial_schema,
+    _migrate_add_indexes,
+    _migrate_add_hobby_totals,
+    _migrate_add_table_versions,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+# Rows handed to a single executemany() call by the bulk insert methods
+DEFAULT_CHUNK_SIZE = 1000
+
+# Rows fetched per fetchmany() call by the iter_* methods
+DEFAULT_FETCH_SIZE = 500
+
+# Recent expenses and activities returned by get_dashboard()
+DEFAULT_DASHBOARD_SIZE = 100
+
+# Named sets of PRAGMAs applied to every new connection, in order. "default"
+# keeps SQLite's own settings. "wal" lets readers run alongside a writer and
+# makes concurrent writers wait for the lock instead of failing with
+# "database is locked"; "wal-durable" additionally syncs on every commit.
+# WAL needs shared memory, so it does not work on network file systems.
+STORAGE_PROFILES = {
+    "default": {},
+    "wal": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "wal-durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+# Column lists in the field order of the models, so a row can be passed
+# straight to the model's constructor; dates stay ISO text until read
+HOBBY_COLUMNS = "id, name, description, created_at, target_value"
+EXPENSE_COLUMNS = "id, hobby_id, amount, description, date"
+ACTIVITY_COLUMNS = "id, hobby_id, duration_hours, description, date"
+
+# Extra column with the name of an entry's hobby, looked up by primary key
+HOBBY_NAME_COLUMN = "(SELECT h.name FROM hobbies h WHERE h.id = {table}.hobby_id)"
+
+# JSON objects with the keys, in sorted order, and values of the web
+# serializers. REALs are printed with 17 significant digits so they parse
+# back to exactly the stored double (json_object alone rounds to 15).
+EXPENSE_JSON = ("json_object('amount', json(printf('%!.17g', amount)), 'date', date, "
+                "'description', description, 'hobby_id', hobby_id, 'id', id)")
+ACTIVITY_JSON = ("json_object('date', date, 'description', description, "
+                 "'duration_hours', json(printf('%!.17g', duration_hours)), 'hobby_id', hobby_id, 'id', id)")
+
+
+def _chunked(iterable: Iterable, size: int):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _date_range_clause(start: Optional[date], end: Optional[date]) -> Tuple[str, list]:
+    """Build an index-friendly filter on the ISO ``date`` column.
+    
+    ``start`` and ``end`` are inclusive days. ISO 8601 text sorts
+    chronologically, so plain comparisons on the stored value can use the
+    date indexes, unlike wrapping the column in date().
+    """
+    conditions = []
+    params = []
+    if start is not None:
+        if isinstance(start, datetime):
+            start = start.date()
+        conditions.append("date >= ?")
+        params.append(start.isoformat())
+    if end is not None:
+        if isinstance(end, datetime):
+            end = end.date()
+        conditions.append("date < ?")
+        params.append((end + timedelta(days=1)).isoformat())
+    return " AND ".join(conditions), params
+
+
+def _with_hobby_name(from_row):
+    """Wrap a model's ``_from_row`` for rows ending in HOBBY_NAME_COLUMN.
+    
+    The wrapper returns ``(entry, hobby name)`` pairs.
+    """
+    def from_named_row(*row):
+        return from_row(*row[:-1]), row[-1]
+    
+    return from_named_row
+
+
 class Database:
     """Manages SQLite database operations."""
     
-    def __init__(self, db_path: str = "hobby_budget.db"):
-        """Initialize database connection."""
+    def __init__(self, db_path: str = "hobby_budget.db", check_same_thread: bool = True,
+                 storage_profile: str = "default", read_only: bool = False,
+                 cache: Optional[QueryCache] = None):
+        """Initialize database connection.
+        
+        Pass ``check_same_thread=False`` when the connection is shared between
+        threads one at a time, e.g. by a connection pool. ``storage_profile``
+        names an entry of ``STORAGE_PROFILES`` whose PRAGMAs are applied to
+        the connection. A ``read_only`` connection opens an existing database
+        without migrating it, and any write through it fails. With a
+        ``cache``, summary, totals and chart queries are answered from it
+        until the data changes; one cache may be shared by many connections.
+        """
+        if storage_profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {storage_profile}")
         self.db_path = db_path
+        self.check_same_thread = check_same_thread
+        self.storage_profile = storage_profile
+        self.read_only = read_only
+        self.cache = cache
+        self.connection_id = next_connection_id()
         self.conn = None
+        self._transaction_depth = 0
         self._connect()
-        self._create_tables()
+        if not read_only:
+            self._migrate()
     
     def _connect(self):
         """Establish database connection."""
-        self.conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=self.check_same_thread)
+        else:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
         self.conn.row_factory = sqlite3.Row
+        for pragma, value in STORAGE_PROFILES[self.storage_profile].items():
+            # The journal mode is a property of the file, set by writers
+            if self.read_only and pragma == "journal_mode":
+                continue
+            self.conn.execute(f"PRAGMA {pragma} = {value}")
     
-    @staticmethod
-    def _row_to_hobby(row) -> Hobby:
-        """Convert database row to Hobby object."""
-        return Hobby(
-            id=row["id"],
-            name=row["name"],
-            description=row["description"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            target_value=row["target_value"]
-        )
+    def _migrate(self):
+        """Bring the schema up to date.
+        
+        The applied schema version is kept in ``PRAGMA user_version``, so
+        opening an up-to-date database costs a single pragma read.
+        """
+        if self._schema_version() >= SCHEMA_VERSION:
+            return
+        
+        # Take the write lock before re-reading the version so concurrent
+        # processes opening an old database migrate it only once.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = self._schema_version()
+            for migration in MIGRATIONS[version:]:
+                migration(self.conn)
+            if version < SCHEMA_VERSION:
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn.rollback()
+            raise
+    
+    def _schema_version(self) -> int:
+        """Return the schema version stored in the database file."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+    
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed operations in a single transaction.
+        
+        Nested blocks join the outermost one, which commits when it exits
+        normally and rolls everything back if an exception escapes.
+        """
+        if self._transaction_depth == 0 and not self.conn.in_transaction:
+            self.conn.execute("BEGIN")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.conn.commit()
+            if self.cache is not None:
+                self.cache.record_write()
+    
+    @contextmanager
+    def _read_transaction(self):
+        """Run the enclosed reads on one snapshot of the database.
+        
+        Unlike ``transaction()`` this does not count as a write, so it
+        leaves the query cache alone.
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self.conn.commit()
     
     @staticmethod
-    def _row_to_expense(row) -> Expense:
-        """Convert database row to Expense object."""
-        return Expense(
-            id=row["id"],
-            hobby_id=row["hobby_id"],
-            amount=row["amount"],
-            description=row["description"],
-            date=datetime.fromisoformat(row["date"])
-        )
+    def page_key(entry) -> Tuple[str, int]:
+        """Return the ``(date, id)`` keyset pagination key of an expense or activity."""
+        return isoformat(entry, "date"), entry.id
     
     @staticmethod
-    def _row_to_activity(row) -> Activity:
-        """Convert database row to Activity object."""
-        return Activity(
-            id=row["id"],
-            hobby_id=row["hobby_id"],
-            duration_hours=row["duration_hours"],
-            description=row["description"],
-            date=datetime.fromisoformat(row["date"])
-        )
+    def _entries_query(table: str, columns: str, hobby_id: Optional[int] = None, start: Optional[date] = None,
+                       end: Optional[date] = None, before: Optional[Tuple[str, int]] = None,
+                       limit: Optional[int] = None) -> Tuple[str, list]:
+        """Build the SELECT for expenses or activities with optional filters.
+        
+        Rows are ordered by (date, id) descending, which the date indexes
+        deliver without sorting, so a ``before`` key seeks straight to a page.
+        """
+        conditions = []
+        params = []
+        if hobby_id is not None:
+            conditions.append("hobby_id = ?")
+            params.append(hobby_id)
+        range_sql, range_params = _date_range_clause(start, end)
+        if range_sql:
+            conditions.append(range_sql)
+            params.extend(range_params)
+        if before is not None:
+            conditions.append("(date, id) < (?, ?)")
+            params.extend(before)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT {columns} FROM {table}{where} ORDER BY date DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
     
-    def _create_tables(self):
-        """Create database tables if they don't exist."""
-        cursor = self.conn.cursor()
+    def _iter_rows(self, sql: str, params, from_row, batch_size: int) -> Iterator:
+        """Run a query and yield model instances, fetching ``batch_size`` rows at a time.
         
-        # Hobbies table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS hobbies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT,
-                created_at TEXT NOT NULL,
-                target_value REAL
-            )
-        """)
+        Rows are fetched as plain tuples and passed positionally to a model's
+        ``_from_row``, so the query must select the columns in field order.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from starmap(from_row, rows)
+    
+    def _entries_json(self, table: str, json_expr: str, hobby_id: Optional[int], start: Optional[date],
+                      end: Optional[date], before: Optional[Tuple[str, int]],
+                      limit: Optional[int]) -> Tuple[str, Optional[Tuple[str, int]]]:
+        """Build the JSON array of expenses or activities in SQLite.
         
-        # Migrate existing hobbies table to add target_value column if it doesn't exist
-        try:
-            cursor.execute("SELECT target_value FROM hobbies LIMIT 1")
-        except sqlite3.OperationalError:
-            # Column doesn't exist, add it
-            cursor.execute("ALTER TABLE hobbies ADD COLUMN target_value REAL")
+        Without a ``limit`` the whole array comes from one json_group_array;
+        the subquery's ``LIMIT -1`` keeps SQLite from dropping its ORDER BY.
+        With a ``limit`` one extra row is read to tell whether another page
+        follows, and the key of the page's last row is returned if so.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        if limit is None:
+            sql, params = self._entries_query(table, "*", hobby_id, start, end, before)
+            cursor.execute(f"SELECT json_group_array({json_expr}) FROM ({sql} LIMIT -1)", params)
+            return cursor.fetchone()[0], None
         
-        # Expenses table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS expenses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hobby_id INTEGER NOT NULL,
-                amount REAL NOT NULL,
-                description TEXT,
-                date TEXT NOT NULL,
-                FOREIGN KEY (hobby_id) REFERENCES hobbies (id)
-            )
-        """)
+        sql, params = self._entries_query(table, f"{json_expr}, date, id", hobby_id, start, end, before, limit + 1)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        next_key = rows[limit - 1][1:] if len(rows) > limit else None
+        return "[" + ",".join(row[0] for row in rows[:limit]) + "]", next_key
+    
+    def _insert_many(self, sql: str, rows: Iterable[tuple], chunk_size: int) -> List[int]:
+        """Insert rows with executemany in one transaction and return their ids.
         
-        # Activities table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS activities (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                hobby_id INTEGER NOT NULL,
-                duration_hours REAL NOT NULL,
-                description TEXT,
-                date TEXT NOT NULL,
-                FOREIGN KEY (hobby_id) REFERENCES hobbies (id)
+        The write lock is held for the whole transaction and the tables use
+        AUTOINCREMENT, so each chunk receives consecutive ids ending at
+        last_insert_rowid().
+        """
+        ids = []
+        with self.transaction():
+            for chunk in _chunked(rows, chunk_size):
+                self.conn.executemany(sql, chunk)
+                last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        return ids
+    
+    def _update_entry(self, table: str, column: str, entry_id: int, hobby_id: int, value: float,
+                      description: str, date_text: str):
+        """Overwrite the fields of an expense or activity."""
+        with self.transaction():
+            self.conn.execute(
+                f"UPDATE {table} SET hobby_id = ?, {column} = ?, description = ?, date = ? WHERE id = ?",
+                (hobby_id, value, description, date_text, entry_id)
             )
-        """)
-        
-        self.conn.commit()
     
     # Hobby operations
     def add_hobby(self, hobby: Hobby) -> int:
         """Add a new hobby to the database."""
         cursor = self.conn.cursor()
         try:
-            cursor.execute(
-                "INSERT INTO hobbies (name, description, created_at, target_value) VALUES (?, ?, ?, ?)",
-                (hobby.name, hobby.description, hobby.created_at.isoformat(), hobby.target_value)
-            )
-            self.conn.commit()
+            with self.transaction():
+                cursor.execute(
+                    "INSERT INTO hobbies (name, description, created_at, target_value) VALUES (?, ?, ?, ?)",
+                    (hobby.name, hobby.description, hobby.created_at.isoformat(), hobby.target_value)
+                )
             return cursor.lastrowid
         except sqlite3.IntegrityError:
             raise DuplicateHobbyError(f"A hobby with the name '{hobby.name}' already exists")
     
+    def add_hobbies_many(self, hobbies: Iterable[Hobby], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+        """Add several hobbies in one transaction and return their new ids.
+        
+        If any name already exists nothing is added.
+        """
+        rows = (
+            (hobby.name, hobby.description, hobby.created_at.isoformat(), hobby.target_value)
+            for hobby in hobbies
+        )
+        try:
+            return self._insert_many(
+                "INSERT INTO hobbies (name, description, created_at, target_value) VALUES (?, ?, ?, ?)",
+                rows, chunk_size
+            )
+        except sqlite3.IntegrityError:
+            raise DuplicateHobbyError("A hobby with one of the given names already exists")
+    
     def get_hobby(self, hobby_id: int) -> Optional[Hobby]:
         """Get a hobby by ID."""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM hobbies WHERE id = ?", (hobby_id,))
+        cursor.execute(f"SELECT {HOBBY_COLUMNS} FROM hobbies WHERE id = ?", (hobby_id,))
         row = cursor.fetchone()
-        return self._row_to_hobby(row) if row else None
+        return Hobby._from_row(*row) if row else None
     
     def get_hobby_by_name(self, name: str) -> Optional[Hobby]:
         """Get a hobby by name."""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM hobbies WHERE name = ?", (name,))
+        cursor.execute(f"SELECT {HOBBY_COLUMNS} FROM hobbies WHERE name = ?", (name,))
         row = cursor.fetchone()
-        return self._row_to_hobby(row) if row else None
+        return Hobby._from_row(*row) if row else None
     
     def list_hobbies(self) -> List[Hobby]:
         """List all hobbies."""
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM hobbies ORDER BY name")
-        return [self._row_to_hobby(row) for row in cursor.fetchall()]
+        cursor.row_factory = None
+        cursor.execute(f"SELECT {HOBBY_COLUMNS} FROM hobbies ORDER BY name")
+        return list(starmap(Hobby._from_row, cursor.fetchall()))
+    
+    def iter_hobbies(self, hobby_id: Optional[int] = None,
+                     batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Hobby]:
+        """Iterate over hobbies ordered by name, optionally only one of them."""
+        if hobby_id is not None:
+            return self._iter_rows(f"SELECT {HOBBY_COLUMNS} FROM hobbies WHERE id = ?", (hobby_id,),
+                                   Hobby._from_row, batch_size)
+        return self._iter_rows(f"SELECT {HOBBY_COLUMNS} FROM hobbies ORDER BY name", (), Hobby._from_row, batch_size)
     
     def delete_hobby(self, hobby_id: int):
         """Delete a hobby and all related expenses and activities."""
         cursor = self.conn.cursor()
-        try:
+        with self.transaction():
             cursor.execute("DELETE FROM activities WHERE hobby_id = ?", (hobby_id,))
             cursor.execute("DELETE FROM expenses WHERE hobby_id = ?", (hobby_id,))
             cursor.execute("DELETE FROM hobbies WHERE id = ?", (hobby_id,))
-            self.conn.commit()
-        except sqlite3.Error:
-            self.conn.rollback()
-            raise
     
     def update_hobby(self, hobby_id: int, name: str = None, description: str = None, target_value: float = None):
         """Update a hobby's information."""
@@ -172,11 +606,11 @@ class Database:
             target_value = hobby.target_value
         
         try:
-            cursor.execute(
-                "UPDATE hobbies SET name = ?, description = ?, target_value = ? WHERE id = ?",
-                (name, description, target_value, hobby_id)
-            )
-            self.conn.commit()
+            with self.transaction():
+                cursor.execute(
+                    "UPDATE hobbies SET name = ?, description = ?, target_value = ? WHERE id = ?",
+                    (name, description, target_value, hobby_id)
+                )
         except sqlite3.IntegrityError:
             raise DuplicateHobbyError(f"A hobby with the name '{name}' already exists")
     
@@ -184,66 +618,322 @@ class Database:
     def add_expense(self, expense: Expense) -> int:
         """Add a new expense to the database."""
         cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO expenses (hobby_id, amount, description, date) VALUES (?, ?, ?, ?)",
+        with self.transaction():
+            cursor.execute(
+                "INSERT INTO expenses (hobby_id, amount, description, date) VALUES (?, ?, ?, ?)",
+                (expense.hobby_id, expense.amount, expense.description, expense.date.isoformat())
+            )
+        return cursor.lastrowid
+    
+    def add_expenses_many(self, expenses: Iterable[Expense], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+        """Add several expenses in one transaction and return their new ids."""
+        rows = (
             (expense.hobby_id, expense.amount, expense.description, expense.date.isoformat())
+            for expense in expenses
+        )
+        return self._insert_many(
+            "INSERT INTO expenses (hobby_id, amount, description, date) VALUES (?, ?, ?, ?)",
+            rows, chunk_size
         )
-        self.conn.commit()
-        return cursor.lastrowid
     
-    def list_expenses(self, hobby_id: Optional[int] = None) -> List[Expense]:
-        """List expenses, optionally filtered by hobby."""
+    def list_expenses(self, hobby_id: Optional[int] = None, limit: Optional[int] = None,
+                      before: Optional[Tuple[str, int]] = None, start: Optional[date] = None,
+                      end: Optional[date] = None) -> List[Expense]:
+        """List expenses, newest first, optionally filtered by hobby and date range.
+        
+        ``start`` and ``end`` are inclusive days.
+        
+        For keyset pagination pass ``limit`` and, for every page after the
+        first, ``before`` set to the ``(date, id)`` key of the last expense of
+        the previous page (see ``page_key``). Each page then costs the same
+        regardless of how deep it is.
+        """
+        return list(self.iter_expenses(hobby_id, start, end, before=before, limit=limit))
+    
+    def list_expenses_json(self, hobby_id: Optional[int] = None, limit: Optional[int] = None,
+                           before: Optional[Tuple[str, int]] = None, start: Optional[date] = None,
+                           end: Optional[date] = None) -> Tuple[str, Optional[Tuple[str, int]]]:
+        """List expenses like ``list_expenses``, as JSON text built by SQLite.
+        
+        Returns the JSON array and, when ``limit`` cut the list short, the
+        ``before`` key of the next page. The objects hold the same fields and
+        values as the web API's expenses, with dates as stored.
+        """
+        return self._entries_json("expenses", EXPENSE_JSON, hobby_id, start, end, before, limit)
+    
+    def iter_expenses(self, hobby_id: Optional[int] = None, start: Optional[date] = None,
+                      end: Optional[date] = None, before: Optional[Tuple[str, int]] = None,
+                      limit: Optional[int] = None, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Expense]:
+        """Iterate over expenses, newest first, fetching rows in batches.
+        
+        Optionally filtered by hobby, by an inclusive ``start``/``end`` day
+        and to expenses ordered after the ``before`` page key.
+        """
+        sql, params = self._entries_query("expenses", EXPENSE_COLUMNS, hobby_id, start, end, before, limit)
+        return self._iter_rows(sql, params, Expense._from_row, batch_size)
+    
+    def iter_expenses_with_hobby(self, hobby_id: Optional[int] = None, start: Optional[date] = None,
+                                 end: Optional[date] = None, before: Optional[Tuple[str, int]] = None,
+                                 limit: Optional[int] = None,
+                                 batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Tuple[Expense, str]]:
+        """Iterate over expenses like ``iter_expenses``, each paired with its hobby's name.
+        
+        The names come from the same cursor, so no query is run per expense.
+        """
+        columns = f"{EXPENSE_COLUMNS}, {HOBBY_NAME_COLUMN.format(table='expenses')}"
+        sql, params = self._entries_query("expenses", columns, hobby_id, start, end, before, limit)
+        return self._iter_rows(sql, params, _with_hobby_name(Expense._from_row), batch_size)
+    
+    def get_expense(self, expense_id: int) -> Optional[Expense]:
+        """Get an expense by ID."""
         cursor = self.conn.cursor()
-        if hobby_id is not None:
-            cursor.execute("SELECT * FROM expenses WHERE hobby_id = ? ORDER BY date DESC", (hobby_id,))
-        else:
-            cursor.execute("SELECT * FROM expenses ORDER BY date DESC")
-        return [self._row_to_expense(row) for row in cursor.fetchall()]
+        cursor.execute(f"SELECT {EXPENSE_COLUMNS} FROM expenses WHERE id = ?", (expense_id,))
+        row = cursor.fetchone()
+        return Expense._from_row(*row) if row else None
     
-    def get_total_expenses(self, hobby_id: int) -> float:
-        """Get total expenses for a hobby."""
+    def update_expense(self, expense_id: int, hobby_id: int = None, amount: float = None,
+                       description: str = None, date: datetime = None):
+        """Update an expense's information; fields left as None keep their value."""
+        expense = self.get_expense(expense_id)
+        if not expense:
+            raise ValueError(f"Expense with id {expense_id} not found")
+        self._update_entry("expenses", "amount", expense_id,
+                           expense.hobby_id if hobby_id is None else hobby_id,
+                           expense.amount if amount is None else amount,
+                           expense.description if description is None else description,
+                           isoformat(expense, "date") if date is None else date.isoformat())
+    
+    def delete_expense(self, expense_id: int):
+        """Delete an expense."""
+        with self.transaction():
+            self.conn.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+    
+    def get_total_expenses(self, hobby_id: int, start: Optional[date] = None,
+                           end: Optional[date] = None) -> float:
+        """Get total expenses for a hobby, optionally between inclusive days."""
+        if start is not None or end is not None:
+            return self._range_total("expenses", "amount", hobby_id, start, end)[0]
         cursor = self.conn.cursor()
-        cursor.execute("SELECT SUM(amount) as total FROM expenses WHERE hobby_id = ?", (hobby_id,))
+        cursor.execute("SELECT total_expenses FROM hobby_totals WHERE hobby_id = ?", (hobby_id,))
         row = cursor.fetchone()
-        return row["total"] if row["total"] is not None else 0.0
+        return row["total_expenses"] if row else 0.0
     
     # Activity operations
     def add_activity(self, activity: Activity) -> int:
         """Add a new activity to the database."""
         cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO activities (hobby_id, duration_hours, description, date) VALUES (?, ?, ?, ?)",
+        with self.transaction():
+            cursor.execute(
+                "INSERT INTO activities (hobby_id, duration_hours, description, date) VALUES (?, ?, ?, ?)",
+                (activity.hobby_id, activity.duration_hours, activity.description, activity.date.isoformat())
+            )
+        return cursor.lastrowid
+    
+    def add_activities_many(self, activities: Iterable[Activity],
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+        """Add several activities in one transaction and return their new ids."""
+        rows = (
             (activity.hobby_id, activity.duration_hours, activity.description, activity.date.isoformat())
+            for activity in activities
+        )
+        return self._insert_many(
+            "INSERT INTO activities (hobby_id, duration_hours, description, date) VALUES (?, ?, ?, ?)",
+            rows, chunk_size
         )
-        self.conn.commit()
-        return cursor.lastrowid
     
-    def list_activities(self, hobby_id: Optional[int] = None) -> List[Activity]:
-        """List activities, optionally filtered by hobby."""
+    def list_activities(self, hobby_id: Optional[int] = None, limit: Optional[int] = None,
+                        before: Optional[Tuple[str, int]] = None, start: Optional[date] = None,
+                        end: Optional[date] = None) -> List[Activity]:
+        """List activities, newest first, optionally filtered by hobby and date range.
+        
+        ``start`` and ``end`` are inclusive days.
+        
+        For keyset pagination pass ``limit`` and, for every page after the
+        first, ``before`` set to the ``(date, id)`` key of the last activity of
+        the previous page (see ``page_key``). Each page then costs the same
+        regardless of how deep it is.
+        """
+        return list(self.iter_activities(hobby_id, start, end, before=before, limit=limit))
+    
+    def list_activities_json(self, hobby_id: Optional[int] = None, limit: Optional[int] = None,
+                             before: Optional[Tuple[str, int]] = None, start: Optional[date] = None,
+                             end: Optional[date] = None) -> Tuple[str, Optional[Tuple[str, int]]]:
+        """List activities like ``list_activities``, as JSON text built by SQLite.
+        
+        Returns the JSON array and, when ``limit`` cut the list short, the
+        ``before`` key of the next page. The objects hold the same fields and
+        values as the web API's activities, with dates as stored.
+        """
+        return self._entries_json("activities", ACTIVITY_JSON, hobby_id, start, end, before, limit)
+    
+    def iter_activities(self, hobby_id: Optional[int] = None, start: Optional[date] = None,
+                        end: Optional[date] = None, before: Optional[Tuple[str, int]] = None,
+                        limit: Optional[int] = None, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Activity]:
+        """Iterate over activities, newest first, fetching rows in batches.
+        
+        Optionally filtered by hobby, by an inclusive ``start``/``end`` day
+        and to activities ordered after the ``before`` page key.
+        """
+        sql, params = self._entries_query("activities", ACTIVITY_COLUMNS, hobby_id, start, end, before, limit)
+        return self._iter_rows(sql, params, Activity._from_row, batch_size)
+    
+    def iter_activities_with_hobby(self, hobby_id: Optional[int] = None, start: Optional[date] = None,
+                                   end: Optional[date] = None, before: Optional[Tuple[str, int]] = None,
+                                   limit: Optional[int] = None,
+                                   batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Tuple[Activity, str]]:
+        """Iterate over activities like ``iter_activities``, each paired with its hobby's name.
+        
+        The names come from the same cursor, so no query is run per activity.
+        """
+        columns = f"{ACTIVITY_COLUMNS}, {HOBBY_NAME_COLUMN.format(table='activities')}"
+        sql, params = self._entries_query("activities", columns, hobby_id, start, end, before, limit)
+        return self._iter_rows(sql, params, _with_hobby_name(Activity._from_row), batch_size)
+    
+    def get_activity(self, activity_id: int) -> Optional[Activity]:
+        """Get an activity by ID."""
         cursor = self.conn.cursor()
-        if hobby_id is not None:
-            cursor.execute("SELECT * FROM activities WHERE hobby_id = ? ORDER BY date DESC", (hobby_id,))
-        else:
-            cursor.execute("SELECT * FROM activities ORDER BY date DESC")
-        return [self._row_to_activity(row) for row in cursor.fetchall()]
+        cursor.execute(f"SELECT {ACTIVITY_COLUMNS} FROM activities WHERE id = ?", (activity_id,))
+        row = cursor.fetchone()
+        return Activity._from_row(*row) if row else None
+    
+    def update_activity(self, activity_id: int, hobby_id: int = None, duration_hours: float = None,
+                        description: str = None, date: datetime = None):
+        """Update an activity's information; fields left as None keep their value."""
+        activity = self.get_activity(activity_id)
+        if not activity:
+            raise ValueError(f"Activity with id {activity_id} not found")
+        self._update_entry("activities", "duration_hours", activity_id,
+                           activity.hobby_id if hobby_id is None else hobby_id,
+                           activity.duration_hours if duration_hours is None else duration_hours,
+                           activity.description if description is None else description,
+                           isoformat(activity, "date") if date is None else date.isoformat())
     
-    def get_total_hours(self, hobby_id: int) -> float:
-        """Get total hours spent on a hobby."""
+    def delete_activity(self, activity_id: int):
+        """Delete an activity."""
+        with self.transaction():
+            self.conn.execute("DELETE FROM activities WHERE id = ?", (activity_id,))
+    
+    def get_total_hours(self, hobby_id: int, start: Optional[date] = None,
+                        end: Optional[date] = None) -> float:
+        """Get total hours spent on a hobby, optionally between inclusive days."""
+        if start is not None or end is not None:
+            return self._range_total("activities", "duration_hours", hobby_id, start, end)[0]
         cursor = self.conn.cursor()
-        cursor.execute("SELECT SUM(duration_hours) as total FROM activities WHERE hobby_id = ?", (hobby_id,))
+        cursor.execute("SELECT total_hours FROM hobby_totals WHERE hobby_id = ?", (hobby_id,))
         row = cursor.fetchone()
-        return row["total"] if row["total"] is not None else 0.0
+        return row["total_hours"] if row else 0.0
     
     # KPI calculation
-    def get_expense_per_hour(self, hobby_id: int) -> Optional[float]:
-        """Calculate expense per hour for a hobby."""
-        total_expenses = self.get_total_expenses(hobby_id)
-        total_hours = self.get_total_hours(hobby_id)
+    def _range_total(self, table: str, column: str, hobby_id: int,
+                     start: Optional[date], end: Optional[date]) -> Tuple[float, int]:
+        """Sum ``column`` and count a hobby's entries dated in a range.
+        
+        The filter compares the stored ISO ``date`` text, so the query is
+        answered from the (hobby_id, date, value) covering index.
+        """
+        range_sql, params = _date_range_clause(start, end)
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"SELECT COALESCE(SUM({column}), 0.0), COUNT(*) FROM {table} WHERE hobby_id = ? AND {range_sql}",
+            [hobby_id] + params
+        )
+        total, count = cursor.fetchone()
+        return total, count
+    
+    @cached
+    def get_hobby_totals(self, hobby_id: int, start: Optional[date] = None,
+                         end: Optional[date] = None) -> dict:
+        """Get total expenses, hours, entry counts and expense per hour for a hobby.
         
+        Without a date range this reads the trigger-maintained hobby_totals
+        table, so the cost does not grow with the number of expenses and
+        activities. With an inclusive ``start`` and/or ``end`` day only the
+        entries dated in that range are summed.
+        """
+        if start is not None or end is not None:
+            total_expenses, expense_count = self._range_total("expenses", "amount", hobby_id, start, end)
+            total_hours, activity_count = self._range_total("activities", "duration_hours", hobby_id, start, end)
+            return {
+                'total_expenses': total_expenses,
+                'total_hours': total_hours,
+                'expense_count': expense_count,
+                'activity_count': activity_count,
+                'expense_per_hour': self._expense_per_hour(total_expenses, total_hours),
+            }
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM hobby_totals WHERE hobby_id = ?", (hobby_id,))
+        row = cursor.fetchone()
+        totals = {
+            'total_expenses': row["total_expenses"] if row else 0.0,
+            'total_hours': row["total_hours"] if row else 0.0,
+            'expense_count': row["expense_count"] if row else 0,
+            'activity_count': row["activity_count"] if row else 0,
+        }
+        totals['expense_per_hour'] = self._expense_per_hour(totals['total_expenses'], totals['total_hours'])
+        return totals
+    
+    @staticmethod
+    def _expense_per_hour(total_expenses: float, total_hours: float) -> Optional[float]:
+        """Divide expenses by hours, or None when no time was logged."""
         if total_hours > 0:
             return total_expenses / total_hours
         return None
     
+    def get_expense_per_hour(self, hobby_id: int, start: Optional[date] = None,
+                             end: Optional[date] = None) -> Optional[float]:
+        """Calculate expense per hour for a hobby, optionally between inclusive days."""
+        return self.get_hobby_totals(hobby_id, start, end)['expense_per_hour']
+    
+    @cached
+    def get_summary(self) -> List[dict]:
+        """Get totals and expense per hour for every hobby, ordered by name.
+        
+        Joins hobbies with hobby_totals so the whole summary is one query,
+        regardless of the number of hobbies.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT h.id, h.name, h.description, h.target_value,
+                   COALESCE(t.total_expenses, 0.0) AS total_expenses,
+                   COALESCE(t.total_hours, 0.0) AS total_hours
+            FROM hobbies h
+            LEFT JOIN hobby_totals t ON t.hobby_id = h.id
+            ORDER BY h.name
+        """)
+        return [{
+            'id': row["id"],
+            'name': row["name"],
+            'description': row["description"],
+            'total_expenses': row["total_expenses"],
+            'total_hours': row["total_hours"],
+            'expense_per_hour': self._expense_per_hour(row["total_expenses"], row["total_hours"]),
+            'target_value': row["target_value"]
+        } for row in cursor.fetchall()]
+    
+    @cached
+    def get_dashboard(self, limit: int = DEFAULT_DASHBOARD_SIZE) -> dict:
+        """Get everything the web page shows first, read in one transaction.
+        
+        Returns the hobbies, the summary and the ``limit`` newest expenses
+        and activities as ``(entry, hobby name)`` pairs, all taken from the
+        same snapshot of the database. ``expenses_next`` and
+        ``activities_next`` hold the page key to continue each list with
+        through ``list_expenses(before=...)``, or None on the last page.
+        """
+        with self._read_transaction():
+            # Fetch one extra entry per list to learn whether another page follows
+            expenses = list(self.iter_expenses_with_hobby(limit=limit + 1))
+            activities = list(self.iter_activities_with_hobby(limit=limit + 1))
+            return {
+                "hobbies": self.list_hobbies(),
+                "summary": self.get_summary(),
+                "expenses": expenses[:limit],
+                "activities": activities[:limit],
+                "expenses_next": self.page_key(expenses[limit - 1][0]) if len(expenses) > limit else None,
+                "activities_next": self.page_key(activities[limit - 1][0]) if len(activities) > limit else None,
+            }
+    
+    @cached
     def get_expense_per_hour_time_series(self, hobby_id: int) -> List[dict]:
         """Get cumulative expense per hour over time for charting.
         
@@ -252,48 +942,127 @@ class Database:
         """
         cursor = self.conn.cursor()
         
-        # Get all dates where there were expenses or activities
+        # Sum each day's expenses and hours, then accumulate the daily sums
+        # with window functions so the whole series comes from a single pass
         cursor.execute("""
-            SELECT DISTINCT date(date) as day
+            SELECT day,
+                   SUM(SUM(spent)) OVER (ORDER BY day) AS cumulative_expenses,
+                   SUM(SUM(hours)) OVER (ORDER BY day) AS cumulative_hours
             FROM (
-                SELECT date FROM expenses WHERE hobby_id = ?
-                UNION
-                SELECT date FROM activities WHERE hobby_id = ?
+                SELECT date(date) AS day, amount AS spent, 0.0 AS hours
+                FROM expenses WHERE hobby_id = ?
+                UNION ALL
+                SELECT date(date) AS day, 0.0 AS spent, duration_hours AS hours
+                FROM activities WHERE hobby_id = ?
             )
+            GROUP BY day
             ORDER BY day
         """, (hobby_id, hobby_id))
         
-        dates = [row["day"] for row in cursor.fetchall()]
-        
         time_series = []
-        for date_str in dates:
-            # Calculate cumulative expenses up to this date
-            cursor.execute("""
-                SELECT SUM(amount) as total 
-                FROM expenses 
-                WHERE hobby_id = ? AND date(date) <= ?
-            """, (hobby_id, date_str))
-            cumulative_expenses = cursor.fetchone()["total"] or 0.0
-            
-            # Calculate cumulative hours up to this date
-            cursor.execute("""
-                SELECT SUM(duration_hours) as total 
-                FROM activities 
-                WHERE hobby_id = ? AND date(date) <= ?
-            """, (hobby_id, date_str))
-            cumulative_hours = cursor.fetchone()["total"] or 0.0
+        for row in cursor.fetchall():
+            cumulative_expenses = row["cumulative_expenses"] or 0.0
+            cumulative_hours = row["cumulative_hours"] or 0.0
             
-            # Calculate expense per hour
-            expense_per_hour = cumulative_expenses / cumulative_hours if cumulative_hours > 0 else None
-            
-            if expense_per_hour is not None:
+            # Days before the first activity have no expense per hour yet
+            if cumulative_hours > 0:
                 time_series.append({
-                    'date': date_str,
-                    'expense_per_hour': round(expense_per_hour, 2)
+                    'date': row["day"],
+                    'expense_per_hour': round(cumulative_expenses / cumulative_hours, 2)
                 })
         
         return time_series
     
+    def get_daily_totals(self, hobby_id: Optional[int] = None) -> List[Tuple[int, int, float, float]]:
+        """Get each hobby's expenses and hours summed per day.
+        
+        Returns ``(hobby_id, epoch_day, expenses, hours)`` tuples ordered by
+        hobby and day, where ``epoch_day`` counts days since 1970-01-01.
+        Only days with at least one expense or activity are included. Days
+        are bucketed with ``date()`` like the expense per hour time series,
+        so dates stored with a UTC offset count on their UTC day.
+        """
+        where = "WHERE hobby_id = ?" if hobby_id is not None else ""
+        params = (hobby_id, hobby_id) if hobby_id is not None else ()
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"""
+            SELECT hobby_id,
+                   CAST(julianday(day) - 2440587.5 AS INTEGER) AS epoch_day,
+                   SUM(spent), SUM(hours)
+            FROM (
+                SELECT hobby_id, date(date) AS day, amount AS spent, 0.0 AS hours
+                FROM expenses {where}
+                UNION ALL
+                SELECT hobby_id, date(date) AS day, 0.0 AS spent, duration_hours AS hours
+                FROM activities {where}
+            )
+            GROUP BY hobby_id, day
+            ORDER BY hobby_id, day
+        """, params)
+        return cursor.fetchall()
+    
+    def get_table_versions(self) -> dict:
+        """Get a version stamp for each table in ``VERSIONED_TABLES``.
+        
+        A stamp is the highest id ever inserted into the table together with
+        its count of updated and deleted rows. Both only grow, whichever
+        connection writes, so equal stamps mean unchanged contents.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute("""
+            SELECT v.name, COALESCE(s.seq, 0), v.version
+            FROM table_versions v
+            LEFT JOIN sqlite_sequence s ON s.name = v.name
+        """)
+        return {name: (last_id, changes) for name, last_id, changes in cursor.fetchall()}
+    
+    # Maintenance
+    def verify_hobby_totals(self) -> List[dict]:
+        """Compare hobby_totals with the expense and activity tables.
+        
+        Returns one entry per hobby whose stored totals are missing or differ
+        from the recomputed ones; an empty list means everything is consistent.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT actual.*,
+                   t.hobby_id IS NOT NULL AS stored,
+                   t.total_expenses AS stored_total_expenses,
+                   t.total_hours AS stored_total_hours,
+                   t.expense_count AS stored_expense_count,
+                   t.activity_count AS stored_activity_count
+            FROM ({_ACTUAL_TOTALS_SQL}) actual
+            LEFT JOIN hobby_totals t ON t.hobby_id = actual.hobby_id
+            ORDER BY actual.hobby_id
+        """)
+        mismatches = []
+        for row in cursor.fetchall():
+            consistent = (
+                row["stored"]
+                and row["stored_expense_count"] == row["expense_count"]
+                and row["stored_activity_count"] == row["activity_count"]
+                and row["stored_total_expenses"] == row["total_expenses"]
+                and row["stored_total_hours"] == row["total_hours"]
+            )
+            if not consistent:
+                mismatches.append({
+                    'hobby_id': row["hobby_id"],
+                    'expected': {key: row[key] for key in
+                                 ('total_expenses', 'total_hours', 'expense_count', 'activity_count')},
+                    'stored': {key: row["stored_" + key] for key in
+                               ('total_expenses', 'total_hours', 'expense_count', 'activity_count')}
+                              if row["stored"] else None,
+                })
+        return mismatches
+    
+    def rebuild_hobby_totals(self) -> int:
+        """Recompute hobby_totals from scratch and return the number of hobbies."""
+        with self.transaction():
+            _rebuild_hobby_totals(self.conn)
+        return self.conn.execute("SELECT COUNT(*) FROM hobby_totals").fetchone()[0]
+    
     def close(self):
         """Close database connection."""
         if self.conn:
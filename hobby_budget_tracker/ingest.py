@@ -0,0 +1,362 @@
+"""
+Bulk ingest of CSV and JSON lines files for Hobby Budget Tracker.
+"""
+import csv
+import io
+import json
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .database import Database
+from .models import Hobby, Expense, Activity
+
+
+# Records handed to a parse worker at once; also the rows per transaction
+DEFAULT_INGEST_CHUNK_SIZE = 5000
+
+# Input formats, detected from the file extension unless given
+INGEST_FORMATS = ("csv", "jsonl")
+
+# The value column of each entry type
+ENTRY_VALUES = {"expense": "amount", "activity": "duration_hours"}
+
+# Fields that can be mapped to columns; "value" stands for the entry's
+# amount or duration_hours
+FIELDS = ("hobby", "value", "date", "description")
+
+# Columns read when the mapping does not name one; the same as the
+# ``list --format csv`` and ``jsonl`` output, so listings can be ingested
+# again as they are
+DEFAULT_COLUMNS = {"hobby": "hobby_name", "date": "date", "description": "description"}
+
+# Parse settings of the current worker process, set by _init_worker
+_worker_spec: Optional["IngestSpec"] = None
+_worker_header: Optional[List[str]] = None
+
+
+class IngestError(ValueError):
+    """Raised when an input file or column mapping cannot be ingested at all."""
+    pass
+
+
+@dataclass(frozen=True)
+class IngestSpec:
+    """How to read the records of an input file.
+    
+    ``columns`` maps the fields of FIELDS to column names (CSV) or keys
+    (JSON lines); see ``parse_column_map``. ``default_hobby`` is used for
+    records without a hobby column or with an empty one.
+    """
+    entry_type: str
+    input_format: str
+    columns: Dict[str, str] = field(default_factory=dict)
+    date_format: Optional[str] = None
+    decimal_comma: bool = False
+    delimiter: str = ","
+    default_hobby: Optional[str] = None
+    
+    def column(self, name: str) -> str:
+        """Return the column holding field ``name``."""
+        if name == "value":
+            return self.columns.get("value", ENTRY_VALUES[self.entry_type])
+        return self.columns.get(name, DEFAULT_COLUMNS[name])
+
+
+def parse_column_map(text: str) -> Dict[str, str]:
+    """Parse a mapping such as ``"hobby=Category,value=Betrag,date=Buchungstag"``.
+    
+    ``amount`` and ``duration_hours`` are accepted as names of ``value``.
+    """
+    columns = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, sep, column = item.partition("=")
+        name = name.strip()
+        if name in ENTRY_VALUES.values():
+            name = "value"
+        if not sep or not column.strip() or name not in FIELDS:
+            raise IngestError(f"Invalid column mapping {item!r}; expected FIELD=COLUMN with FIELD one of "
+                              f"{', '.join(FIELDS)}")
+        columns[name] = column.strip()
+    return columns
+
+
+def detect_format(path: str) -> str:
+    """Return the input format implied by the extension of ``path``."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise IngestError(f"Cannot tell the format of {path}; pass --format")
+
+
+def _parse_number(value, decimal_comma: bool) -> float:
+    """Parse a JSON number or a number written as text, e.g. ``"1.234,50"`` with ``decimal_comma``."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    elif isinstance(value, str) and value.strip():
+        text = value.strip()
+        if decimal_comma:
+            text = text.replace(".", "").replace(",", ".")
+        number = float(text)
+    else:
+        raise ValueError("missing")
+    if not math.isfinite(number):
+        raise ValueError("not finite")
+    return number
+
+
+def _parse_values(spec: IngestSpec, hobby, value, text, description) -> Tuple[str, float, str, datetime]:
+    """Turn the fields of one record into ``(hobby name, value, description, date)``.
+    
+    Raises ValueError with a message for the rejects file.
+    """
+    hobby = hobby or spec.default_hobby
+    if not isinstance(hobby, str) or not hobby.strip():
+        raise ValueError("missing hobby")
+    
+    try:
+        number = _parse_number(value, spec.decimal_comma)
+    except ValueError:
+        raise ValueError(f"invalid {spec.column('value')}: {value!r}") from None
+    
+    try:
+        if not isinstance(text, str):
+            raise ValueError
+        text = text.strip()
+        date = datetime.strptime(text, spec.date_format) if spec.date_format else datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"invalid date: {text!r}") from None
+    
+    return hobby.strip(), number, str(description or ""), date
+
+
+def _init_worker(spec: IngestSpec, header: Optional[List[str]]):
+    """Keep the parse settings in the worker process."""
+    global _worker_spec, _worker_header
+    _worker_spec, _worker_header = spec, header
+
+
+def _parse_chunk(task: Tuple[int, str]) -> Tuple[list, list]:
+    """Parse a chunk of input text starting at line ``first_line``.
+    
+    Returns ``(rows, rejects)``: rows are ``(line, record, hobby name,
+    value, description, date)`` tuples, rejects are ``(line, record,
+    reason)``, both with the record as it was read (a list of CSV fields or
+    a JSON line) so rows rejected later keep it too.
+    """
+    first_line, text = task
+    spec = _worker_spec
+    names = [spec.column(name) for name in FIELDS]
+    rows, rejects = [], []
+    if spec.input_format == "csv":
+        # Column positions are looked up once per chunk, not once per row
+        hobby_at, value_at, date_at, description_at = (
+            _worker_header.index(name) if name in _worker_header else None for name in names
+        )
+        reader = csv.reader(io.StringIO(text, newline=""), delimiter=spec.delimiter)
+        width = len(_worker_header)
+        line = first_line
+        for fields in reader:
+            record_line, line = line, first_line + reader.line_num
+            if not fields:
+                continue
+            if len(fields) != width:
+                rejects.append((record_line, fields, f"expected {width} fields, got {len(fields)}"))
+                continue
+            try:
+                rows.append((record_line, fields, *_parse_values(
+                    spec,
+                    fields[hobby_at] if hobby_at is not None else None,
+                    fields[value_at],
+                    fields[date_at],
+                    fields[description_at] if description_at is not None else None,
+                )))
+            except ValueError as e:
+                rejects.append((record_line, fields, str(e)))
+    else:
+        # Not splitlines(): JSON strings may hold other line separators
+        for line, raw in enumerate(text.split("\n"), first_line):
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+                if not isinstance(record, dict):
+                    raise ValueError("not a JSON object")
+                rows.append((line, raw, *_parse_values(spec, *map(record.get, names))))
+            except ValueError as e:
+                rejects.append((line, raw, str(e)))
+    return rows, rejects
+
+
+def _csv_header(fp, spec: IngestSpec) -> Tuple[List[str], int]:
+    """Read the header of a CSV file and return it with the number of lines it spans."""
+    lines = []
+    for line in fp:
+        lines.append(line)
+        if "".join(lines).count('"') % 2 == 0:
+            break
+    header = next(csv.reader(lines, delimiter=spec.delimiter), None)
+    if not header:
+        raise IngestError("The CSV file is empty")
+    header = [name.strip() for name in header]
+    
+    required = ("date", "value") if spec.default_hobby else ("hobby", "date", "value")
+    missing = [spec.column(name) for name in required if spec.column(name) not in header]
+    if "description" in spec.columns and spec.column("description") not in header:
+        missing.append(spec.column("description"))
+    if missing:
+        raise IngestError(f"Missing column(s) {', '.join(missing)} in the CSV header")
+    return header, len(lines)
+
+
+def _read_chunks(fp, first_line: int, chunk_size: int, csv_quotes: bool) -> Iterator[Tuple[int, str]]:
+    """Yield ``(first line, text)`` chunks of about ``chunk_size`` records each.
+    
+    For CSV a chunk only ends where the quotes read so far are balanced, so
+    records with quoted line breaks are never split between chunks.
+    """
+    lines, quotes, records = [], 0, 0
+    line_no = first_line
+    for line in fp:
+        lines.append(line)
+        if csv_quotes:
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+        records += 1
+        if records >= chunk_size:
+            yield line_no, "".join(lines)
+            line_no += len(lines)
+            lines, quotes, records = [], 0, 0
+    if lines:
+        yield line_no, "".join(lines)
+
+
+class _RejectsFile:
+    """Writes rejected records, with their line number and reason, on first use.
+    
+    CSV rejects lead with ``_line`` and ``_error`` columns, so rows with
+    too few or too many fields still line up with the input header.
+    """
+    
+    def __init__(self, path: str, input_format: str, header: Optional[List[str]], delimiter: str):
+        self.path = path
+        self._format = input_format
+        self._header = header
+        self._delimiter = delimiter
+        self._fp = None
+        self._writer = None
+    
+    def write(self, rejects):
+        if self._fp is None:
+            self._fp = open(self.path, "w", encoding="utf-8", newline="")
+            if self._format == "csv":
+                self._writer = csv.writer(self._fp, delimiter=self._delimiter, lineterminator="\n")
+                self._writer.writerow(["_line", "_error"] + self._header)
+        for line, record, reason in rejects:
+            if self._format == "csv":
+                self._writer.writerow([line, reason] + record)
+            else:
+                self._fp.write(json.dumps({'line': line, 'error': reason, 'record': record},
+                                          ensure_ascii=False) + "\n")
+    
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+
+
+def ingest_file(db: Database, path: str, spec: IngestSpec, workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_INGEST_CHUNK_SIZE, rejects_path: Optional[str] = None,
+                create_hobbies: bool = False, encoding: str = "utf-8-sig") -> dict:
+    """Add the expenses or activities of a CSV or JSON lines file.
+    
+    The file is read in chunks of ``chunk_size`` records, which a pool of
+    ``workers`` processes (default: one per CPU; 0 parses in this process)
+    turns into rows. This process resolves hobby names through a map
+    loaded once and writes each chunk in one transaction, in file order.
+    Hobbies not found are created with ``create_hobbies`` and rejected
+    otherwise.
+    
+    Rejected records go to ``rejects_path`` (default: the input path with
+    ``.rejects`` before its extension), which is only created when there
+    are any. Returns counts of the rows read, added and rejected, the
+    hobbies created, the elapsed seconds and the rows per second.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if rejects_path is None:
+        source = Path(path)
+        rejects_path = str(source.with_name(f"{source.stem}.rejects{source.suffix}"))
+    
+    hobby_ids = {hobby.name: hobby.id for hobby in db.list_hobbies()}
+    entry_class = Expense if spec.entry_type == "expense" else Activity
+    value_field = ENTRY_VALUES[spec.entry_type]
+    add_many = db.add_expenses_many if spec.entry_type == "expense" else db.add_activities_many
+    stats = {'rows': 0, 'added': 0, 'rejected': 0, 'hobbies_created': 0}
+    
+    start = time.perf_counter()
+    with open(path, encoding=encoding, newline="" if spec.input_format == "csv" else None) as fp:
+        header, first_line = None, 1
+        if spec.input_format == "csv":
+            header, header_lines = _csv_header(fp, spec)
+            first_line += header_lines
+        rejects_file = _RejectsFile(rejects_path, spec.input_format, header, spec.delimiter)
+        chunks = _read_chunks(fp, first_line, chunk_size, spec.input_format == "csv")
+        
+        def write(rows, rejects):
+            stats['rows'] += len(rows) + len(rejects)
+            entries = []
+            # Hobbies created for a chunk are committed with its entries
+            with db.transaction():
+                for line, record, hobby_name, value, description, date in rows:
+                    hobby_id = hobby_ids.get(hobby_name)
+                    if hobby_id is None and create_hobbies:
+                        hobby_id = hobby_ids[hobby_name] = db.add_hobby(Hobby(id=None, name=hobby_name))
+                        stats['hobbies_created'] += 1
+                    if hobby_id is None:
+                        rejects.append((line, record, f"unknown hobby: {hobby_name}"))
+                        continue
+                    entries.append(entry_class(id=None, hobby_id=hobby_id, description=description,
+                                               date=date, **{value_field: value}))
+                if entries:
+                    add_many(entries, chunk_size=len(entries))
+            stats['added'] += len(entries)
+            stats['rejected'] += len(rejects)
+            if rejects:
+                rejects.sort(key=lambda reject: reject[0])
+                rejects_file.write(rejects)
+        
+        try:
+            if workers == 0:
+                _init_worker(spec, header)
+                for chunk in chunks:
+                    write(*_parse_chunk(chunk))
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(spec, header)) as pool:
+                    # Keep a few chunks per worker queued, in file order, so
+                    # the file is not read faster than it is written
+                    pending = deque()
+                    for chunk in chunks:
+                        pending.append(pool.submit(_parse_chunk, chunk))
+                        if len(pending) >= 2 * workers:
+                            write(*pending.popleft().result())
+                    while pending:
+                        write(*pending.popleft().result())
+        finally:
+            rejects_file.close()
+    
+    stats['seconds'] = time.perf_counter() - start
+    stats['rows_per_second'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+    stats['rejects_path'] = rejects_path if stats['rejected'] else None
+    return stats
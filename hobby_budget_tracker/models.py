@@ -1,7 +1,8 @@
 """
 Data models for Hobby Budget Tracker.
 """
-from dataclasses import dataclass, field
+import math
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Optional
 
@@ -11,6 +12,98 @@ def default_datetime():
     return datetime.now()
 
 
+class _LazyDatetime:
+    """Datetime attribute that may hold ISO text until it is first read.
+    
+    Rows loaded from the database store the date text as is, so entries
+    whose date is never looked at (or only serialized again) skip parsing.
+    The value lives in a private slot; reading parses and caches it.
+    """
+    
+    def __init__(self, slot):
+        self.slot = slot
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, objtype)
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+            self.slot.__set__(obj, value)
+        return value
+    
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+
+def _slotted(*lazy_datetimes: str):
+    """Rebuild a dataclass with ``__slots__`` (``slots=True`` needs Python 3.10).
+    
+    Slotted instances have no per-instance ``__dict__``, which makes them
+    smaller and faster to create. Fields named in ``lazy_datetimes`` accept
+    ISO text and are parsed on first access.
+    """
+    def wrap(cls):
+        names = [f.name for f in fields(cls)]
+        namespace = dict(cls.__dict__)
+        for name in names:
+            # Defaults live on in the generated __init__
+            namespace.pop(name, None)
+        namespace.pop("__dict__", None)
+        namespace.pop("__weakref__", None)
+        namespace["__slots__"] = tuple(f"_{name}" if name in lazy_datetimes else name for name in names)
+        slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+        slotted.__qualname__ = cls.__qualname__
+        for name in lazy_datetimes:
+            setattr(slotted, name, _LazyDatetime(getattr(slotted, f"_{name}")))
+        slotted._from_row = staticmethod(_row_constructor(slotted, names, namespace["__slots__"]))
+        return slotted
+    return wrap
+
+
+def _row_constructor(cls, names, slots):
+    """Build ``cls._from_row(*columns)``, which fills the slots directly.
+    
+    It skips the dataclass ``__init__`` (default handling and the lazy
+    datetime setter), so hydrating database rows costs little more than
+    allocating the instance. Generated like the dataclass methods are.
+    """
+    body = "".join(f"    self.{slot} = {name}\n" for name, slot in zip(names, slots))
+    source = f"def _from_row({', '.join(names)}):\n    self = new(cls)\n{body}    return self\n"
+    namespace = {"new": object.__new__, "cls": cls}
+    exec(source, namespace)
+    return namespace["_from_row"]
+
+
+def isoformat(entry, name: str) -> str:
+    """Return the ISO text of a datetime field without parsing it if possible.
+    
+    Text loaded from the database that is already in the form
+    ``datetime.isoformat()`` produces for naive datetimes is returned
+    unchanged; anything else goes through ``datetime``.
+    """
+    descriptor = getattr(type(entry), name, None)
+    if isinstance(descriptor, _LazyDatetime):
+        value = descriptor.slot.__get__(entry)
+        if isinstance(value, str) and value[10:11] == "T" and (
+                len(value) == 19 or (len(value) == 26 and value[19] == "." and value[20:] != "000000")):
+            return value
+    return getattr(entry, name).isoformat()
+
+
+def finite_float(value) -> float:
+    """Convert an amount or duration with float(), raising ValueError unless it is finite.
+    
+    SQLite would store an infinity that JSON cannot represent, and NaN
+    would violate the NOT NULL columns, so neither is accepted.
+    """
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"{value!r} is not a finite number")
+    return number
+
+
+@_slotted("created_at")
 @dataclass
 class Hobby:
     """Represents a hobby being tracked."""
@@ -21,6 +114,7 @@ class Hobby:
     target_value: Optional[float] = None  # Target expense per hour (e.g., 10 euros/hour)
 
 
+@_slotted("date")
 @dataclass
 class Expense:
     """Represents an expense for a hobby."""
@@ -31,6 +125,7 @@ class Expense:
     date: datetime = field(default_factory=default_datetime)
 
 
+@_slotted("date")
 @dataclass
 class Activity:
     """Represents an activity session for a hobby."""
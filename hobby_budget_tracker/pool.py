@@ -0,0 +1,75 @@
+"""
+Connection pooling for Hobby Budget Tracker.
+"""
+import threading
+from collections import deque
+from typing import Optional
+
+from .cache import QueryCache
+from .database import Database, STORAGE_PROFILES
+
+
+class DatabasePool:
+    """Thread-safe pool of warm Database connections.
+    
+    Connections are created on demand and kept open when released, so a
+    request only pays for connecting and schema setup the first time a
+    pooled connection is created. At most ``size`` idle connections are
+    kept; extra connections handed out under load are closed on release.
+    """
+    
+    def __init__(self, db_path: str, size: int = 5, storage_profile: str = "default",
+                 cache: Optional[QueryCache] = None):
+        """Initialize an empty pool for the given database file.
+        
+        Connections are opened with the named ``storage_profile`` and share
+        the query ``cache``, if any.
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        if storage_profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {storage_profile}")
+        self.db_path = db_path
+        self.size = size
+        self.storage_profile = storage_profile
+        self.cache = cache
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def _create(self) -> Database:
+        """Open a new connection that may be handed between threads."""
+        return Database(self.db_path, check_same_thread=False, storage_profile=self.storage_profile,
+                        cache=self.cache)
+    
+    def acquire(self) -> Database:
+        """Check out a connection, creating one if none is idle."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Database pool is closed")
+            if self._idle:
+                return self._idle.pop()
+        return self._create()
+    
+    def release(self, db: Database):
+        """Return a connection to the pool."""
+        if db.conn.in_transaction:
+            db.conn.rollback()
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(db)
+                return
+        db.close()
+    
+    def idle_count(self) -> int:
+        """Number of connections currently waiting in the pool."""
+        with self._lock:
+            return len(self._idle)
+    
+    def close(self):
+        """Close all idle connections and refuse further checkouts."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for db in idle:
+            db.close()
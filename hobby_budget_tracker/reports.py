@@ -0,0 +1,91 @@
+"""
+Process pool for report queries in Hobby Budget Tracker.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional
+
+from .database import Database
+
+
+# Seconds a request waits for a report before giving up
+DEFAULT_REPORT_TIMEOUT = 30.0
+
+# The worker process's read-only connection, opened by _init_worker
+_worker_db: Optional[Database] = None
+
+
+class ReportTimeoutError(Exception):
+    """Raised when a report does not finish within its timeout."""
+    pass
+
+
+def _init_worker(db_path: str, storage_profile: str):
+    """Open the worker's read-only connection."""
+    global _worker_db
+    _worker_db = Database(db_path, storage_profile=storage_profile, read_only=True)
+
+
+def _call(function: Callable, args: tuple, kwargs: dict):
+    """Run ``function`` in a worker with its connection as first argument."""
+    return function(_worker_db, *args, **kwargs)
+
+
+class ReportExecutor:
+    """Runs report queries in worker processes.
+    
+    Each worker keeps a read-only connection to the database, so reports
+    use all cores without holding the web process's GIL and can never
+    modify data. Reports are functions taking a Database as their first
+    argument (e.g. ``Database.get_expense_per_hour_time_series`` or
+    ``analytics.build_report``); they and their results must be picklable,
+    and the functions importable by name, as workers are spawned fresh.
+    """
+    
+    def __init__(self, db_path: str, workers: Optional[int] = None, storage_profile: str = "default"):
+        """Start a pool of ``workers`` processes (default: one per CPU)."""
+        if workers is not None and workers < 1:
+            raise ValueError("Report workers must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        # Workers start lazily, from whichever request thread submits the
+        # first report; forking a threaded server there could copy a lock
+        # held by another thread into the child, so they are spawned
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(db_path, storage_profile),
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Queue a report and return a Future for its result."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Report executor is closed")
+            return self._executor.submit(_call, function, args, kwargs)
+    
+    def run(self, function: Callable, *args, timeout: Optional[float] = DEFAULT_REPORT_TIMEOUT, **kwargs):
+        """Run a report and wait up to ``timeout`` seconds for its result.
+        
+        Raises ReportTimeoutError when the report takes longer; it is
+        cancelled if it has not started yet.
+        """
+        future = self.submit(function, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise ReportTimeoutError(f"Report did not finish within {timeout} seconds") from None
+    
+    def close(self):
+        """Stop the worker processes once the queued reports have finished."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,808 @@
+// Tab switching
+function showTab(tabName) {
+    document.querySelectorAll('.tab').forEach(tab => tab.classList.remove('active'));
+    document.querySelectorAll('.tab-content').forEach(content => content.classList.remove('active'));
+
+    event.target.classList.add('active');
+    document.getElementById(tabName + '-tab').classList.add('active');
+
+    // Load data when switching tabs
+    if (tabName === 'summary') loadSummary();
+    if (tabName === 'hobbies') loadHobbies();
+    if (tabName === 'expenses') {
+        loadHobbiesForSelect('expense-hobby');
+        loadExpenses();
+    }
+    if (tabName === 'activities') {
+        loadHobbiesForSelect('activity-hobby');
+        loadActivities();
+    }
+}
+
+// Show message
+function showMessage(elementId, message, type) {
+    const el = document.getElementById(elementId);
+    el.textContent = message;
+    el.className = `message ${type}`;
+    el.style.display = 'block';
+    setTimeout(() => {
+        el.style.display = 'none';
+    }, 5000);
+}
+
+// Bodies of earlier GET responses by URL, with their ETags. Requests
+// send the ETag back in If-None-Match and reuse the stored body when
+// the server answers 304 Not Modified.
+const responseCache = new Map();
+
+async function fetchCached(url) {
+    const cached = responseCache.get(url);
+    const response = await fetch(url, {
+        cache: 'no-store',
+        headers: cached ? { 'If-None-Match': cached.etag } : {}
+    });
+    if (response.status === 304 && cached) {
+        return new Response(cached.body, { status: 200, headers: { 'Content-Type': 'application/json' } });
+    }
+    const etag = response.headers.get('ETag');
+    if (!response.ok || !etag) {
+        return response;
+    }
+    const body = await response.text();
+    responseCache.set(url, { etag, body });
+    return new Response(body, { status: response.status, headers: response.headers });
+}
+
+// Hobbies, summary and recent entries in one response. Views loading
+// at the same time share a single request.
+let dashboardRequest = null;
+
+function loadDashboard() {
+    if (!dashboardRequest) {
+        dashboardRequest = fetchCached('/api/dashboard')
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`Dashboard request failed: ${response.status}`);
+                }
+                return response.json();
+            })
+            .finally(() => { dashboardRequest = null; });
+    }
+    return dashboardRequest;
+}
+
+// Load hobbies
+async function loadHobbies() {
+    const loadingEl = document.getElementById('hobbies-loading');
+    const listEl = document.getElementById('hobbies-list');
+
+    loadingEl.style.display = 'block';
+    try {
+        const { hobbies } = await loadDashboard();
+
+        listEl.innerHTML = '';
+        if (hobbies.length === 0) {
+            listEl.innerHTML = '<div class="empty-state"><div class="empty-state-icon">🎯</div><p>No hobbies yet. Add your first hobby above!</p></div>';
+        } else {
+            hobbies.forEach(hobby => {
+                const li = document.createElement('li');
+                li.className = 'hobby-item';
+
+                const itemInfo = document.createElement('div');
+                itemInfo.className = 'item-info';
+
+                const itemName = document.createElement('div');
+                itemName.className = 'item-name';
+                itemName.textContent = hobby.name;
+
+                const itemDesc = document.createElement('div');
+                itemDesc.className = 'item-desc';
+                const descText = hobby.description || 'No description';
+                const targetText = hobby.target_value ? ` | Target: €${hobby.target_value.toFixed(2)}/h` : '';
+                itemDesc.textContent = descText + targetText;
+
+                itemInfo.appendChild(itemName);
+                itemInfo.appendChild(itemDesc);
+
+                const itemActions = document.createElement('div');
+                itemActions.className = 'item-actions';
+
+                const viewBtn = document.createElement('button');
+                viewBtn.className = 'btn btn-primary';
+                viewBtn.textContent = 'View Stats';
+                viewBtn.onclick = () => showHobbyDetails(hobby.id);
+
+                const editBtn = document.createElement('button');
+                editBtn.className = 'btn';
+                editBtn.textContent = 'Edit';
+                editBtn.onclick = () => editHobby(hobby);
+
+                const deleteBtn = document.createElement('button');
+                deleteBtn.className = 'btn btn-danger';
+                deleteBtn.textContent = 'Delete';
+                deleteBtn.onclick = () => deleteHobby(hobby.id, hobby.name);
+
+                itemActions.appendChild(viewBtn);
+                itemActions.appendChild(editBtn);
+                itemActions.appendChild(deleteBtn);
+
+                li.appendChild(itemInfo);
+                li.appendChild(itemActions);
+                listEl.appendChild(li);
+            });
+        }
+    } catch (error) {
+        showMessage('hobby-message', 'Error loading hobbies', 'error');
+    } finally {
+        loadingEl.style.display = 'none';
+    }
+}
+
+// Load hobbies for select dropdown
+async function loadHobbiesForSelect(selectId) {
+    try {
+        const { hobbies } = await loadDashboard();
+
+        const select = document.getElementById(selectId);
+        select.innerHTML = '<option value="">Select a hobby</option>';
+        hobbies.forEach(hobby => {
+            const option = document.createElement('option');
+            option.value = hobby.id;
+            option.textContent = hobby.name;
+            select.appendChild(option);
+        });
+    } catch (error) {
+        console.error('Error loading hobbies:', error);
+    }
+}
+
+// Add hobby
+document.getElementById('hobby-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const name = document.getElementById('hobby-name').value;
+    const description = document.getElementById('hobby-description').value;
+    const targetValue = document.getElementById('hobby-target-value').value;
+
+    const payload = { name, description };
+    if (targetValue) {
+        payload.target_value = parseFloat(targetValue);
+    }
+
+    try {
+        const response = await fetch('/api/hobbies', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+
+        if (response.ok) {
+            showMessage('hobby-message', 'Hobby added successfully!', 'success');
+            document.getElementById('hobby-form').reset();
+            loadHobbies();
+        } else {
+            const error = await response.json();
+            showMessage('hobby-message', error.error || 'Error adding hobby', 'error');
+        }
+    } catch (error) {
+        showMessage('hobby-message', 'Error adding hobby', 'error');
+    }
+});
+
+// Delete hobby
+async function deleteHobby(id, name) {
+    if (!confirm(`Delete hobby "${name}" and all its expenses and activities?`)) return;
+
+    try {
+        const response = await fetch(`/api/hobbies/${id}`, { method: 'DELETE' });
+        if (response.ok) {
+            showMessage('hobby-message', 'Hobby deleted successfully!', 'success');
+            loadHobbies();
+        } else {
+            showMessage('hobby-message', 'Error deleting hobby', 'error');
+        }
+    } catch (error) {
+        showMessage('hobby-message', 'Error deleting hobby', 'error');
+    }
+}
+
+// Edit hobby
+function editHobby(hobby) {
+    document.getElementById('edit-hobby-id').value = hobby.id;
+    document.getElementById('edit-hobby-name').value = hobby.name;
+    document.getElementById('edit-hobby-description').value = hobby.description || '';
+    document.getElementById('edit-hobby-target-value').value = hobby.target_value || '';
+    document.getElementById('edit-hobby-modal').style.display = 'block';
+}
+
+function closeEditModal() {
+    document.getElementById('edit-hobby-modal').style.display = 'none';
+}
+
+// Submit edit hobby form
+document.getElementById('edit-hobby-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const id = document.getElementById('edit-hobby-id').value;
+    const name = document.getElementById('edit-hobby-name').value;
+    const description = document.getElementById('edit-hobby-description').value;
+    const targetValue = document.getElementById('edit-hobby-target-value').value;
+
+    const payload = { name, description };
+    if (targetValue) {
+        payload.target_value = parseFloat(targetValue);
+    }
+
+    try {
+        const response = await fetch(`/api/hobbies/${id}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+
+        if (response.ok) {
+            showMessage('hobby-message', 'Hobby updated successfully!', 'success');
+            closeEditModal();
+            loadHobbies();
+        } else {
+            const error = await response.json();
+            alert(error.error || 'Error updating hobby');
+        }
+    } catch (error) {
+        alert('Error updating hobby');
+    }
+});
+
+// Show hobby details with chart
+let hobbyChart = null;
+
+async function showHobbyDetails(hobbyId) {
+    try {
+        // Check if Chart.js is available
+        if (typeof Chart === 'undefined') {
+            alert('Chart library not loaded. Please check your internet connection or ad blocker settings.');
+            return;
+        }
+
+        // Fetch hobby stats and chart data
+        const [statsResponse, chartResponse] = await Promise.all([
+            fetchCached(`/api/hobbies/${hobbyId}/stats`),
+            fetchCached(`/api/hobbies/${hobbyId}/chart-data`)
+        ]);
+
+        if (!statsResponse.ok || !chartResponse.ok) {
+            alert('Error loading hobby details');
+            return;
+        }
+
+        const stats = await statsResponse.json();
+        const chartData = await chartResponse.json();
+
+        // Update modal title
+        document.getElementById('modal-hobby-name').textContent = stats.hobby.name;
+
+        // Update stats
+        const statsHtml = `
+            <div class="stat">
+                <span>Total Expenses:</span>
+                <span class="stat-value">€${stats.total_expenses.toFixed(2)}</span>
+            </div>
+            <div class="stat">
+                <span>Total Hours:</span>
+                <span class="stat-value">${stats.total_hours.toFixed(1)}h</span>
+            </div>
+            <div class="stat">
+                <span>💰 Cost per Hour:</span>
+                <span class="stat-value">${stats.expense_per_hour ? '€' + stats.expense_per_hour.toFixed(2) + '/h' : 'N/A'}</span>
+            </div>
+            ${stats.hobby.target_value ? `<div class="stat"><span>🎯 Target:</span><span class="stat-value">€${stats.hobby.target_value.toFixed(2)}/h</span></div>` : ''}
+        `;
+        document.getElementById('hobby-stats').innerHTML = statsHtml;
+
+        // Create chart
+        const ctx = document.getElementById('hobby-chart').getContext('2d');
+
+        // Destroy previous chart if exists
+        if (hobbyChart) {
+            hobbyChart.destroy();
+        }
+
+        // Prepare chart data
+        const labels = chartData.time_series.map(d => d.date);
+        const data = chartData.time_series.map(d => d.expense_per_hour);
+
+        const datasets = [
+            {
+                label: 'Expense per Hour (€/h)',
+                data: data,
+                borderColor: '#667eea',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                tension: 0.4,
+                fill: false
+            }
+        ];
+
+        // Add target value line if exists
+        if (chartData.target_value) {
+            datasets.push({
+                label: 'Target (€/h)',
+                data: new Array(labels.length).fill(chartData.target_value),
+                borderColor: '#28a745',
+                borderDash: [5, 5],
+                pointRadius: 0
+            });
+
+            // Add upper bound for green area (hidden from legend)
+            datasets.push({
+                label: 'Target Zone',
+                data: new Array(labels.length).fill(0),
+                borderColor: 'transparent',
+                backgroundColor: 'rgba(40, 167, 69, 0.2)',
+                fill: 1,
+                pointRadius: 0
+            });
+        }
+
+        hobbyChart = new Chart(ctx, {
+            type: 'line',
+            data: {
+                labels: labels,
+                datasets: datasets
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    title: {
+                        display: true,
+                        text: 'Expense per Hour Over Time'
+                    },
+                    legend: {
+                        display: true,
+                        position: 'top',
+                        labels: {
+                            filter: function(legendItem, chartData) {
+                                // Hide "Target Zone" from legend
+                                return legendItem.text !== 'Target Zone';
+                            }
+                        }
+                    },
+                    tooltip: {
+                        mode: 'index',
+                        intersect: false
+                    }
+                },
+                scales: {
+                    x: {
+                        title: {
+                            display: true,
+                            text: 'Date'
+                        },
+                        ticks: {
+                            maxRotation: 45,
+                            minRotation: 45
+                        }
+                    },
+                    y: {
+                        title: {
+                            display: true,
+                            text: 'Expense per Hour (€/h)'
+                        },
+                        beginAtZero: true
+                    }
+                }
+            }
+        });
+
+        // Show modal
+        document.getElementById('hobby-details-modal').style.display = 'block';
+
+    } catch (error) {
+        console.error('Error showing hobby details:', error);
+        alert('Error loading hobby details');
+    }
+}
+
+function closeHobbyModal() {
+    document.getElementById('hobby-details-modal').style.display = 'none';
+}
+
+// Close modals when clicking outside
+window.onclick = function(event) {
+    const detailsModal = document.getElementById('hobby-details-modal');
+    const editModal = document.getElementById('edit-hobby-modal');
+    if (event.target === detailsModal) {
+        closeHobbyModal();
+    }
+    if (event.target === editModal) {
+        closeEditModal();
+    }
+}
+
+// Entries beyond the dashboard's first page come from the paginated
+// list endpoints. Their items carry hobby ids only, so names are looked
+// up in the hobbies of the last dashboard response.
+const PAGE_SIZE = 100;
+const hobbyNames = new Map();
+const nextCursors = { expenses: null, activities: null };
+
+function rememberHobbyNames(hobbies) {
+    hobbyNames.clear();
+    hobbies.forEach(hobby => hobbyNames.set(hobby.id, hobby.name));
+}
+
+function setNextCursor(kind, cursor) {
+    nextCursors[kind] = cursor;
+    document.getElementById(`${kind}-more`).style.display = cursor ? 'inline-block' : 'none';
+}
+
+async function fetchNextPage(kind) {
+    const params = new URLSearchParams({ limit: PAGE_SIZE, cursor: nextCursors[kind] });
+    const response = await fetchCached(`/api/${kind}?${params}`);
+    if (!response.ok) {
+        throw new Error(`Loading ${kind} failed: ${response.status}`);
+    }
+    const page = await response.json();
+    setNextCursor(kind, page.next_cursor);
+    return page.items.map(item => ({ ...item, hobby_name: hobbyNames.get(item.hobby_id) || '' }));
+}
+
+function renderExpense(expense) {
+    const li = document.createElement('li');
+    li.className = 'expense-item';
+    const date = new Date(expense.date).toLocaleDateString();
+
+    const itemInfo = document.createElement('div');
+    itemInfo.className = 'item-info';
+
+    const itemName = document.createElement('div');
+    itemName.className = 'item-name';
+    itemName.textContent = `€${expense.amount.toFixed(2)} - ${expense.hobby_name}`;
+
+    const itemDesc = document.createElement('div');
+    itemDesc.className = 'item-desc';
+    itemDesc.textContent = `${expense.description || 'No description'} • ${date}`;
+
+    itemInfo.appendChild(itemName);
+    itemInfo.appendChild(itemDesc);
+    li.appendChild(itemInfo);
+    return li;
+}
+
+// Load expenses
+async function loadExpenses() {
+    const loadingEl = document.getElementById('expenses-loading');
+    const listEl = document.getElementById('expenses-list');
+
+    loadingEl.style.display = 'block';
+    try {
+        const { hobbies, expenses, expenses_next_cursor } = await loadDashboard();
+        rememberHobbyNames(hobbies);
+        setNextCursor('expenses', expenses_next_cursor);
+
+        listEl.innerHTML = '';
+        if (expenses.length === 0) {
+            listEl.innerHTML = '<div class="empty-state"><div class="empty-state-icon">💰</div><p>No expenses yet. Add your first expense above!</p></div>';
+        } else {
+            expenses.forEach(expense => listEl.appendChild(renderExpense(expense)));
+        }
+    } catch (error) {
+        showMessage('expense-message', 'Error loading expenses', 'error');
+    } finally {
+        loadingEl.style.display = 'none';
+    }
+}
+
+// Append the next page of expenses
+async function loadMoreExpenses() {
+    const listEl = document.getElementById('expenses-list');
+    try {
+        const expenses = await fetchNextPage('expenses');
+        expenses.forEach(expense => listEl.appendChild(renderExpense(expense)));
+    } catch (error) {
+        showMessage('expense-message', 'Error loading expenses', 'error');
+    }
+}
+
+// Add expense
+document.getElementById('expense-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const hobby_id = document.getElementById('expense-hobby').value;
+    const amount = document.getElementById('expense-amount').value;
+    const date = document.getElementById('expense-date').value;
+    const description = document.getElementById('expense-description').value;
+
+    try {
+        const response = await fetch('/api/expenses', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ 
+                hobby_id: parseInt(hobby_id), 
+                amount: parseFloat(amount), 
+                date: date,
+                description 
+            })
+        });
+
+        if (response.ok) {
+            showMessage('expense-message', 'Expense added successfully!', 'success');
+            document.getElementById('expense-form').reset();
+            loadExpenses();
+        } else {
+            const error = await response.json();
+            showMessage('expense-message', error.error || 'Error adding expense', 'error');
+        }
+    } catch (error) {
+        showMessage('expense-message', 'Error adding expense', 'error');
+    }
+});
+
+function renderActivity(activity) {
+    const li = document.createElement('li');
+    li.className = 'activity-item';
+    const date = new Date(activity.date).toLocaleDateString();
+
+    // Convert duration hours to hours and minutes format
+    const totalMinutes = Math.round(activity.duration_hours * 60);
+    const hours = Math.floor(totalMinutes / 60);
+    const minutes = totalMinutes % 60;
+    let durationStr = '';
+    if (hours > 0 && minutes > 0) {
+        durationStr = `${hours}h ${minutes}m`;
+    } else if (hours > 0) {
+        durationStr = `${hours}h`;
+    } else {
+        durationStr = `${minutes}m`;
+    }
+
+    const itemInfo = document.createElement('div');
+    itemInfo.className = 'item-info';
+
+    const itemName = document.createElement('div');
+    itemName.className = 'item-name';
+    itemName.textContent = `${durationStr} - ${activity.hobby_name}`;
+
+    const itemDesc = document.createElement('div');
+    itemDesc.className = 'item-desc';
+    itemDesc.textContent = `${activity.description || 'No description'} • ${date}`;
+
+    itemInfo.appendChild(itemName);
+    itemInfo.appendChild(itemDesc);
+    li.appendChild(itemInfo);
+    return li;
+}
+
+// Load activities
+async function loadActivities() {
+    const loadingEl = document.getElementById('activities-loading');
+    const listEl = document.getElementById('activities-list');
+
+    loadingEl.style.display = 'block';
+    try {
+        const { hobbies, activities, activities_next_cursor } = await loadDashboard();
+        rememberHobbyNames(hobbies);
+        setNextCursor('activities', activities_next_cursor);
+
+        listEl.innerHTML = '';
+        if (activities.length === 0) {
+            listEl.innerHTML = '<div class="empty-state"><div class="empty-state-icon">⏱️</div><p>No activities yet. Add your first activity above!</p></div>';
+        } else {
+            activities.forEach(activity => listEl.appendChild(renderActivity(activity)));
+        }
+    } catch (error) {
+        showMessage('activity-message', 'Error loading activities', 'error');
+    } finally {
+        loadingEl.style.display = 'none';
+    }
+}
+
+// Append the next page of activities
+async function loadMoreActivities() {
+    const listEl = document.getElementById('activities-list');
+    try {
+        const activities = await fetchNextPage('activities');
+        activities.forEach(activity => listEl.appendChild(renderActivity(activity)));
+    } catch (error) {
+        showMessage('activity-message', 'Error loading activities', 'error');
+    }
+}
+
+// Add activity
+document.getElementById('activity-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const hobby_id = document.getElementById('activity-hobby').value;
+    const date = document.getElementById('activity-date').value;
+    const hours = parseInt(document.getElementById('activity-duration-hours').value) || 0;
+    const minutes = parseInt(document.getElementById('activity-duration-minutes').value) || 0;
+    const duration_hours = hours + (minutes / 60.0);
+    const description = document.getElementById('activity-description').value;
+
+    // Validate that at least some duration is provided
+    if (duration_hours === 0) {
+        showMessage('activity-message', 'Please enter a duration (hours and/or minutes)', 'error');
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/activities', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ 
+                hobby_id: parseInt(hobby_id), 
+                duration_hours: duration_hours,
+                date: date,
+                description 
+            })
+        });
+
+        if (response.ok) {
+            showMessage('activity-message', 'Activity added successfully!', 'success');
+            document.getElementById('activity-form').reset();
+            loadActivities();
+        } else {
+            const error = await response.json();
+            showMessage('activity-message', error.error || 'Error adding activity', 'error');
+        }
+    } catch (error) {
+        showMessage('activity-message', 'Error adding activity', 'error');
+    }
+});
+
+// Load summary
+async function loadSummary() {
+    const loadingEl = document.getElementById('summary-loading');
+    const contentEl = document.getElementById('summary-content');
+
+    loadingEl.style.display = 'block';
+    try {
+        const { summary } = await loadDashboard();
+
+        contentEl.innerHTML = '';
+        if (summary.length === 0) {
+            contentEl.innerHTML = '<div class="empty-state"><div class="empty-state-icon">📊</div><p>No hobbies yet. Add your first hobby to get started!</p></div>';
+        } else {
+            summary.forEach(hobby => {
+                const card = document.createElement('div');
+                card.className = 'summary-card';
+                card.style.cursor = 'pointer';
+                card.onclick = () => showHobbyDetails(hobby.id);
+
+                const title = document.createElement('h4');
+                title.textContent = `🎯 ${hobby.name}`;
+                card.appendChild(title);
+
+                // Total Expenses stat
+                const expenseStat = document.createElement('div');
+                expenseStat.className = 'stat';
+                const expenseLabel = document.createElement('span');
+                expenseLabel.textContent = 'Total Expenses:';
+                const expenseValue = document.createElement('span');
+                expenseValue.className = 'stat-value';
+                expenseValue.textContent = `€${hobby.total_expenses.toFixed(2)}`;
+                expenseStat.appendChild(expenseLabel);
+                expenseStat.appendChild(expenseValue);
+                card.appendChild(expenseStat);
+
+                // Total Hours stat
+                const hoursStat = document.createElement('div');
+                hoursStat.className = 'stat';
+                const hoursLabel = document.createElement('span');
+                hoursLabel.textContent = 'Total Hours:';
+                const hoursValue = document.createElement('span');
+                hoursValue.className = 'stat-value';
+                hoursValue.textContent = `${hobby.total_hours.toFixed(1)}h`;
+                hoursStat.appendChild(hoursLabel);
+                hoursStat.appendChild(hoursValue);
+                card.appendChild(hoursStat);
+
+                // Cost per Hour stat
+                const costStat = document.createElement('div');
+                costStat.className = 'stat';
+                const costLabel = document.createElement('span');
+                costLabel.textContent = '💰 Cost per Hour:';
+                const costValue = document.createElement('span');
+                costValue.className = 'stat-value';
+                costValue.textContent = hobby.expense_per_hour ? `€${hobby.expense_per_hour.toFixed(2)}/h` : 'N/A';
+                costStat.appendChild(costLabel);
+                costStat.appendChild(costValue);
+                card.appendChild(costStat);
+
+                // Target value stat if exists
+                if (hobby.target_value) {
+                    const targetStat = document.createElement('div');
+                    targetStat.className = 'stat';
+                    const targetLabel = document.createElement('span');
+                    targetLabel.textContent = '🎯 Target:';
+                    const targetValue = document.createElement('span');
+                    targetValue.className = 'stat-value';
+                    targetValue.textContent = `€${hobby.target_value.toFixed(2)}/h`;
+                    targetStat.appendChild(targetLabel);
+                    targetStat.appendChild(targetValue);
+                    card.appendChild(targetStat);
+                }
+
+                // Add click hint
+                const clickHint = document.createElement('small');
+                clickHint.textContent = 'Click to view chart';
+                clickHint.style.color = '#6c757d';
+                clickHint.style.display = 'block';
+                clickHint.style.marginTop = '10px';
+                card.appendChild(clickHint);
+
+                contentEl.appendChild(card);
+            });
+        }
+    } catch (error) {
+        showMessage('summary-message', 'Error loading summary', 'error');
+    } finally {
+        loadingEl.style.display = 'none';
+    }
+}
+
+// Export data
+document.getElementById('export-btn').addEventListener('click', async () => {
+    try {
+        const response = await fetch('/api/export');
+        const data = await response.json();
+
+        // Create download link
+        const dataStr = JSON.stringify(data, null, 2);
+        const dataBlob = new Blob([dataStr], { type: 'application/json' });
+        const url = URL.createObjectURL(dataBlob);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = `hobby_budget_export_${new Date().toISOString().split('T')[0]}.json`;
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(url);
+
+        showMessage('import-export-message', 'Data exported successfully!', 'success');
+    } catch (error) {
+        showMessage('import-export-message', 'Error exporting data', 'error');
+    }
+});
+
+// Import data
+document.getElementById('import-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const fileInput = document.getElementById('import-file');
+    const file = fileInput.files[0];
+
+    if (!file) {
+        showMessage('import-export-message', 'Please select a file', 'error');
+        return;
+    }
+
+    try {
+        const fileContent = await file.text();
+        const importData = JSON.parse(fileContent);
+
+        const response = await fetch('/api/import', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(importData)
+        });
+
+        if (response.ok) {
+            const result = await response.json();
+            showMessage('import-export-message', 
+                `Data imported successfully! ${result.hobbies_imported} hobbies, ${result.expenses_imported} expenses, ${result.activities_imported} activities.`, 
+                'success');
+            document.getElementById('import-form').reset();
+            // Reload summary to show imported data
+            loadSummary();
+        } else {
+            const error = await response.json();
+            showMessage('import-export-message', error.error || 'Error importing data', 'error');
+        }
+    } catch (error) {
+        showMessage('import-export-message', 'Error reading or parsing file. Please ensure it is a valid JSON file.', 'error');
+    }
+});
+
+// Load initial data
+loadSummary();
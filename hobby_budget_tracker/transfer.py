@@ -0,0 +1,295 @@
+"""
+Streaming import and export of the JSON data format for Hobby Budget Tracker.
+"""
+import codecs
+import json
+from datetime import date, datetime
+from itertools import islice
+from typing import BinaryIO, Iterator, Optional
+
+from .database import Database, DEFAULT_CHUNK_SIZE, DEFAULT_FETCH_SIZE
+from .models import Hobby, Expense, Activity, finite_float, isoformat
+
+
+# Bytes read from the input per refill of the parse buffer
+READ_SIZE = 64 * 1024
+
+# Top-level members of an export whose array elements are streamed
+SECTIONS = ("hobbies", "expenses", "activities")
+
+_WHITESPACE = " \t\r\n"
+
+
+class InvalidImportError(ValueError):
+    """Raised when an import file is not a valid export document."""
+    pass
+
+
+class _JsonStreamReader:
+    """Incrementally parses JSON values from a file-like object.
+    
+    Only the text needed for the value currently being decoded is kept in
+    memory, so arrays of any length can be walked element by element.
+    """
+    
+    def __init__(self, fp, read_size: int = READ_SIZE):
+        self._fp = fp
+        self._read_size = read_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+    
+    def _fill(self) -> bool:
+        """Append the next block of input to the buffer; False at end of input."""
+        if self._eof:
+            return False
+        data = self._fp.read(self._read_size)
+        if not data:
+            self._eof = True
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data, final=self._eof)
+        # Drop the text that has already been parsed
+        self._buffer = self._buffer[self._pos:] + data
+        self._pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char: str):
+        """Consume ``char`` or raise InvalidImportError."""
+        if self.peek() != char:
+            raise InvalidImportError(f"Expected '{char}' in import file")
+        self._pos += 1
+    
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+                # A value ending exactly at the buffer end may continue in the
+                # next block (e.g. a number), so only accept it at end of input
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as error:
+                if self._eof:
+                    raise InvalidImportError(f"Malformed JSON: {error}") from error
+            self._fill()
+    
+    def array_items(self) -> Iterator:
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise InvalidImportError("Expected ',' or ']' in array")
+
+
+def iter_object_members(fp, stream_keys=SECTIONS, read_size: int = READ_SIZE):
+    """Yield ``(key, value)`` for each member of a top-level JSON object.
+    
+    Members named in ``stream_keys`` whose value is an array are yielded as
+    a lazy iterator over the elements; it must be consumed before advancing
+    to the next member (unconsumed elements are skipped).
+    """
+    reader = _JsonStreamReader(fp, read_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise InvalidImportError("Object keys must be strings")
+            reader.expect(":")
+            if key in stream_keys and reader.peek() == "[":
+                items = reader.array_items()
+                yield key, items
+                for _ in items:
+                    pass
+            else:
+                yield key, reader.value()
+            
+            separator = reader.peek()
+            if separator == "}":
+                reader.expect("}")
+                break
+            reader.expect(",")
+    if reader.peek():
+        raise InvalidImportError("Unexpected data after the export object")
+
+
+def _dumps(value) -> str:
+    """Encode a value exactly like Flask's jsonify does in production."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _json_array(items: Iterator, to_dict, batch_size: int) -> Iterator[str]:
+    """Yield the JSON encoding of an array, one fragment per batch of items."""
+    yield "["
+    separator = ""
+    while True:
+        batch = list(islice(items, batch_size))
+        if not batch:
+            break
+        yield separator + ",".join(_dumps(to_dict(item)) for item in batch)
+        separator = ","
+    yield "]"
+
+
+def iter_export(db: Database, hobby_id: Optional[int] = None, start: Optional[date] = None,
+                end: Optional[date] = None, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[str]:
+    """Yield an export document as JSON text fragments.
+    
+    The joined fragments are byte-identical to ``jsonify`` of the full
+    export, but only one batch of rows is held in memory at a time. The
+    export can be limited to one hobby and to entries dated between the
+    inclusive ``start`` and ``end`` days; all data is read in a single
+    read transaction so the document is a consistent snapshot, without
+    counting as a write that would clear the query cache.
+    """
+    with db._read_transaction():
+        # Members are emitted in sorted key order, as jsonify sorts keys
+        yield '{"activities":'
+        yield from _json_array(db.iter_activities(hobby_id, start, end, batch_size=batch_size),
+                               _activity_to_dict, batch_size)
+        yield ',"expenses":'
+        yield from _json_array(db.iter_expenses(hobby_id, start, end, batch_size=batch_size),
+                               _expense_to_dict, batch_size)
+        yield ',"export_date":' + _dumps(datetime.now().isoformat())
+        yield ',"hobbies":'
+        yield from _json_array(db.iter_hobbies(hobby_id, batch_size=batch_size), _hobby_to_dict, batch_size)
+        yield ',"version":"1.0"}\n'
+
+
+def _hobby_to_dict(hobby: Hobby) -> dict:
+    """Convert a Hobby to its export representation."""
+    return {
+        'id': hobby.id,
+        'name': hobby.name,
+        'description': hobby.description,
+        'created_at': isoformat(hobby, 'created_at')
+    }
+
+
+def _expense_to_dict(expense: Expense) -> dict:
+    """Convert an Expense to its export representation."""
+    return {
+        'id': expense.id,
+        'hobby_id': expense.hobby_id,
+        'amount': expense.amount,
+        'description': expense.description,
+        'date': isoformat(expense, 'date')
+    }
+
+
+def _activity_to_dict(activity: Activity) -> dict:
+    """Convert an Activity to its export representation."""
+    return {
+        'id': activity.id,
+        'hobby_id': activity.hobby_id,
+        'duration_hours': activity.duration_hours,
+        'description': activity.description,
+        'date': isoformat(activity, 'date')
+    }
+
+
+def import_stream(db: Database, fp: BinaryIO, batch_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Import an export document from ``fp`` without loading it whole.
+    
+    Hobbies are matched to existing ones by name and expense/activity
+    hobby IDs are remapped accordingly; entries for unknown hobbies are
+    skipped. Expenses and activities are inserted in batches of
+    ``batch_size`` as they are parsed. Exports list hobbies first; entries
+    that appear before the hobbies section are held back until the end.
+    Everything happens in one transaction. Returns the imported counts.
+    """
+    counts = {'hobbies_imported': 0, 'expenses_imported': 0, 'activities_imported': 0}
+    builders = {'expenses': _expense_from_data, 'activities': _activity_from_data}
+    inserters = {'expenses': db.add_expenses_many, 'activities': db.add_activities_many}
+    hobby_id_map = {}  # Maps old IDs to new IDs
+    
+    def insert(key, items):
+        entries = (builders[key](data, hobby_id_map) for data in items if data['hobby_id'] in hobby_id_map)
+        counts[f'{key}_imported'] += len(inserters[key](entries, chunk_size=batch_size))
+    
+    with db.transaction():
+        existing_ids = {hobby.name: hobby.id for hobby in db.list_hobbies()}
+        hobbies_seen = False
+        has_version = False
+        deferred = {'expenses': [], 'activities': []}
+        
+        for key, value in iter_object_members(fp):
+            if key == 'version':
+                has_version = True
+            elif key == 'hobbies':
+                hobbies_seen = True
+                for hobby_data in _section_items(key, value):
+                    name = hobby_data['name']
+                    if name not in existing_ids:
+                        hobby = Hobby(id=None, name=name, description=hobby_data.get('description', ''))
+                        if 'created_at' in hobby_data:
+                            hobby.created_at = datetime.fromisoformat(hobby_data['created_at'])
+                        existing_ids[name] = db.add_hobby(hobby)
+                        counts['hobbies_imported'] += 1
+                    hobby_id_map[hobby_data['id']] = existing_ids[name]
+            elif key in deferred:
+                if hobbies_seen:
+                    insert(key, _section_items(key, value))
+                else:
+                    deferred[key].extend(_section_items(key, value))
+        
+        if not has_version:
+            raise InvalidImportError("Missing export version")
+        
+        for key, items in deferred.items():
+            insert(key, items)
+    
+    return counts
+
+
+def _section_items(key: str, value) -> Iterator:
+    """Return the streamed elements of a section, rejecting non-array values."""
+    if not isinstance(value, Iterator):
+        raise InvalidImportError(f"'{key}' must be a list")
+    return value
+
+
+def _expense_from_data(data: dict, hobby_id_map: dict) -> Expense:
+    """Build an Expense from exported data, remapping its hobby ID."""
+    return Expense(
+        id=None,
+        hobby_id=hobby_id_map[data['hobby_id']],
+        amount=finite_float(data['amount']),
+        description=data.get('description', ''),
+        date=datetime.fromisoformat(data['date'])
+    )
+
+
+def _activity_from_data(data: dict, hobby_id_map: dict) -> Activity:
+    """Build an Activity from exported data, remapping its hobby ID."""
+    return Activity(
+        id=None,
+        hobby_id=hobby_id_map[data['hobby_id']],
+        duration_hours=finite_float(data['duration_hours']),
+        description=data.get('description', ''),
+        date=datetime.fromisoformat(data['date'])
+    )
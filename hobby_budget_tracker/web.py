@@ -1,77 +1,350 @@
 """
 Web interface for Hobby Budget Tracker using Flask.
 """
+import atexit
+import base64
+import functools
+import json
 import os
-from flask import Flask, render_template, request, jsonify, send_from_directory, g
-from pathlib import Path
-from datetime import datetime
+import threading
+from flask import Flask, Response, request, jsonify, make_response, send_from_directory, g
+from datetime import date, datetime
 
-from .database import Database, DuplicateHobbyError
-from .models import Hobby, Expense, Activity
+from .analytics import DEFAULT_MONTHS, build_report
+from .assets import AssetBundle
+from .batch import BatchError, run_batch
+from .cache import DEFAULT_CACHE_SIZE, QueryCache
+from .database import Database, DuplicateHobbyError, DEFAULT_CHUNK_SIZE, DEFAULT_DASHBOARD_SIZE
+from .models import Hobby, Expense, Activity, finite_float, isoformat
+from .pool import DatabasePool
+from .reports import DEFAULT_REPORT_TIMEOUT, ReportExecutor, ReportTimeoutError
+from .transfer import InvalidImportError, import_stream, iter_export
+from .writer import BatchWriter, DEFAULT_MAX_DELAY_MS
 
 
-def create_app(db_path: str = "hobby_budget.db"):
-    """Create and configure the Flask application."""
-    app = Flask(__name__)
+# Largest page a client may request from the paginated list endpoints
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_cursor(key) -> str:
+    """Encode a (date, id) page key as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(f"{key[0]}|{key[1]}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    """Decode a cursor produced by _encode_cursor; raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        date_str, entry_id = raw.rsplit("|", 1)
+        return date_str, int(entry_id)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _table_etag(versions: dict, tables) -> str:
+    """Build an ETag from the version stamps of the tables a response is read from."""
+    return "-".join(f"{versions[table][0]}.{versions[table][1]}" for table in tables)
+
+
+def _serialize_hobby(hobby: Hobby) -> dict:
+    """Convert Hobby to JSON-serializable dict."""
+    return {
+        'id': hobby.id,
+        'name': hobby.name,
+        'description': hobby.description,
+        'created_at': isoformat(hobby, 'created_at'),
+        'target_value': hobby.target_value
+    }
+
+
+def _serialize_expense(expense: Expense) -> dict:
+    """Convert Expense to JSON-serializable dict."""
+    return {
+        'id': expense.id,
+        'hobby_id': expense.hobby_id,
+        'amount': expense.amount,
+        'description': expense.description,
+        'date': isoformat(expense, 'date')
+    }
+
+
+def _serialize_activity(activity: Activity) -> dict:
+    """Convert Activity to JSON-serializable dict."""
+    return {
+        'id': activity.id,
+        'hobby_id': activity.hobby_id,
+        'duration_hours': activity.duration_hours,
+        'description': activity.description,
+        'date': isoformat(activity, 'date')
+    }
+
+
+def _serialize_dashboard(dashboard: dict) -> dict:
+    """Convert the result of Database.get_dashboard to a JSON-serializable dict."""
+    return {
+        'hobbies': [_serialize_hobby(h) for h in dashboard['hobbies']],
+        'summary': dashboard['summary'],
+        'expenses': [dict(_serialize_expense(e), hobby_name=name) for e, name in dashboard['expenses']],
+        'activities': [dict(_serialize_activity(a), hobby_name=name) for a, name in dashboard['activities']],
+        'expenses_next_cursor': _encode_cursor(dashboard['expenses_next']) if dashboard['expenses_next'] else None,
+        'activities_next_cursor': (_encode_cursor(dashboard['activities_next'])
+                                   if dashboard['activities_next'] else None),
+    }
+
+
+def _batch_error(error: BatchError) -> dict:
+    """Build the error body for a rejected batch."""
+    body = {'error': error.message}
+    if error.index >= 0:
+        body['index'] = error.index
+    return body
+
+
+def create_app(db_path: str = "hobby_budget.db", pool_size: int = 5, storage_profile: str = "default",
+               write_batch_size: int = 0, report_workers: int = 0, cache_size: int = DEFAULT_CACHE_SIZE,
+               sql_json: bool = False):
+    """Create and configure the Flask application.
+    
+    Requests check out warm connections from a pool holding up to
+    ``pool_size`` idle connections (``DB_POOL_SIZE`` in the app config).
+    A size of 0 opens a fresh connection for every request instead.
+    Connections use the named ``storage_profile`` (``DB_STORAGE_PROFILE``),
+    e.g. "wal" when several workers write to the database.
+    
+    With a ``write_batch_size`` (``WRITE_BATCH_SIZE``) above 0, new
+    expenses and activities are handed to a BatchWriter that commits up to
+    that many entries together, waiting at most ``WRITE_BATCH_DELAY_MS``
+    for a batch to fill. Queued entries are written at interpreter exit.
+    
+    GET endpoints listing hobbies, expenses and activities, the summary
+    and per-hobby stats and charts carry an ETag derived from the version
+    stamps of the tables they read; a matching If-None-Match gets 304
+    without running the query.
+    
+    With ``report_workers`` (``REPORT_WORKERS``) above 0, chart data and
+    analytics are computed by that many worker processes on read-only
+    connections; a report taking longer than ``REPORT_TIMEOUT`` seconds
+    is answered with 504.
+    
+    Pooled connections share a QueryCache of up to ``cache_size``
+    (``CACHE_SIZE``) summary, stats and chart results, which stays correct
+    when other processes write; 0 disables it. ``/api/cache`` reports its
+    hit and miss counters.
+    
+    With ``sql_json`` (``SQL_JSON``) the expense and activity lists are
+    encoded to JSON by SQLite instead of through model objects. The fields
+    and values are the same, but numbers may be printed with more digits
+    and non-ASCII text is not escaped.
     
-    # Configure paths
-    template_folder = Path(__file__).parent / "templates"
-    static_folder = Path(__file__).parent / "static"
+    The page and the files under ``static/`` are gzipped once at startup
+    and linked by content-hashed URLs that browsers may cache forever.
+    """
+    app = Flask(__name__, static_folder=None)
     
-    app.template_folder = str(template_folder)
-    app.static_folder = str(static_folder)
+    # The page and its assets are read, hashed and compressed once
+    assets = AssetBundle()
+    app.extensions['assets'] = assets
     app.config['DB_PATH'] = db_path
+    app.config['DB_POOL_SIZE'] = pool_size
+    app.config['DB_STORAGE_PROFILE'] = storage_profile
+    app.config['IMPORT_BATCH_SIZE'] = DEFAULT_CHUNK_SIZE
+    app.config['WRITE_BATCH_SIZE'] = write_batch_size
+    app.config['WRITE_BATCH_DELAY_MS'] = DEFAULT_MAX_DELAY_MS
+    app.config['REPORT_WORKERS'] = report_workers
+    app.config['REPORT_TIMEOUT'] = DEFAULT_REPORT_TIMEOUT
+    app.config['CACHE_SIZE'] = cache_size
+    app.config['SQL_JSON'] = sql_json
+    
+    pool_lock = threading.Lock()
+    writer_lock = threading.Lock()
+    report_lock = threading.Lock()
+    
+    def get_pool():
+        """Get the connection pool, creating it on first use."""
+        pool = app.extensions.get('db_pool')
+        if pool is None and app.config['DB_POOL_SIZE'] > 0:
+            with pool_lock:
+                pool = app.extensions.get('db_pool')
+                if pool is None:
+                    cache = QueryCache(app.config['CACHE_SIZE']) if app.config['CACHE_SIZE'] > 0 else None
+                    pool = DatabasePool(app.config['DB_PATH'], app.config['DB_POOL_SIZE'],
+                                        app.config['DB_STORAGE_PROFILE'], cache)
+                    app.extensions['query_cache'] = cache
+                    app.extensions['db_pool'] = pool
+        return pool
+    
+    def checkout_db() -> Database:
+        """Take a connection from the pool, or open one if pooling is off."""
+        pool = get_pool()
+        if pool is not None:
+            return pool.acquire()
+        return Database(app.config['DB_PATH'], check_same_thread=False,
+                        storage_profile=app.config['DB_STORAGE_PROFILE'])
+    
+    def return_db(db: Database):
+        """Hand a connection back to the pool, or close it."""
+        pool = app.extensions.get('db_pool')
+        if pool is not None:
+            pool.release(db)
+        else:
+            db.close()
     
     def get_db():
         """Get database connection for current request."""
         if 'db' not in g:
-            g.db = Database(app.config['DB_PATH'])
+            g.db = checkout_db()
         return g.db
     
-    def _serialize_hobby(hobby: Hobby) -> dict:
-        """Convert Hobby to JSON-serializable dict."""
-        return {
-            'id': hobby.id,
-            'name': hobby.name,
-            'description': hobby.description,
-            'created_at': hobby.created_at.isoformat(),
-            'target_value': hobby.target_value
-        }
-    
-    def _serialize_expense(expense: Expense) -> dict:
-        """Convert Expense to JSON-serializable dict."""
-        return {
-            'id': expense.id,
-            'hobby_id': expense.hobby_id,
-            'amount': expense.amount,
-            'description': expense.description,
-            'date': expense.date.isoformat()
-        }
-    
-    def _serialize_activity(activity: Activity) -> dict:
-        """Convert Activity to JSON-serializable dict."""
-        return {
-            'id': activity.id,
-            'hobby_id': activity.hobby_id,
-            'duration_hours': activity.duration_hours,
-            'description': activity.description,
-            'date': activity.date.isoformat()
-        }
+    def get_writer():
+        """Get the batch writer, starting it on first use; None when disabled."""
+        writer = app.extensions.get('batch_writer')
+        if writer is None and app.config['WRITE_BATCH_SIZE'] > 0:
+            with writer_lock:
+                writer = app.extensions.get('batch_writer')
+                if writer is None:
+                    writer = BatchWriter(app.config['DB_PATH'], app.config['WRITE_BATCH_SIZE'],
+                                         app.config['WRITE_BATCH_DELAY_MS'],
+                                         app.config['DB_STORAGE_PROFILE'])
+                    atexit.register(writer.close)
+                    app.extensions['batch_writer'] = writer
+        return writer
+    
+    def add_entry(entry) -> int:
+        """Insert an expense or activity, through the batch writer when enabled."""
+        writer = get_writer()
+        if writer is not None:
+            return writer.submit(entry).result()
+        if isinstance(entry, Expense):
+            return get_db().add_expense(entry)
+        return get_db().add_activity(entry)
+    
+    def get_report_executor():
+        """Get the report process pool, starting it on first use; None when disabled."""
+        executor = app.extensions.get('report_executor')
+        if executor is None and app.config['REPORT_WORKERS'] > 0:
+            with report_lock:
+                executor = app.extensions.get('report_executor')
+                if executor is None:
+                    executor = ReportExecutor(app.config['DB_PATH'], app.config['REPORT_WORKERS'],
+                                              app.config['DB_STORAGE_PROFILE'])
+                    atexit.register(executor.close)
+                    app.extensions['report_executor'] = executor
+        return executor
+    
+    def run_report(function, *args, **kwargs):
+        """Run a report function taking a Database, in a worker process when enabled."""
+        executor = get_report_executor()
+        if executor is None:
+            return function(get_db(), *args, **kwargs)
+        return executor.run(function, *args, timeout=app.config['REPORT_TIMEOUT'], **kwargs)
+    
+    def conditional(*tables):
+        """Tag a GET view's response with the version of the ``tables`` it reads.
+        
+        When the request's If-None-Match holds the current tag, the view is
+        not run and an empty 304 Not Modified is returned instead.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                etag = _table_etag(get_db().get_table_versions(), tables)
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                response.set_etag(etag)
+                # Let browsers keep the body but revalidate it on every use
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            
+            return wrapper
+        
+        return decorator
+    
+    def _parse_date_range():
+        """Parse the optional ``from``/``to`` query parameters as dates."""
+        start = request.args.get('from')
+        end = request.args.get('to')
+        return (date.fromisoformat(start) if start else None,
+                date.fromisoformat(end) if end else None)
+    
+    def _list_response(list_entries, serialize, list_json):
+        """Respond with expenses or activities, paginated when ``limit`` is given.
+        
+        Paginated responses are ``{"items": [...], "next_cursor": ...}``;
+        passing ``next_cursor`` back as ``cursor`` fetches the following page,
+        and it is null on the last page. ``from``/``to`` limit the entries to
+        an inclusive date range. With ``SQL_JSON`` the body is built from the
+        JSON text returned by ``list_json``.
+        """
+        hobby_id = request.args.get('hobby_id', type=int)
+        try:
+            start, end = _parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date, expected YYYY-MM-DD'}), 400
+        if 'limit' not in request.args:
+            if app.config['SQL_JSON']:
+                items, _ = list_json(hobby_id, start=start, end=end)
+                return Response(items + "\n", mimetype='application/json')
+            return jsonify([serialize(entry) for entry in list_entries(hobby_id, start=start, end=end)])
+        
+        limit = request.args.get('limit', type=int)
+        if limit is None or not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        cursor = request.args.get('cursor')
+        try:
+            before = _decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        if app.config['SQL_JSON']:
+            items, next_key = list_json(hobby_id, limit=limit, before=before, start=start, end=end)
+            next_cursor = _encode_cursor(next_key) if next_key else None
+            body = f'{{"items":{items},"next_cursor":{json.dumps(next_cursor)}}}\n'
+            return Response(body, mimetype='application/json')
+        
+        # Fetch one extra row to learn whether another page follows
+        entries = list_entries(hobby_id, limit=limit + 1, before=before, start=start, end=end)
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = _encode_cursor(Database.page_key(entries[-1]))
+        return jsonify({
+            'items': [serialize(entry) for entry in entries],
+            'next_cursor': next_cursor
+        })
     
     @app.teardown_appcontext
     def close_db(error):
-        """Close database connection at end of request."""
+        """Return or close the database connection at end of request."""
         db = g.pop('db', None)
         if db is not None:
-            db.close()
+            return_db(db)
+    
+    def asset_response(asset, immutable: bool):
+        """Serve an asset, gzipped when the client accepts it."""
+        status, headers, body = asset.respond(immutable, request.headers.get('Accept-Encoding', ''),
+                                              request.if_none_match.contains(asset.etag))
+        return Response(body, status, headers)
     
     @app.route('/')
     def index():
-        """Render the main page."""
-        return render_template('index.html')
+        """Serve the main page."""
+        return asset_response(assets.index, False)
+    
+    @app.route('/static/<path:filename>')
+    def static_file(filename):
+        """Serve a static asset; content-hashed URLs may be cached forever."""
+        asset, immutable = assets.find(request.path)
+        if asset is None:
+            return jsonify({'error': 'Not found'}), 404
+        return asset_response(asset, immutable)
     
     # API Routes for Hobbies
     @app.route('/api/hobbies', methods=['GET'])
+    @conditional('hobbies')
     def get_hobbies():
         """Get all hobbies."""
         db = get_db()
@@ -146,16 +419,19 @@ def create_app(db_path: str = "hobby_budget.db"):
             return jsonify({'error': str(e)}), 400
     
     @app.route('/api/hobbies/<int:hobby_id>/stats', methods=['GET'])
+    @conditional('hobbies', 'expenses', 'activities')
     def get_hobby_stats(hobby_id):
-        """Get statistics for a hobby."""
+        """Get statistics for a hobby, optionally for a ``from``/``to`` date range."""
         db = get_db()
         hobby = db.get_hobby(hobby_id)
         if not hobby:
             return jsonify({'error': 'Hobby not found'}), 404
+        try:
+            start, end = _parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date, expected YYYY-MM-DD'}), 400
         
-        total_expenses = db.get_total_expenses(hobby_id)
-        total_hours = db.get_total_hours(hobby_id)
-        expense_per_hour = db.get_expense_per_hour(hobby_id)
+        totals = db.get_hobby_totals(hobby_id, start, end)
         
         return jsonify({
             'hobby': {
@@ -164,12 +440,13 @@ def create_app(db_path: str = "hobby_budget.db"):
                 'description': hobby.description,
                 'target_value': hobby.target_value
             },
-            'total_expenses': total_expenses,
-            'total_hours': total_hours,
-            'expense_per_hour': expense_per_hour
+            'total_expenses': totals['total_expenses'],
+            'total_hours': totals['total_hours'],
+            'expense_per_hour': totals['expense_per_hour']
         })
     
     @app.route('/api/hobbies/<int:hobby_id>/chart-data', methods=['GET'])
+    @conditional('hobbies', 'expenses', 'activities')
     def get_hobby_chart_data(hobby_id):
         """Get time series data for hobby chart."""
         db = get_db()
@@ -177,7 +454,10 @@ def create_app(db_path: str = "hobby_budget.db"):
         if not hobby:
             return jsonify({'error': 'Hobby not found'}), 404
         
-        time_series = db.get_expense_per_hour_time_series(hobby_id)
+        try:
+            time_series = run_report(Database.get_expense_per_hour_time_series, hobby_id)
+        except ReportTimeoutError:
+            return jsonify({'error': 'Report timed out'}), 504
         
         return jsonify({
             'time_series': time_series,
@@ -186,17 +466,15 @@ def create_app(db_path: str = "hobby_budget.db"):
     
     # API Routes for Expenses
     @app.route('/api/expenses', methods=['GET'])
+    @conditional('expenses')
     def get_expenses():
-        """Get all expenses, optionally filtered by hobby."""
+        """Get expenses, optionally filtered by hobby and paginated."""
         db = get_db()
-        hobby_id = request.args.get('hobby_id', type=int)
-        expenses = db.list_expenses(hobby_id)
-        return jsonify([_serialize_expense(e) for e in expenses])
+        return _list_response(db.list_expenses, _serialize_expense, db.list_expenses_json)
     
     @app.route('/api/expenses', methods=['POST'])
     def add_expense():
         """Add a new expense."""
-        db = get_db()
         data = request.get_json()
         try:
             # Parse date if provided, otherwise use current datetime
@@ -207,11 +485,11 @@ def create_app(db_path: str = "hobby_budget.db"):
             expense = Expense(
                 id=None,
                 hobby_id=data['hobby_id'],
-                amount=float(data['amount']),
+                amount=finite_float(data['amount']),
                 description=data.get('description', ''),
                 date=expense_date
             )
-            expense_id = db.add_expense(expense)
+            expense_id = add_entry(expense)
             return jsonify({'id': expense_id, 'message': 'Expense added successfully'}), 201
         except KeyError as e:
             return jsonify({'error': f'Missing required field: {str(e)}'}), 400
@@ -220,17 +498,15 @@ def create_app(db_path: str = "hobby_budget.db"):
     
     # API Routes for Activities
     @app.route('/api/activities', methods=['GET'])
+    @conditional('activities')
     def get_activities():
-        """Get all activities, optionally filtered by hobby."""
+        """Get activities, optionally filtered by hobby and paginated."""
         db = get_db()
-        hobby_id = request.args.get('hobby_id', type=int)
-        activities = db.list_activities(hobby_id)
-        return jsonify([_serialize_activity(a) for a in activities])
+        return _list_response(db.list_activities, _serialize_activity, db.list_activities_json)
     
     @app.route('/api/activities', methods=['POST'])
     def add_activity():
         """Add a new activity."""
-        db = get_db()
         data = request.get_json()
         try:
             # Parse date if provided, otherwise use current datetime
@@ -241,145 +517,137 @@ def create_app(db_path: str = "hobby_budget.db"):
             activity = Activity(
                 id=None,
                 hobby_id=data['hobby_id'],
-                duration_hours=float(data['duration_hours']),
+                duration_hours=finite_float(data['duration_hours']),
                 description=data.get('description', ''),
                 date=activity_date
             )
-            activity_id = db.add_activity(activity)
+            activity_id = add_entry(activity)
             return jsonify({'id': activity_id, 'message': 'Activity added successfully'}), 201
         except KeyError as e:
             return jsonify({'error': f'Missing required field: {str(e)}'}), 400
         except ValueError:
             return jsonify({'error': 'Invalid duration value'}), 400
     
+    # Batch endpoint
+    @app.route('/api/batch', methods=['POST'])
+    def batch():
+        """Apply several create, update and delete operations in one transaction.
+        
+        The body is ``{"operations": [...]}`` (see ``run_batch``). Either
+        every operation is applied and their results are returned, or none
+        is and the error names the index of the operation that failed.
+        """
+        data = request.get_json(silent=True)
+        operations = data.get('operations') if isinstance(data, dict) else None
+        try:
+            results = run_batch(get_db(), operations)
+        except BatchError as e:
+            return jsonify(_batch_error(e)), e.status
+        return jsonify({'results': results})
+    
     # Summary endpoint
     @app.route('/api/summary', methods=['GET'])
+    @conditional('hobbies', 'expenses', 'activities')
     def get_summary():
         """Get summary of all hobbies."""
         db = get_db()
-        hobbies = db.list_hobbies()
-        summary = []
-        for hobby in hobbies:
-            total_expenses = db.get_total_expenses(hobby.id)
-            total_hours = db.get_total_hours(hobby.id)
-            expense_per_hour = db.get_expense_per_hour(hobby.id)
-            summary.append({
-                'id': hobby.id,
-                'name': hobby.name,
-                'description': hobby.description,
-                'total_expenses': total_expenses,
-                'total_hours': total_hours,
-                'expense_per_hour': expense_per_hour,
-                'target_value': hobby.target_value
-            })
-        return jsonify(summary)
+        return jsonify(db.get_summary())
+    
+    # Dashboard endpoint
+    @app.route('/api/dashboard', methods=['GET'])
+    @conditional('hobbies', 'expenses', 'activities')
+    def get_dashboard():
+        """Get hobbies, the summary and the newest expenses and activities in one response.
+        
+        The optional ``limit`` sets how many expenses and activities are
+        included; each carries its hobby's name as ``hobby_name``.
+        """
+        limit = request.args.get('limit', DEFAULT_DASHBOARD_SIZE, type=int)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({'error': f'limit must be between 1 and {MAX_PAGE_SIZE}'}), 400
+        return jsonify(_serialize_dashboard(get_db().get_dashboard(limit)))
+    
+    # Analytics endpoint
+    @app.route('/api/analytics', methods=['GET'])
+    def get_analytics():
+        """Get rolling, month-over-month and weekday KPIs for all hobbies.
+        
+        Optional query parameters: ``as_of`` (ISO date, default today),
+        ``months`` (months to list) and ``hobby_id``.
+        """
+        try:
+            as_of = request.args.get('as_of')
+            as_of = date.fromisoformat(as_of) if as_of else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date, expected YYYY-MM-DD'}), 400
+        months = request.args.get('months', DEFAULT_MONTHS, type=int)
+        if not 1 <= months <= 120:
+            return jsonify({'error': 'months must be between 1 and 120'}), 400
+        hobby_id = request.args.get('hobby_id', type=int)
+        
+        db = get_db()
+        if hobby_id is not None and not db.get_hobby(hobby_id):
+            return jsonify({'error': 'Hobby not found'}), 404
+        try:
+            report = run_report(build_report, as_of=as_of, months=months, hobby_id=hobby_id)
+        except ReportTimeoutError:
+            return jsonify({'error': 'Report timed out'}), 504
+        return jsonify(report)
+    
+    # Cache statistics endpoint
+    @app.route('/api/cache', methods=['GET'])
+    def get_cache_stats():
+        """Get the hit and miss counters of the query cache."""
+        get_pool()
+        cache = app.extensions.get('query_cache')
+        if cache is None:
+            return jsonify({'enabled': False})
+        return jsonify({'enabled': True, **cache.stats()})
     
     # Export endpoint
     @app.route('/api/export', methods=['GET'])
     def export_data():
-        """Export all data as JSON."""
-        db = get_db()
-        hobbies = db.list_hobbies()
-        expenses = db.list_expenses()
-        activities = db.list_activities()
+        """Export data as JSON, streamed in batches.
+        
+        Optional ``hobby_id``, ``from`` and ``to`` (inclusive ISO dates)
+        query parameters limit the export to part of the data.
+        """
+        try:
+            start, end = _parse_date_range()
+        except ValueError:
+            return jsonify({'error': 'Invalid date, expected YYYY-MM-DD'}), 400
+        hobby_id = request.args.get('hobby_id', type=int)
         
-        export_data = {
-            'version': '1.0',
-            'export_date': datetime.now().isoformat(),
-            'hobbies': [{
-                'id': h.id,
-                'name': h.name,
-                'description': h.description,
-                'created_at': h.created_at.isoformat()
-            } for h in hobbies],
-            'expenses': [{
-                'id': e.id,
-                'hobby_id': e.hobby_id,
-                'amount': e.amount,
-                'description': e.description,
-                'date': e.date.isoformat()
-            } for e in expenses],
-            'activities': [{
-                'id': a.id,
-                'hobby_id': a.hobby_id,
-                'duration_hours': a.duration_hours,
-                'description': a.description,
-                'date': a.date.isoformat()
-            } for a in activities]
-        }
+        # The body is produced after the request context is torn down, so the
+        # stream holds its own connection until the last fragment is sent. It
+        # is taken when the body is first iterated: a client that disconnects
+        # before then never gets one, and closing the body returns it.
+        def generate():
+            db = checkout_db()
+            try:
+                yield from iter_export(db, hobby_id, start, end)
+            finally:
+                return_db(db)
         
-        return jsonify(export_data)
+        return Response(generate(), mimetype='application/json')
     
     # Import endpoint
     @app.route('/api/import', methods=['POST'])
     def import_data():
-        """Import data from JSON."""
-        db = get_db()
-        data = request.get_json()
-        
-        if not data or 'version' not in data:
-            return jsonify({'error': 'Invalid import file format'}), 400
+        """Import data from JSON.
         
+        The request body is parsed incrementally and inserted in batches, so
+        memory use does not grow with the size of the export.
+        """
+        db = get_db()
         try:
-            # Import hobbies first (with name mapping for existing hobbies)
-            hobby_id_map = {}  # Maps old IDs to new IDs
-            hobbies_imported = 0
-            if 'hobbies' in data:
-                for hobby_data in data['hobbies']:
-                    # Check if hobby with this name already exists
-                    existing_hobby = db.get_hobby_by_name(hobby_data['name'])
-                    if existing_hobby:
-                        hobby_id_map[hobby_data['id']] = existing_hobby.id
-                    else:
-                        # Create new hobby
-                        hobby = Hobby(
-                            id=None,
-                            name=hobby_data['name'],
-                            description=hobby_data.get('description', ''),
-                            created_at=datetime.fromisoformat(hobby_data['created_at']) if 'created_at' in hobby_data else None
-                        )
-                        new_id = db.add_hobby(hobby)
-                        hobby_id_map[hobby_data['id']] = new_id
-                        hobbies_imported += 1
-            
-            # Import expenses
-            expenses_imported = 0
-            if 'expenses' in data:
-                for expense_data in data['expenses']:
-                    if expense_data['hobby_id'] in hobby_id_map:
-                        expense = Expense(
-                            id=None,
-                            hobby_id=hobby_id_map[expense_data['hobby_id']],
-                            amount=expense_data['amount'],
-                            description=expense_data.get('description', ''),
-                            date=datetime.fromisoformat(expense_data['date'])
-                        )
-                        db.add_expense(expense)
-                        expenses_imported += 1
-            
-            # Import activities
-            activities_imported = 0
-            if 'activities' in data:
-                for activity_data in data['activities']:
-                    if activity_data['hobby_id'] in hobby_id_map:
-                        activity = Activity(
-                            id=None,
-                            hobby_id=hobby_id_map[activity_data['hobby_id']],
-                            duration_hours=activity_data['duration_hours'],
-                            description=activity_data.get('description', ''),
-                            date=datetime.fromisoformat(activity_data['date'])
-                        )
-                        db.add_activity(activity)
-                        activities_imported += 1
-            
-            return jsonify({
-                'message': 'Data imported successfully',
-                'hobbies_imported': hobbies_imported,
-                'expenses_imported': expenses_imported,
-                'activities_imported': activities_imported
-            }), 200
+            counts = import_stream(db, request.stream, batch_size=app.config['IMPORT_BATCH_SIZE'])
+        except InvalidImportError:
+            return jsonify({'error': 'Invalid import file format'}), 400
         except Exception as e:
             return jsonify({'error': f'Import failed: {str(e)}'}), 400
+        
+        return jsonify({'message': 'Data imported successfully', **counts}), 200
     
     return app
 
@@ -0,0 +1,122 @@
+"""
+Group-commit writer for Hobby Budget Tracker.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Tuple, Union
+
+from .database import Database
+from .models import Expense, Activity
+
+
+# Entries written per transaction at most
+DEFAULT_MAX_BATCH = 100
+
+# Longest time an entry waits for more entries to share its commit. With 0
+# a batch is whatever queued up while the previous batch was committing,
+# which already groups concurrent writers without delaying a lone one.
+DEFAULT_MAX_DELAY_MS = 0
+
+# Queued after the last entry to stop the writer thread
+_STOP = object()
+
+
+class BatchWriter:
+    """Background thread that inserts expenses and activities in batches.
+    
+    Entries submitted from any thread are queued and written by a single
+    connection, many per transaction: a batch is committed once it holds
+    ``max_batch`` entries or its oldest entry has waited ``max_delay_ms``.
+    Each ``submit`` returns a Future that resolves to the new row id after
+    the batch has been committed, so callers pay for one commit per batch
+    instead of one per row.
+    """
+    
+    def __init__(self, db_path: str, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay_ms: float = DEFAULT_MAX_DELAY_MS, storage_profile: str = "default"):
+        """Open the writer's connection and start its thread."""
+        if max_batch < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        # Only the writer thread uses the connection once it has started
+        self.db = Database(db_path, check_same_thread=False, storage_profile=storage_profile)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="BatchWriter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, entry: Union[Expense, Activity]) -> Future:
+        """Queue an expense or activity and return a Future for its row id."""
+        if not isinstance(entry, (Expense, Activity)):
+            raise TypeError(f"Cannot write {type(entry).__name__} entries")
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Batch writer is closed")
+            self._queue.put((entry, future))
+        return future
+    
+    def close(self):
+        """Write everything still queued, then stop the thread and close the connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        self.db.close()
+    
+    def _run(self):
+        """Collect queued entries into batches and write them until stopped."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+    
+    def _write(self, batch: List[Tuple[Union[Expense, Activity], Future]]):
+        """Insert a batch in one transaction and resolve its futures.
+        
+        If the transaction fails, the entries are retried one at a time so
+        a single bad entry only fails its own future.
+        """
+        expenses = [(entry, future) for entry, future in batch if isinstance(entry, Expense)]
+        activities = [(entry, future) for entry, future in batch if isinstance(entry, Activity)]
+        try:
+            with self.db.transaction():
+                expense_ids = self.db.add_expenses_many(entry for entry, _ in expenses)
+                activity_ids = self.db.add_activities_many(entry for entry, _ in activities)
+        except Exception:
+            for entry, future in batch:
+                self._write_one(entry, future)
+            return
+        for (_, future), row_id in zip(expenses + activities, expense_ids + activity_ids):
+            future.set_result(row_id)
+    
+    def _write_one(self, entry: Union[Expense, Activity], future: Future):
+        """Insert a single entry in its own transaction."""
+        try:
+            if isinstance(entry, Expense):
+                row_id = self.db.add_expense(entry)
+            else:
+                row_id = self.db.add_activity(entry)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(row_id)
@@ -16,7 +16,7 @@ setup(
     url="https://github.com/bohlke01/HobbyBudgetTracker",
     packages=find_packages(),
     package_data={
-        "hobby_budget_tracker": ["templates/*"],
+        "hobby_budget_tracker": ["static/*", "static/vendor/*"],
     },
     include_package_data=True,
     classifiers=[
@@ -36,6 +36,10 @@ setup(
     install_requires=[
         "Flask>=2.0.0",
     ],
+    extras_require={
+        # Vectorized KPI computation for the analytics report
+        "analytics": ["numpy>=1.17"],
+    },
     entry_points={
         "console_scripts": [
             "hobby-budget=hobby_budget_tracker.cli:main",
@@ -0,0 +1,99 @@
+"""
+Tests for the asyncio database front end.
+"""
+import unittest
+import asyncio
+import tempfile
+import os
+import json
+import threading
+
+from hobby_budget_tracker.aio import AsyncDatabase
+from hobby_budget_tracker.models import Hobby, Expense
+from hobby_budget_tracker.transfer import iter_export
+
+
+def _thread_name(db):
+    """Report the name of the thread running the call."""
+    return threading.current_thread().name
+
+
+def _add_two(db, first, second):
+    """Add two hobbies in one transaction."""
+    with db.transaction():
+        return [db.add_hobby(Hobby(id=None, name=first)), db.add_hobby(Hobby(id=None, name=second))]
+
+
+class TestAsyncDatabase(unittest.TestCase):
+    """Test AsyncDatabase operations."""
+    
+    def setUp(self):
+        """Set up test database."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db = AsyncDatabase(self.temp_db.name, workers=2, storage_profile="wal")
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.db.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+    
+    def test_mirrors_database_methods(self):
+        """Test that Database methods are available as coroutines."""
+        async def scenario():
+            hobby_id = await self.db.add_hobby(Hobby(id=None, name="Painting"))
+            await self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=12.5))
+            hobby = await self.db.get_hobby(hobby_id)
+            return hobby, await self.db.get_total_expenses(hobby_id)
+        
+        hobby, total = asyncio.run(scenario())
+        self.assertEqual(hobby.name, "Painting")
+        self.assertEqual(total, 12.5)
+        self.assertTrue(asyncio.iscoroutinefunction(self.db.list_expenses))
+        for name in ('transaction', 'iter_expenses', 'page_key', '_migrate', 'missing'):
+            with self.subTest(name=name):
+                self.assertFalse(hasattr(self.db, name))
+    
+    def test_calls_run_on_worker_threads(self):
+        """Test that calls run concurrently on the pool with one connection per thread."""
+        async def scenario():
+            return await asyncio.gather(*(self.db.run(_thread_name) for _ in range(20)))
+        
+        names = set(asyncio.run(scenario()))
+        self.assertTrue(names)
+        self.assertTrue(all(name.startswith("hobby-db") for name in names))
+        self.assertLessEqual(len(self.db._connections), 2)
+    
+    def test_run_groups_calls_in_a_transaction(self):
+        """Test that run() gives a function one connection for several calls."""
+        ids = asyncio.run(self.db.run(_add_two, "Chess", "Go"))
+        self.assertEqual(len(ids), 2)
+        with self.assertRaises(Exception):
+            asyncio.run(self.db.run(_add_two, "Poker", "Chess"))
+        names = [hobby.name for hobby in asyncio.run(self.db.list_hobbies())]
+        self.assertEqual(names, ["Chess", "Go"])
+    
+    def test_stream(self):
+        """Test that stream() yields the fragments of a generator."""
+        asyncio.run(self.db.add_hobby(Hobby(id=None, name="Chess")))
+        
+        async def scenario():
+            return [fragment async for fragment in self.db.stream(iter_export)]
+        
+        exported = json.loads(''.join(asyncio.run(scenario())))
+        self.assertEqual([hobby['name'] for hobby in exported['hobbies']], ["Chess"])
+        self.assertEqual(exported['version'], "1.0")
+    
+    def test_closed(self):
+        """Test that calls fail after close."""
+        self.db.close()
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.db.list_hobbies())
+        with self.assertRaises(ValueError):
+            AsyncDatabase(self.temp_db.name, workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
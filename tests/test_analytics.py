@@ -0,0 +1,101 @@
+"""
+Tests for the KPI report.
+"""
+import unittest
+import tempfile
+import os
+from datetime import date, datetime
+
+from hobby_budget_tracker import analytics
+from hobby_budget_tracker.analytics import build_report
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.models import Hobby, Expense, Activity
+
+
+class TestAnalytics(unittest.TestCase):
+    """Test rolling, monthly and weekday KPIs."""
+    
+    def setUp(self):
+        """Set up test database with two hobbies."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db = Database(self.temp_db.name)
+        self.climbing = self.db.add_hobby(Hobby(id=None, name="Climbing"))
+        self.reading = self.db.add_hobby(Hobby(id=None, name="Reading"))
+        entries = [
+            Expense(id=None, hobby_id=self.climbing, amount=300.0, date=datetime(2023, 9, 1, 12)),
+            Activity(id=None, hobby_id=self.climbing, duration_hours=10.0, date=datetime(2023, 9, 2)),
+            Expense(id=None, hobby_id=self.climbing, amount=100.0, date=datetime(2024, 5, 3, 23, 59)),
+            Activity(id=None, hobby_id=self.climbing, duration_hours=4.0, date=datetime(2024, 5, 4)),
+            Expense(id=None, hobby_id=self.climbing, amount=60.0, date=datetime(2024, 6, 10)),
+            Activity(id=None, hobby_id=self.climbing, duration_hours=2.0, date=datetime(2024, 6, 11)),
+            # After the report date, so never counted
+            Expense(id=None, hobby_id=self.climbing, amount=999.0, date=datetime(2024, 7, 1)),
+            Expense(id=None, hobby_id=self.reading, amount=20.0, date=datetime(2024, 6, 30, 8)),
+        ]
+        for entry in entries:
+            if isinstance(entry, Expense):
+                self.db.add_expense(entry)
+            else:
+                self.db.add_activity(entry)
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.db.close()
+        os.unlink(self.temp_db.name)
+    
+    def report(self, **kwargs):
+        """Build the report as of 2024-06-30 with the pure-Python backend."""
+        return build_report(self.db, as_of=date(2024, 6, 30), use_numpy=False, **kwargs)
+    
+    def test_rolling_windows(self):
+        """Test trailing 30/90/365-day expense per hour."""
+        report = self.report()
+        self.assertEqual(report['as_of'], '2024-06-30')
+        self.assertEqual([hobby['name'] for hobby in report['hobbies']], ['Climbing', 'Reading'])
+        climbing, reading = report['hobbies']
+        self.assertEqual(climbing['rolling'], [
+            {'days': 30, 'expenses': 60.0, 'hours': 2.0, 'expense_per_hour': 30.0},
+            {'days': 90, 'expenses': 160.0, 'hours': 6.0, 'expense_per_hour': 26.67},
+            {'days': 365, 'expenses': 460.0, 'hours': 16.0, 'expense_per_hour': 28.75},
+        ])
+        self.assertIsNone(reading['rolling'][0]['expense_per_hour'])
+        self.assertEqual(reading['rolling'][0]['expenses'], 20.0)
+    
+    def test_month_over_month(self):
+        """Test monthly totals and their change against the previous month."""
+        climbing = self.report(months=2)['hobbies'][0]
+        self.assertEqual(climbing['monthly'], [
+            {'month': '2024-05', 'expenses': 100.0, 'hours': 4.0, 'expense_per_hour': 25.0,
+             'expenses_change': 100.0, 'hours_change': 4.0, 'expense_per_hour_change': None},
+            {'month': '2024-06', 'expenses': 60.0, 'hours': 2.0, 'expense_per_hour': 30.0,
+             'expenses_change': -40.0, 'hours_change': -2.0, 'expense_per_hour_change': 5.0},
+        ])
+        self.assertEqual(len(self.report()['hobbies'][0]['monthly']), 12)
+    
+    def test_weekdays(self):
+        """Test the breakdown of all history by weekday."""
+        weekdays = {kpi['weekday']: kpi for kpi in self.report()['hobbies'][0]['weekdays']}
+        self.assertEqual(list(weekdays), list(analytics.WEEKDAYS))
+        self.assertEqual(weekdays['Friday']['expenses'], 400.0)  # 2023-09-01 and 2024-05-03
+        self.assertEqual(weekdays['Saturday']['hours'], 14.0)    # 2023-09-02 and 2024-05-04
+        self.assertEqual(weekdays['Monday']['expenses'], 60.0)
+        self.assertIsNone(weekdays['Monday']['expense_per_hour'])
+    
+    def test_single_hobby_and_empty(self):
+        """Test limiting the report to one hobby and reporting without hobbies."""
+        report = self.report(hobby_id=self.reading)
+        self.assertEqual([hobby['name'] for hobby in report['hobbies']], ['Reading'])
+        self.assertEqual(report['hobbies'][0]['monthly'][-1]['expenses'], 20.0)
+        self.assertEqual(self.report(hobby_id=999)['hobbies'], [])
+        with self.assertRaises(ValueError):
+            self.report(months=0)
+    
+    @unittest.skipIf(analytics.np is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        """Test that the vectorized backend gives the same report."""
+        self.assertEqual(build_report(self.db, as_of=date(2024, 6, 30), use_numpy=True), self.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Tests for the ASGI interface.
+"""
+import unittest
+import asyncio
+import tempfile
+import os
+import json
+import gzip
+from urllib.parse import urlsplit
+
+from hobby_budget_tracker.asgi import create_asgi_app
+from hobby_budget_tracker.web import create_app
+
+
+def call(app, method, url, body=b'', chunk_size=None, headers=()):
+    """Send one request to an ASGI app; returns (status, headers, body)."""
+    parts = urlsplit(url)
+    scope = {'type': 'http', 'method': method, 'path': parts.path,
+             'query_string': parts.query.encode(), 'headers': list(headers)}
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] if chunk_size else [body]
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(chunks) - 1}
+                for i, chunk in enumerate(chunks)]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0)
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(app(scope, receive, send))
+    headers = dict(sent[0]['headers'])
+    return sent[0]['status'], headers, b''.join(message.get('body', b'') for message in sent[1:])
+
+
+class TestASGIApp(unittest.TestCase):
+    """Test that the ASGI app answers like the Flask app."""
+    
+    def setUp(self):
+        """Set up both apps on one test database."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.app = create_asgi_app(self.temp_db.name, workers=2)
+        flask_app = create_app(self.temp_db.name, pool_size=0)
+        flask_app.config['TESTING'] = True
+        self.client = flask_app.test_client()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.app.db.close()
+        os.unlink(self.temp_db.name)
+    
+    def request(self, method, url, payload=None):
+        """Send a JSON request to the ASGI app; returns (status, decoded body)."""
+        body = json.dumps(payload).encode() if payload is not None else b''
+        status, headers, body = call(self.app, method, url, body)
+        self.assertEqual(headers[b'content-type'], b'application/json')
+        return status, json.loads(body)
+    
+    def assertSameAsFlask(self, url):
+        """Assert that a GET returns the same status and body from both apps."""
+        status, headers, body = call(self.app, 'GET', url)
+        response = self.client.get(url)
+        self.assertEqual((status, body), (response.status_code, response.data), url)
+    
+    def test_api_matches_flask(self):
+        """Test the hobby, expense and activity routes against the Flask app."""
+        status, data = self.request('POST', '/api/hobbies', {'name': 'Climbing', 'target_value': '20'})
+        self.assertEqual(status, 201)
+        hobby_id = data['id']
+        for day in range(1, 4):
+            status, _ = self.request('POST', '/api/expenses',
+                                     {'hobby_id': hobby_id, 'amount': 10.0 * day, 'date': f'2024-01-0{day}'})
+            self.assertEqual(status, 201)
+            status, _ = self.request('POST', '/api/activities',
+                                     {'hobby_id': hobby_id, 'duration_hours': day, 'date': f'2024-01-0{day}'})
+            self.assertEqual(status, 201)
+        self.assertEqual(self.request('PUT', f'/api/hobbies/{hobby_id}', {'description': 'Bouldering'})[0], 200)
+        
+        status, page = self.request('GET', '/api/expenses?limit=2')
+        self.assertEqual(len(page['items']), 2)
+        for url in ['/api/hobbies', '/api/expenses', '/api/activities?hobby_id=1',
+                    '/api/expenses?limit=2', f'/api/expenses?limit=2&cursor={page["next_cursor"]}',
+                    '/api/activities?from=2024-01-02&to=2024-01-02', '/api/expenses?limit=0',
+                    '/api/expenses?from=yesterday', f'/api/hobbies/{hobby_id}/stats',
+                    f'/api/hobbies/{hobby_id}/stats?from=2024-01-02', f'/api/hobbies/{hobby_id}/chart-data',
+                    '/api/hobbies/999/stats', '/api/summary', '/api/analytics?as_of=2024-01-31&months=2',
+                    '/api/analytics?hobby_id=999']:
+            with self.subTest(url=url):
+                self.assertSameAsFlask(url)
+        status, stats = self.request('GET', '/api/cache')
+        self.assertTrue(stats['enabled'])
+        self.assertGreater(stats['misses'], 0)
+    
+    def test_errors(self):
+        """Test error responses for bad requests and unknown routes."""
+        self.assertEqual(self.request('POST', '/api/hobbies', {'name': 'Chess'})[0], 201)
+        status, data = self.request('POST', '/api/hobbies', {'name': 'Chess'})
+        self.assertEqual(status, 400)
+        self.assertIn('already exists', data['error'])
+        self.assertEqual(self.request('POST', '/api/hobbies', {})[1], {'error': 'Missing required field: name'})
+        self.assertEqual(self.request('POST', '/api/expenses', {'hobby_id': 1, 'amount': 'x'})[0], 400)
+        self.assertEqual(self.request('POST', '/api/expenses', {'hobby_id': 1, 'amount': 'inf'})[0], 400)
+        self.assertEqual(self.request('POST', '/api/activities', {'hobby_id': 1, 'duration_hours': 'nan'})[0], 400)
+        self.assertEqual(self.request('DELETE', '/api/hobbies/999')[0], 404)
+        self.assertEqual(self.request('GET', '/api/nothing')[0], 404)
+        self.assertEqual(self.request('PATCH', '/api/hobbies')[0], 405)
+        status, _, body = call(self.app, 'POST', '/api/hobbies', b'{not json')
+        self.assertEqual(status, 400)
+        self.assertEqual(self.request('DELETE', '/api/hobbies/1')[0], 200)
+        self.assertEqual(self.request('GET', '/api/hobbies')[1], [])
+    
+    def test_conditional_get(self):
+        """Test that the ASGI app sends the same ETags and honours If-None-Match."""
+        status, headers, _ = call(self.app, 'GET', '/api/summary')
+        self.assertEqual(headers[b'etag'].decode(), self.client.get('/api/summary').headers['ETag'])
+        condition = [(b'if-none-match', headers[b'etag'])]
+        
+        status, _, body = call(self.app, 'GET', '/api/summary', headers=condition)
+        self.assertEqual((status, body), (304, b''))
+        self.request('POST', '/api/hobbies', {'name': 'Chess'})
+        status, _, body = call(self.app, 'GET', '/api/summary', headers=condition)
+        self.assertEqual(status, 200)
+    
+    def test_index(self):
+        """Test that the main page is served."""
+        status, headers, body = call(self.app, 'GET', '/')
+        self.assertEqual(status, 200)
+        self.assertTrue(headers[b'content-type'].startswith(b'text/html'))
+        self.assertEqual(body, self.client.get('/').data)
+    
+    def test_static_asset(self):
+        """Test that hashed assets are served gzipped and cached forever."""
+        url = self.app.assets.url_for('app.js')
+        status, headers, body = call(self.app, 'GET', url, headers=[(b'accept-encoding', b'gzip')])
+        self.assertEqual(status, 200)
+        self.assertEqual(headers[b'content-encoding'], b'gzip')
+        self.assertIn(b'immutable', headers[b'cache-control'])
+        self.assertEqual(gzip.decompress(body), self.client.get(url).data)
+        self.assertEqual(call(self.app, 'GET', '/static/missing.js')[0], 404)
+    
+    def test_batch(self):
+        """Test that batches are applied, or rejected, as a whole."""
+        operations = [{'op': 'create', 'type': 'hobby', 'data': {'name': 'Chess'}},
+                      {'op': 'create', 'type': 'expense', 'data': {'hobby_id': '$0', 'amount': 20}}]
+        status, body = self.request('POST', '/api/batch', {'operations': operations})
+        self.assertEqual(status, 200)
+        self.assertEqual([result['status'] for result in body['results']], [201, 201])
+        status, body = self.request('POST', '/api/batch', {'operations': operations})
+        self.assertEqual((status, body['index']), (400, 0))
+        self.assertSameAsFlask('/api/summary')
+        self.assertSameAsFlask('/api/dashboard')
+        self.assertSameAsFlask('/api/dashboard?limit=1')
+    
+    def test_export_and_import(self):
+        """Test streaming export and chunked import."""
+        self.request('POST', '/api/hobbies', {'name': 'Chess'})
+        self.request('POST', '/api/expenses', {'hobby_id': 1, 'amount': 5.0, 'date': '2024-02-01'})
+        status, headers, exported = call(self.app, 'GET', '/api/export')
+        self.assertEqual(status, 200)
+        self.assertNotIn(b'content-length', headers)
+        
+        self.request('DELETE', '/api/hobbies/1')
+        status, _, body = call(self.app, 'POST', '/api/import', exported, chunk_size=7)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)['expenses_imported'], 1)
+        self.assertEqual(json.loads(body)['hobbies_imported'], 1)
+        
+        status, _, body = call(self.app, 'POST', '/api/import', b'{"hobbies": []}')
+        self.assertEqual(status, 400)
+    
+    def test_lifespan_closes_database(self):
+        """Test that server shutdown closes the connections."""
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+        
+        async def receive():
+            return messages.pop(0)
+        
+        async def send(message):
+            sent.append(message['type'])
+        
+        asyncio.run(self.app({'type': 'lifespan'}, receive, send))
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(self.app.db.list_hobbies())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for static front-end assets.
+"""
+import unittest
+import tempfile
+import os
+import gzip
+import hashlib
+from pathlib import Path
+
+from hobby_budget_tracker.assets import AssetBundle, CHART_JS, CHART_JS_CDN, IMMUTABLE, fetch_chart_js
+from hobby_budget_tracker.web import create_app
+
+
+class TestAssetBundle(unittest.TestCase):
+    """Test hashing, compression and link rewriting."""
+    
+    def setUp(self):
+        """Set up a static folder with a page, a script and a vendored library."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.static = Path(self.temp_dir.name)
+        (self.static / "vendor").mkdir()
+        (self.static / "index.html").write_text(
+            '<script src="/static/vendor/chart.umd.min.js"></script>\n'
+            '<script src="/static/app.js"></script>\n' + "<p>Hobbies</p>\n" * 200)
+        (self.static / "app.js").write_text("console.log('hobbies');\n" * 100)
+        (self.static / CHART_JS).write_text("var Chart = {};\n" * 100)
+    
+    def tearDown(self):
+        """Remove the static folder."""
+        self.temp_dir.cleanup()
+    
+    def test_links_are_hashed(self):
+        """Test that page links are rewritten to URLs carrying a content hash."""
+        bundle = AssetBundle(self.static)
+        page = bundle.index.body.decode()
+        url = bundle.url_for("app.js")
+        self.assertRegex(url, r"^/static/app\.[0-9a-f]{10}\.js$")
+        self.assertIn(f'"{url}"', page)
+        self.assertIn(f'"{bundle.url_for(CHART_JS)}"', page)
+        self.assertNotIn(CHART_JS_CDN, page)
+        self.assertEqual(bundle.find(url), (bundle.assets["app.js"], True))
+        self.assertEqual(bundle.find("/static/app.js"), (bundle.assets["app.js"], False))
+        self.assertEqual(bundle.find("/static/missing.js"), (None, False))
+    
+    def test_hash_follows_content(self):
+        """Test that changing a file changes its URL."""
+        before = AssetBundle(self.static).url_for("app.js")
+        (self.static / "app.js").write_text("console.log('changed');\n")
+        self.assertNotEqual(AssetBundle(self.static).url_for("app.js"), before)
+    
+    def test_missing_chart_js_uses_cdn(self):
+        """Test that a missing Chart.js is logged and loaded from the CDN."""
+        os.unlink(self.static / CHART_JS)
+        with self.assertLogs("hobby_budget_tracker.assets", "WARNING") as logs:
+            page = AssetBundle(self.static).index.body.decode()
+        self.assertIn(f'"{CHART_JS_CDN}"', page)
+        self.assertIn("python -m hobby_budget_tracker.assets", logs.output[0])
+    
+    def test_fetch_chart_js(self):
+        """Test vendoring Chart.js into the static folder, checked against its digest."""
+        source = self.static / "download.js"
+        source.write_text("var Chart = {version: '4'};\n")
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        
+        # A download that does not match leaves the vendored copy alone
+        for sha256 in (None, "0" * 64):
+            with self.assertRaises(ValueError):
+                fetch_chart_js(self.static, source.as_uri(), sha256)
+            self.assertEqual((self.static / CHART_JS).read_text(), "var Chart = {};\n" * 100)
+            self.assertEqual(sorted(p.name for p in (self.static / "vendor").iterdir()), ["chart.umd.min.js"])
+        
+        os.unlink(self.static / CHART_JS)
+        path = fetch_chart_js(self.static, source.as_uri(), digest.upper())
+        self.assertEqual(path, self.static / CHART_JS)
+        self.assertEqual(path.read_text(), "var Chart = {version: '4'};\n")
+        self.assertIsNotNone(AssetBundle(self.static).url_for(CHART_JS))
+    
+    def test_gzip(self):
+        """Test that compressible assets are precompressed and sent to clients accepting gzip."""
+        asset = AssetBundle(self.static).assets["app.js"]
+        status, headers, body = asset.respond(True, "gzip, deflate, br")
+        headers = dict(headers)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(headers["Cache-Control"], IMMUTABLE)
+        self.assertEqual(gzip.decompress(body), asset.body)
+        self.assertLess(len(body), len(asset.body))
+        
+        status, headers, body = asset.respond(False, "")
+        self.assertNotIn("Content-Encoding", dict(headers))
+        self.assertEqual(dict(headers)["Cache-Control"], "no-cache")
+        self.assertEqual(body, asset.body)
+    
+    def test_not_modified(self):
+        """Test that revalidated plain URLs answer 304."""
+        asset = AssetBundle(self.static).index
+        status, headers, body = asset.respond(False, "gzip", not_modified=True)
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+
+
+class TestAssetRoutes(unittest.TestCase):
+    """Test serving the page and assets from the Flask app."""
+    
+    def setUp(self):
+        """Set up test client."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.app = create_app(self.temp_db.name)
+        self.app.config['TESTING'] = True
+        self.client = self.app.test_client()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        os.unlink(self.temp_db.name)
+    
+    def test_index_gzip_and_revalidation(self):
+        """Test that the page is sent gzipped with an ETag and revalidated with 304."""
+        response = self.client.get('/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertIn(b'Hobby Budget Tracker', gzip.decompress(response.data))
+        
+        response = self.client.get('/', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+    
+    def test_static_asset(self):
+        """Test that hashed asset URLs are immutable and plain ones are revalidated."""
+        assets = self.app.extensions['assets']
+        name, asset = 'app.js', assets.assets['app.js']
+        self.assertIn(asset.url.encode(), self.client.get('/').data)
+        response = self.client.get(asset.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Cache-Control'], IMMUTABLE)
+        self.assertEqual(response.data, asset.body)
+        self.assertEqual(self.client.get(f'/static/{name}').headers['Cache-Control'], 'no-cache')
+    
+    def test_unknown_asset(self):
+        """Test that unknown static URLs are 404."""
+        self.assertEqual(self.client.get('/static/missing.js').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for the query result cache.
+"""
+import unittest
+import tempfile
+import os
+import sqlite3
+import json
+
+from hobby_budget_tracker.cache import QueryCache
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.models import Hobby, Expense, Activity
+from hobby_budget_tracker.web import create_app
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test caching and invalidation of query results."""
+    
+    def setUp(self):
+        """Set up a test database with a cached connection."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.cache = QueryCache(maxsize=8)
+        self.db = Database(self.temp_db.name, cache=self.cache)
+        self.hobby_id = self.db.add_hobby(Hobby(id=None, name="Climbing"))
+        self.db.add_expense(Expense(id=None, hobby_id=self.hobby_id, amount=30.0))
+        self.db.add_activity(Activity(id=None, hobby_id=self.hobby_id, duration_hours=2.0))
+        self.cache.clear()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.db.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_repeated_calls_hit(self):
+        """Test that repeated calls with the same arguments are served from the cache."""
+        first = self.db.get_summary()
+        self.assertIs(self.db.get_summary(), first)
+        self.db.get_hobby_totals(self.hobby_id)
+        self.db.get_hobby_totals(self.hobby_id)
+        self.db.get_hobby_totals(999)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 3, 3))
+        self.assertEqual(stats['hit_rate'], 0.4)
+    
+    def test_own_write_invalidates(self):
+        """Test that a commit on the same connection invalidates the results."""
+        self.assertEqual(self.db.get_hobby_totals(self.hobby_id)['total_expenses'], 30.0)
+        self.db.add_expense(Expense(id=None, hobby_id=self.hobby_id, amount=10.0))
+        self.assertEqual(self.db.get_hobby_totals(self.hobby_id)['total_expenses'], 40.0)
+        self.assertEqual(self.db.get_expense_per_hour(self.hobby_id), 20.0)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+    
+    def test_foreign_write_invalidates(self):
+        """Test that a commit by an unrelated connection, e.g. another process, is noticed."""
+        self.assertEqual(len(self.db.get_expense_per_hour_time_series(self.hobby_id)), 1)
+        other = sqlite3.connect(self.temp_db.name)
+        other.execute("INSERT INTO activities (hobby_id, duration_hours, description, date) "
+                      "VALUES (?, 4.0, '', '2000-01-01T00:00:00')", (self.hobby_id,))
+        other.commit()
+        other.close()
+        self.assertEqual(len(self.db.get_expense_per_hour_time_series(self.hobby_id)), 2)
+        self.assertEqual(self.db.get_summary()[0]['total_hours'], 6.0)
+        self.assertEqual(self.cache.stats()['hits'], 0)
+    
+    def test_shared_between_connections(self):
+        """Test that connections sharing a cache see each other's writes."""
+        other = Database(self.temp_db.name, cache=self.cache)
+        writes = self.cache.writes
+        try:
+            self.assertEqual(self.db.get_summary()[0]['total_expenses'], 30.0)
+            self.assertEqual(other.get_summary()[0]['total_expenses'], 30.0)
+            other.add_expense(Expense(id=None, hobby_id=self.hobby_id, amount=5.0))
+            self.assertEqual(self.db.get_summary()[0]['total_expenses'], 35.0)
+            self.assertEqual(self.cache.stats()['writes'], writes + 1)
+        finally:
+            other.close()
+    
+    def test_transaction_bypasses_cache(self):
+        """Test that reads inside a transaction see uncommitted changes."""
+        self.db.get_summary()
+        with self.db.transaction():
+            self.db.add_expense(Expense(id=None, hobby_id=self.hobby_id, amount=5.0))
+            self.assertEqual(self.db.get_summary()[0]['total_expenses'], 35.0)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used result is evicted first."""
+        cache = QueryCache(maxsize=2)
+        self.db.cache = cache
+        self.db.get_hobby_totals(1)
+        self.db.get_hobby_totals(2)
+        self.db.get_hobby_totals(1)
+        self.db.get_hobby_totals(3)  # evicts 2
+        self.db.get_hobby_totals(1)
+        self.db.get_hobby_totals(2)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses'], cache.stats()['size']), (2, 4, 2))
+        with self.assertRaises(ValueError):
+            QueryCache(maxsize=0)
+    
+    def test_web_cache_stats(self):
+        """Test the cache statistics endpoint."""
+        app = create_app(self.temp_db.name)
+        client = app.test_client()
+        for _ in range(3):
+            self.assertEqual(client.get(f'/api/hobbies/{self.hobby_id}/stats').status_code, 200)
+        stats = json.loads(client.get('/api/cache').data)
+        self.assertTrue(stats['enabled'])
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        client.post('/api/expenses', json={'hobby_id': self.hobby_id, 'amount': 1.0, 'date': '2024-01-01'})
+        data = json.loads(client.get(f'/api/hobbies/{self.hobby_id}/stats').data)
+        self.assertEqual(data['total_expenses'], 31.0)
+        app.extensions['db_pool'].close()
+        
+        app = create_app(self.temp_db.name, cache_size=0)
+        self.assertEqual(json.loads(app.test_client().get('/api/cache').data), {'enabled': False})
+        app.extensions['db_pool'].close()
+
+
+if __name__ == '__main__':
+    unittest.main()
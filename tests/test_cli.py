@@ -5,6 +5,7 @@ import unittest
 import tempfile
 import os
 import sys
+from datetime import datetime
 from io import StringIO
 
 from hobby_budget_tracker.cli import CLI
@@ -79,6 +80,146 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(result, 0)
         self.assertIn("Added activity", stdout)
     
+    def test_list_expenses_limit_and_before(self):
+        """Test limiting expense listings via CLI."""
+        from hobby_budget_tracker.models import Expense
+        self.cli.run(['hobby', 'add', 'Baking'])
+        hobby = self.cli.db.get_hobby_by_name('Baking')
+        for day, amount in ((1, 11.0), (2, 22.0), (3, 33.0)):
+            self.cli.db.add_expense(Expense(id=None, hobby_id=hobby.id, amount=amount,
+                                            date=datetime(2024, 3, day)))
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['expense', 'list', '--limit', '1'])
+        )
+        self.assertEqual(result, 0)
+        self.assertIn("33.00", stdout)
+        self.assertNotIn("22.00", stdout)
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['expense', 'list', '--before', '2024-03-03'])
+        )
+        self.assertIn("22.00", stdout)
+        self.assertIn("11.00", stdout)
+        self.assertNotIn("33.00", stdout)
+        
+        for command in ('expense', 'activity'):
+            for limit in ('0', '-1', 'ten'):
+                sys.stderr = StringIO()
+                with self.assertRaises(SystemExit) as raised:
+                    self.cli.run([command, 'list', '--limit', limit])
+                self.assertEqual(raised.exception.code, 2)
+                self.assertIn("--limit", sys.stderr.getvalue())
+        sys.stderr = self.old_stderr
+    
+    def test_list_formats(self):
+        """Test table, CSV and JSON lines output of listings, read with one query."""
+        import csv
+        import json
+        from hobby_budget_tracker.models import Expense, Activity
+        self.cli.run(['hobby', 'add', 'Baking'])
+        self.cli.run(['hobby', 'add', 'Cycling'])
+        baking = self.cli.db.get_hobby_by_name('Baking')
+        cycling = self.cli.db.get_hobby_by_name('Cycling')
+        self.cli.db.add_expense(Expense(id=None, hobby_id=baking.id, amount=12.5,
+                                        description='Flour, "00"', date=datetime(2024, 3, 1, 9, 30)))
+        self.cli.db.add_expense(Expense(id=None, hobby_id=cycling.id, amount=40.0, date=datetime(2024, 3, 2)))
+        self.cli.db.add_activity(Activity(id=None, hobby_id=cycling.id, duration_hours=1.5,
+                                          date=datetime(2024, 3, 2)))
+        
+        statements = []
+        self.cli.db.conn.set_trace_callback(statements.append)
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['expense', 'list', '--format', 'csv'])
+        )
+        self.cli.db.conn.set_trace_callback(None)
+        self.assertEqual(result, 0)
+        self.assertEqual(len(statements), 1)
+        rows = list(csv.DictReader(stdout.splitlines()))
+        self.assertEqual([row['hobby_name'] for row in rows], ['Cycling', 'Baking'])
+        self.assertEqual(rows[1]['description'], 'Flour, "00"')
+        self.assertEqual(rows[1]['date'], '2024-03-01T09:30:00')
+        self.assertEqual(float(rows[1]['amount']), 12.5)
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['activity', 'list', '--format', 'jsonl', '--hobby', 'Cycling'])
+        )
+        self.assertEqual([json.loads(line) for line in stdout.splitlines()], [{
+            'id': 1, 'date': '2024-03-02T00:00:00', 'hobby_id': cycling.id, 'hobby_name': 'Cycling',
+            'duration_hours': 1.5, 'description': ''
+        }])
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['expense', 'list'])
+        )
+        self.assertIn("2024-03-01 | Baking               | €   12.50", stdout)
+        self.assertIn('           Flour, "00"', stdout)
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['activity', 'list', '--format', 'jsonl', '--hobby', 'Baking'])
+        )
+        self.assertEqual((result, stdout), (0, ''))
+    
+    def test_ingest_round_trip(self):
+        """Test that a CSV listing can be ingested again, with rejects reported."""
+        from hobby_budget_tracker.models import Expense
+        self.cli.run(['hobby', 'add', 'Baking'])
+        baking = self.cli.db.get_hobby_by_name('Baking')
+        self.cli.db.add_expense(Expense(id=None, hobby_id=baking.id, amount=12.5,
+                                        description='Flour, "00"', date=datetime(2024, 3, 1, 9, 30)))
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['expense', 'list', '--format', 'csv'])
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'expenses.csv')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(stdout + '1,2024-03-02,9,Unknown,3.0,\n')
+            
+            result, stdout, stderr = self.capture_output(
+                lambda: self.cli.run(['ingest', path, '--type', 'expense', '--workers', '0'])
+            )
+            self.assertEqual(result, 1)
+            self.assertIn("Added 1 expenses from 2 rows", stdout)
+            self.assertIn("rows/s", stdout)
+            self.assertIn("Rejected 1 rows", stderr)
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'expenses.rejects.csv')))
+        
+        expenses = self.cli.db.list_expenses()
+        self.assertEqual(len(expenses), 2)
+        self.assertEqual({e.description for e in expenses}, {'Flour, "00"'})
+    
+    def test_date_range_options(self):
+        """Test --since/--until on listings and hobby stats via CLI."""
+        from hobby_budget_tracker.models import Expense, Activity
+        self.cli.run(['hobby', 'add', 'Pottery'])
+        hobby = self.cli.db.get_hobby_by_name('Pottery')
+        for day, amount in ((1, 11.0), (2, 22.0), (3, 33.0)):
+            self.cli.db.add_expense(Expense(id=None, hobby_id=hobby.id, amount=amount,
+                                            date=datetime(2024, 3, day, 18)))
+        self.cli.db.add_activity(Activity(id=None, hobby_id=hobby.id, duration_hours=2.0,
+                                          date=datetime(2024, 3, 2)))
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['expense', 'list', '--since', '2024-03-02', '--until', '2024-03-02'])
+        )
+        self.assertEqual(result, 0)
+        self.assertIn("22.00", stdout)
+        self.assertNotIn("11.00", stdout)
+        self.assertNotIn("33.00", stdout)
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['activity', 'list', '--until', '2024-03-01'])
+        )
+        self.assertIn("No activities found", stdout)
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['hobby', 'stats', 'Pottery', '--since', '2024-03-02'])
+        )
+        self.assertEqual(result, 0)
+        self.assertIn("Period:            2024-03-02 – …", stdout)
+        self.assertIn("55.00", stdout)
+        self.assertIn("27.50", stdout)  # 55/2
+    
     def test_hobby_stats(self):
         """Test hobby statistics via CLI."""
         self.cli.run(['hobby', 'add', 'Cycling'])
@@ -107,6 +248,51 @@ class TestCLI(unittest.TestCase):
         self.assertIn("HOBBY BUDGET SUMMARY", stdout)
         self.assertIn("Drawing", stdout)
         self.assertIn("20.00", stdout)  # 100/5 = 20
+    
+    def test_report(self):
+        """Test the KPI report command via CLI."""
+        from hobby_budget_tracker.models import Expense, Activity
+        self.cli.run(['hobby', 'add', 'Archery'])
+        hobby = self.cli.db.get_hobby_by_name('Archery')
+        self.cli.db.add_expense(Expense(id=None, hobby_id=hobby.id, amount=80.0, date=datetime(2024, 6, 3)))
+        self.cli.db.add_activity(Activity(id=None, hobby_id=hobby.id, duration_hours=4.0,
+                                          date=datetime(2024, 6, 4)))
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['report', '--as-of', '2024-06-30', '--months', '2', '--hobby', 'Archery'])
+        )
+        self.assertEqual(result, 0)
+        self.assertIn("as of 2024-06-30", stdout)
+        self.assertIn("Last  30 days", stdout)
+        self.assertIn("2024-06", stdout)
+        self.assertIn("20.00/h", stdout)  # 80/4
+        self.assertIn("Tuesday", stdout)
+    
+    def test_totals_verify_and_rebuild(self):
+        """Test checking and repairing stored totals via CLI."""
+        self.cli.run(['hobby', 'add', 'Climbing'])
+        self.cli.run(['expense', 'add', 'Climbing', '90.00'])
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['totals', 'verify'])
+        )
+        self.assertEqual(result, 0)
+        self.assertIn("consistent", stdout)
+        
+        self.cli.db.conn.execute("UPDATE hobby_totals SET total_expenses = 0")
+        self.cli.db.conn.commit()
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['totals', 'verify'])
+        )
+        self.assertEqual(result, 1)
+        self.assertIn("Climbing", stderr)
+        
+        result, stdout, stderr = self.capture_output(
+            lambda: self.cli.run(['totals', 'rebuild'])
+        )
+        self.assertEqual(result, 0)
+        self.assertIn("Rebuilt totals for 1 hobbies", stdout)
+        self.assertEqual(self.cli.db.get_total_expenses(self.cli.db.get_hobby_by_name('Climbing').id), 90.0)
 
 
 if __name__ == '__main__':
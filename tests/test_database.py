@@ -4,9 +4,11 @@ Tests for database operations.
 import unittest
 import tempfile
 import os
-from datetime import datetime
+import random
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
 
-from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.database import Database, SCHEMA_VERSION
 from hobby_budget_tracker.models import Hobby, Expense, Activity
 
 
@@ -252,6 +254,28 @@ class TestDatabase(unittest.TestCase):
         # Should have no data points since no activities (division by zero)
         self.assertEqual(len(time_series), 0)
     
+    def test_get_expense_per_hour_time_series_accumulates_days(self):
+        """Test that same-day entries are combined and earlier days carry over."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Climbing"))
+        other_id = self.db.add_hobby(Hobby(id=None, name="Knitting"))
+        
+        # Expense before the first activity produces no point of its own
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=60.0, date=datetime(2024, 1, 1, 9)))
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=40.0, date=datetime(2024, 1, 2, 9)))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=2.0, date=datetime(2024, 1, 2, 10)))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=3.0, date=datetime(2024, 1, 2, 18)))
+        # Activity-only day lowers the running cost per hour
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=3.0, date=datetime(2024, 1, 4)))
+        # Entries for other hobbies are ignored
+        self.db.add_expense(Expense(id=None, hobby_id=other_id, amount=500.0, date=datetime(2024, 1, 3)))
+        
+        time_series = self.db.get_expense_per_hour_time_series(hobby_id)
+        
+        self.assertEqual(time_series, [
+            {'date': '2024-01-02', 'expense_per_hour': 20.0},
+            {'date': '2024-01-04', 'expense_per_hour': 12.5},
+        ])
+    
     def test_get_expense_per_hour_time_series_ordering(self):
         """Test time series is ordered by date."""
         hobby = Hobby(id=None, name="Gaming")
@@ -274,6 +298,431 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(len(time_series), 2)
         self.assertEqual(time_series[0]['date'], '2024-01-05')
         self.assertEqual(time_series[1]['date'], '2024-01-10')
+    
+    def test_get_daily_totals_match_time_series_days(self):
+        """Test that daily totals bucket dates with a UTC offset like the time series."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Surfing"))
+        late = datetime(2024, 1, 5, 23, 30, tzinfo=timezone(timedelta(hours=-2)))
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=30.0, date=late))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=2.0, date=late))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=1.0, date=datetime(2024, 1, 5, 9)))
+        
+        epoch = date(1970, 1, 1)
+        daily = [((epoch + timedelta(days=day)).isoformat(), spent, hours)
+                 for _, day, spent, hours in self.db.get_daily_totals(hobby_id)]
+        self.assertEqual(daily, [('2024-01-05', 0.0, 1.0), ('2024-01-06', 30.0, 2.0)])
+        self.assertEqual([point['date'] for point in self.db.get_expense_per_hour_time_series(hobby_id)],
+                         [day for day, _, _ in daily])
+    
+    
+    def test_hobby_totals_follow_inserts_updates_and_deletes(self):
+        """Test that triggers keep hobby_totals in sync with the source tables."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Sailing"))
+        other_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        expense_id = self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=0.1))
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=0.2))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=4.0))
+        
+        totals = self.db.get_hobby_totals(hobby_id)
+        self.assertAlmostEqual(totals['total_expenses'], 0.3)
+        self.assertEqual(totals['total_hours'], 4.0)
+        self.assertEqual(totals['expense_count'], 2)
+        self.assertEqual(totals['activity_count'], 1)
+        
+        # Moving an expense to another hobby updates both totals
+        self.db.conn.execute("UPDATE expenses SET hobby_id = ?, amount = 5.0 WHERE id = ?",
+                             (other_id, expense_id))
+        self.db.conn.commit()
+        self.assertAlmostEqual(self.db.get_total_expenses(hobby_id), 0.2)
+        self.assertEqual(self.db.get_total_expenses(other_id), 5.0)
+        
+        # Removing the last entries resets totals to exactly zero
+        self.db.conn.execute("DELETE FROM expenses WHERE hobby_id = ?", (hobby_id,))
+        self.db.conn.commit()
+        self.assertEqual(self.db.get_total_expenses(hobby_id), 0.0)
+        self.assertEqual(self.db.verify_hobby_totals(), [])
+        
+        self.db.delete_hobby(hobby_id)
+        row = self.db.conn.execute("SELECT * FROM hobby_totals WHERE hobby_id = ?", (hobby_id,)).fetchone()
+        self.assertIsNone(row)
+    
+    def test_hobby_totals_equal_sum_exactly(self):
+        """Test that totals stay bit-for-bit equal to SUM() over any mix of changes."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Sailing"))
+        other_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        
+        def assert_totals_match():
+            for hid in (hobby_id, other_id):
+                expected = self.db.conn.execute(
+                    "SELECT COALESCE(SUM(amount), 0.0), COALESCE((SELECT SUM(duration_hours) FROM activities "
+                    "WHERE hobby_id = ?), 0.0) FROM expenses WHERE hobby_id = ?", (hid, hid)
+                ).fetchone()
+                self.assertEqual((self.db.get_total_expenses(hid), self.db.get_total_hours(hid)), tuple(expected))
+            self.assertEqual(self.db.verify_hobby_totals(), [])
+        
+        ids = [self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=amount, date=datetime(2024, 1, day)))
+               for day, amount in ((1, 0.1), (2, 0.2), (3, 0.3))]
+        self.db.delete_expense(ids[1])
+        self.assertEqual(self.db.get_total_expenses(hobby_id), 0.4)
+        assert_totals_match()
+        
+        rng = random.Random(5)
+        expense_ids, activity_ids = list(ids[::2]), []
+        for _ in range(300):
+            hid = rng.choice((hobby_id, other_id))
+            when = datetime(2024, rng.randint(1, 12), rng.randint(1, 28))
+            action = rng.random()
+            if action < 0.5:
+                expense_ids.append(self.db.add_expense(Expense(id=None, hobby_id=hid, amount=rng.random() * 100,
+                                                               date=when)))
+                activity_ids.append(self.db.add_activity(Activity(id=None, hobby_id=hid,
+                                                                  duration_hours=rng.random() * 3, date=when)))
+            elif action < 0.8 and activity_ids:
+                self.db.update_expense(rng.choice(expense_ids), hobby_id=hid, amount=rng.random() * 100,
+                                       date=when)
+                self.db.update_activity(rng.choice(activity_ids), duration_hours=rng.random() * 3)
+            elif expense_ids and activity_ids:
+                self.db.delete_expense(expense_ids.pop(rng.randrange(len(expense_ids))))
+                self.db.delete_activity(activity_ids.pop(rng.randrange(len(activity_ids))))
+        assert_totals_match()
+    
+    def test_verify_and_rebuild_hobby_totals(self):
+        """Test detecting and repairing drifted totals."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Bouldering"))
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=80.0))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=4.0))
+        self.db.conn.execute("UPDATE hobby_totals SET total_expenses = 1.0")
+        self.db.conn.commit()
+        
+        mismatches = self.db.verify_hobby_totals()
+        self.assertEqual(len(mismatches), 1)
+        self.assertEqual(mismatches[0]['hobby_id'], hobby_id)
+        self.assertEqual(mismatches[0]['stored']['total_expenses'], 1.0)
+        self.assertEqual(mismatches[0]['expected']['total_expenses'], 80.0)
+        
+        self.assertEqual(self.db.rebuild_hobby_totals(), 1)
+        self.assertEqual(self.db.verify_hobby_totals(), [])
+        self.assertEqual(self.db.get_expense_per_hour(hobby_id), 20.0)
+    
+    def test_table_versions(self):
+        """Test that version stamps change with every kind of write, and only then."""
+        versions = self.db.get_table_versions()
+        self.assertEqual(set(versions), {'hobbies', 'expenses', 'activities'})
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        after_insert = self.db.get_table_versions()
+        self.assertNotEqual(after_insert['hobbies'], versions['hobbies'])
+        self.assertEqual(after_insert['expenses'], versions['expenses'])
+        
+        self.db.list_hobbies()
+        self.assertEqual(self.db.get_table_versions(), after_insert)
+        self.db.update_hobby(hobby_id, description="On water")
+        after_update = self.db.get_table_versions()
+        self.assertNotEqual(after_update['hobbies'], after_insert['hobbies'])
+        
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=5.0))
+        after_expense = self.db.get_table_versions()
+        self.db.delete_hobby(hobby_id)
+        after_delete = self.db.get_table_versions()
+        self.assertNotEqual(after_delete['expenses'], after_expense['expenses'])
+        self.assertNotEqual(after_delete['hobbies'], after_expense['hobbies'])
+        self.assertEqual(after_delete['activities'], versions['activities'])
+    
+    def test_update_and_delete_entries(self):
+        """Test updating and deleting single expenses and activities."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        other_id = self.db.add_hobby(Hobby(id=None, name="Sailing"))
+        expense_id = self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=30.0,
+                                                 date=datetime(2024, 3, 1, 9, 0)))
+        activity_id = self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=2.0))
+        
+        self.db.update_expense(expense_id, amount=45.0, description="Oars")
+        expense = self.db.get_expense(expense_id)
+        self.assertEqual((expense.amount, expense.description), (45.0, "Oars"))
+        self.assertEqual(expense.date, datetime(2024, 3, 1, 9, 0))
+        self.assertEqual(self.db.get_total_expenses(hobby_id), 45.0)
+        
+        self.db.update_activity(activity_id, hobby_id=other_id, duration_hours=3.0)
+        self.assertEqual(self.db.get_activity(activity_id).hobby_id, other_id)
+        self.assertEqual(self.db.get_total_hours(hobby_id), 0.0)
+        self.assertEqual(self.db.get_total_hours(other_id), 3.0)
+        
+        self.db.delete_expense(expense_id)
+        self.db.delete_activity(activity_id)
+        self.assertIsNone(self.db.get_expense(expense_id))
+        self.assertIsNone(self.db.get_activity(activity_id))
+        self.assertEqual(self.db.get_total_expenses(hobby_id), 0.0)
+        self.assertEqual(self.db.verify_hobby_totals(), [])
+        with self.assertRaises(ValueError):
+            self.db.update_expense(expense_id, amount=1.0)
+    
+    def test_get_dashboard(self):
+        """Test reading hobbies, summary and the newest entries with hobby names."""
+        rowing_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        chess_id = self.db.add_hobby(Hobby(id=None, name="Chess"))
+        for day in range(1, 4):
+            self.db.add_expense(Expense(id=None, hobby_id=rowing_id if day % 2 else chess_id,
+                                        amount=float(day), date=datetime(2024, 3, day)))
+        self.db.add_activity(Activity(id=None, hobby_id=chess_id, duration_hours=1.5))
+        
+        dashboard = self.db.get_dashboard(limit=2)
+        self.assertEqual([h.name for h in dashboard["hobbies"]], ["Chess", "Rowing"])
+        self.assertEqual(dashboard["summary"], self.db.get_summary())
+        self.assertEqual([(e.amount, name) for e, name in dashboard["expenses"]],
+                         [(3.0, "Rowing"), (2.0, "Chess")])
+        self.assertEqual([(a.duration_hours, name) for a, name in dashboard["activities"]], [(1.5, "Chess")])
+        self.assertEqual(dashboard["expenses_next"], Database.page_key(dashboard["expenses"][-1][0]))
+        self.assertEqual([e.amount for e in self.db.list_expenses(limit=2, before=dashboard["expenses_next"])],
+                         [1.0])
+        self.assertIsNone(dashboard["activities_next"])
+        self.assertFalse(self.db.conn.in_transaction)
+    
+    def test_get_summary(self):
+        """Test summarizing all hobbies in one call."""
+        gaming_id = self.db.add_hobby(Hobby(id=None, name="Gaming", target_value=5.0))
+        self.db.add_hobby(Hobby(id=None, name="Archery", description="Bows"))
+        self.db.add_expense(Expense(id=None, hobby_id=gaming_id, amount=100.0))
+        self.db.add_activity(Activity(id=None, hobby_id=gaming_id, duration_hours=4.0))
+        
+        summary = self.db.get_summary()
+        
+        self.assertEqual([entry['name'] for entry in summary], ["Archery", "Gaming"])
+        self.assertEqual(summary[0]['description'], "Bows")
+        self.assertEqual(summary[0]['total_expenses'], 0.0)
+        self.assertIsNone(summary[0]['expense_per_hour'])
+        self.assertEqual(summary[1]['id'], gaming_id)
+        self.assertEqual(summary[1]['total_hours'], 4.0)
+        self.assertEqual(summary[1]['expense_per_hour'], 25.0)
+        self.assertEqual(summary[1]['target_value'], 5.0)
+    
+    def test_add_expenses_many_returns_ids_across_chunks(self):
+        """Test bulk-adding expenses in several executemany chunks."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=1.0))
+        expenses = [Expense(id=None, hobby_id=hobby_id, amount=float(i), description=f"#{i}")
+                    for i in range(7)]
+        
+        ids = self.db.add_expenses_many(iter(expenses), chunk_size=3)
+        
+        self.assertEqual(len(ids), 7)
+        for expense_id, i in zip(ids, range(7)):
+            row = self.db.conn.execute("SELECT * FROM expenses WHERE id = ?", (expense_id,)).fetchone()
+            self.assertEqual(row["description"], f"#{i}")
+        self.assertEqual(self.db.get_total_expenses(hobby_id), 22.0)
+    
+    def test_add_activities_many(self):
+        """Test bulk-adding activities."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Yoga"))
+        ids = self.db.add_activities_many(
+            Activity(id=None, hobby_id=hobby_id, duration_hours=1.5) for _ in range(4)
+        )
+        self.assertEqual(len(set(ids)), 4)
+        self.assertEqual(self.db.get_total_hours(hobby_id), 6.0)
+        self.assertEqual(self.db.add_activities_many([]), [])
+    
+    def test_add_hobbies_many_is_all_or_nothing(self):
+        """Test that a duplicate name rolls back the whole bulk insert."""
+        from hobby_budget_tracker.database import DuplicateHobbyError
+        
+        self.db.add_hobby(Hobby(id=None, name="Chess"))
+        with self.assertRaises(DuplicateHobbyError):
+            self.db.add_hobbies_many([Hobby(id=None, name="Go"), Hobby(id=None, name="Chess")])
+        self.assertIsNone(self.db.get_hobby_by_name("Go"))
+        
+        ids = self.db.add_hobbies_many([Hobby(id=None, name="Go"), Hobby(id=None, name="Shogi")])
+        self.assertEqual(self.db.get_hobby(ids[1]).name, "Shogi")
+    
+    def test_nested_transaction_rolls_back_everything(self):
+        """Test that writes inside a failed outer transaction are discarded."""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                hobby_id = self.db.add_hobby(Hobby(id=None, name="Fencing"))
+                self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=30.0))
+                raise RuntimeError("abort")
+        self.assertEqual(self.db.list_hobbies(), [])
+        self.assertEqual(self.db.list_expenses(), [])
+        self.assertFalse(self.db.conn.in_transaction)
+    
+    def test_keyset_pagination(self):
+        """Test walking expenses page by page with (date, id) keys."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Diving"))
+        other_id = self.db.add_hobby(Hobby(id=None, name="Surfing"))
+        # Several entries share a timestamp, so the id breaks ties
+        for day in (1, 2, 2, 2, 3, 4, 4):
+            self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=float(day),
+                                        date=datetime(2024, 1, day)))
+        self.db.add_expense(Expense(id=None, hobby_id=other_id, amount=50.0, date=datetime(2024, 1, 3)))
+        
+        everything = self.db.list_expenses(hobby_id)
+        pages = []
+        before = None
+        while True:
+            page = self.db.list_expenses(hobby_id, limit=3, before=before)
+            if not page:
+                break
+            pages.append(page)
+            before = Database.page_key(page[-1])
+        
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([e.id for page in pages for e in page], [e.id for e in everything])
+        self.assertEqual([e.amount for e in everything], [4.0, 4.0, 3.0, 2.0, 2.0, 2.0, 1.0])
+        
+        # A bare day as key lists everything dated before that day
+        older = self.db.list_activities(before=("2024-01-03", 0))
+        self.assertEqual(older, [])
+        older = self.db.list_expenses(before=("2024-01-03", 0))
+        self.assertEqual([e.amount for e in older], [2.0, 2.0, 2.0, 1.0])
+    
+    def test_date_range_filters(self):
+        """Test inclusive start/end days on listings and totals."""
+        hobby_id = self.db.add_hobby(Hobby(id=None, name="Rowing"))
+        for day, amount in ((1, 10.0), (15, 20.0), (31, 40.0)):
+            # Late in the day, so an exclusive or date-only comparison would miss it
+            self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=amount,
+                                        date=datetime(2024, 1, day, 23, 30)))
+        self.db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=80.0, date=datetime(2024, 2, 1)))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=2.0,
+                                      date=datetime(2024, 1, 15)))
+        self.db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=8.0,
+                                      date=datetime(2024, 2, 10)))
+        
+        january = (date(2024, 1, 1), date(2024, 1, 31))
+        self.assertEqual([e.amount for e in self.db.list_expenses(hobby_id, start=january[0], end=january[1])],
+                         [40.0, 20.0, 10.0])
+        self.assertEqual([e.amount for e in self.db.list_expenses(start=date(2024, 1, 31))], [80.0, 40.0])
+        self.assertEqual([a.duration_hours for a in self.db.list_activities(end=date(2024, 1, 31))], [2.0])
+        page = self.db.list_expenses(hobby_id, limit=2, start=january[0], end=january[1])
+        self.assertEqual([e.amount for e in page], [40.0, 20.0])
+        
+        self.assertEqual(self.db.get_total_expenses(hobby_id, *january), 70.0)
+        self.assertEqual(self.db.get_total_hours(hobby_id, *january), 2.0)
+        self.assertEqual(self.db.get_expense_per_hour(hobby_id, *january), 35.0)
+        self.assertEqual(self.db.get_total_expenses(hobby_id), 150.0)
+        self.assertEqual(self.db.get_total_hours(hobby_id, start=date(2024, 3, 1)), 0.0)
+        self.assertIsNone(self.db.get_expense_per_hour(hobby_id, start=date(2024, 3, 1)))
+        
+        totals = self.db.get_hobby_totals(hobby_id, start=date(2024, 1, 15))
+        self.assertEqual(totals['expense_count'], 3)
+        self.assertEqual(totals['activity_count'], 2)
+        self.assertEqual(totals['total_expenses'], 140.0)
+
+
+class TestStorageProfiles(unittest.TestCase):
+    """Test the connection PRAGMA presets."""
+    
+    def setUp(self):
+        """Create a temporary directory for the database files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'test.db')
+    
+    def tearDown(self):
+        """Remove the database files."""
+        self.temp_dir.cleanup()
+    
+    def pragma(self, db, name):
+        """Read the current value of a PRAGMA."""
+        return db.conn.execute(f"PRAGMA {name}").fetchone()[0]
+    
+    def test_wal_profile(self):
+        """Test that the wal profile configures the connection."""
+        db = Database(self.db_path, storage_profile="wal")
+        self.assertEqual(self.pragma(db, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(db, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(db, "busy_timeout"), 5000)
+        self.assertEqual(self.pragma(db, "cache_size"), -16000)
+        self.assertEqual(self.pragma(db, "temp_store"), 2)  # MEMORY
+        db.add_hobby(Hobby(id=None, name="Knitting"))
+        db.close()
+        
+        # WAL mode is stored in the file, the other settings are per connection
+        db = Database(self.db_path)
+        self.assertEqual(self.pragma(db, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(db, "synchronous"), 2)  # FULL
+        self.assertEqual(db.get_hobby_by_name("Knitting").name, "Knitting")
+        db.close()
+    
+    def test_read_only(self):
+        """Test that a read-only connection reads but cannot write."""
+        db = Database(self.db_path, storage_profile="wal")
+        db.add_hobby(Hobby(id=None, name="Knitting"))
+        reader = Database(self.db_path, storage_profile="wal", read_only=True)
+        self.assertEqual(reader.get_hobby_by_name("Knitting").name, "Knitting")
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.add_hobby(Hobby(id=None, name="Chess"))
+        reader.close()
+        db.close()
+    
+    def test_default_profile_keeps_sqlite_settings(self):
+        """Test that the default profile leaves the journal mode alone."""
+        db = Database(self.db_path)
+        self.assertEqual(self.pragma(db, "journal_mode"), "delete")
+        db.close()
+    
+    def test_unknown_profile(self):
+        """Test that an unknown profile name is rejected."""
+        with self.assertRaises(ValueError):
+            Database(self.db_path, storage_profile="turbo")
+
+
+class TracingDatabase(Database):
+    """Database that records every SQL statement it executes."""
+    
+    def _connect(self):
+        super()._connect()
+        self.statements = []
+        self.conn.set_trace_callback(self.statements.append)
+
+
+class TestMigrations(unittest.TestCase):
+    """Test versioned schema migrations."""
+    
+    def setUp(self):
+        """Set up test database path."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        os.unlink(self.temp_db.name)
+    
+    def test_new_database_is_at_current_version(self):
+        """Test that a fresh database records the latest schema version."""
+        db = Database(self.temp_db.name)
+        version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+        db.close()
+        self.assertEqual(version, SCHEMA_VERSION)
+    
+    def test_warm_start_reads_only_version(self):
+        """Test that opening an up-to-date database runs no DDL or writes."""
+        Database(self.temp_db.name).close()
+        
+        db = TracingDatabase(self.temp_db.name)
+        statements = db.statements
+        db.close()
+        self.assertEqual(statements, ["PRAGMA user_version"])
+    
+    def test_upgrade_unversioned_legacy_database(self):
+        """Test that a pre-versioning database without target_value is upgraded."""
+        conn = sqlite3.connect(self.temp_db.name)
+        conn.execute("""
+            CREATE TABLE hobbies (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                description TEXT,
+                created_at TEXT NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO hobbies (name, description, created_at) VALUES ('Chess', '', '2024-01-01T00:00:00')"
+        )
+        conn.commit()
+        conn.close()
+        
+        db = Database(self.temp_db.name)
+        hobby = db.get_hobby_by_name("Chess")
+        db.update_hobby(hobby.id, target_value=5.0)
+        self.assertEqual(db.get_hobby(hobby.id).target_value, 5.0)
+        self.assertEqual(db.conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        db.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,153 @@
+"""
+Tests for bulk ingest of CSV and JSON lines files.
+"""
+import unittest
+import tempfile
+import os
+import csv
+import json
+from datetime import datetime
+
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.ingest import IngestError, IngestSpec, ingest_file, parse_column_map
+from hobby_budget_tracker.models import Hobby
+
+
+class TestIngest(unittest.TestCase):
+    """Test ingesting expenses and activities from files."""
+    
+    def setUp(self):
+        """Set up a database with one hobby."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmp.name, 'test.db'))
+        self.rowing_id = self.db.add_hobby(Hobby(id=None, name='Rowing'))
+    
+    def tearDown(self):
+        """Clean up the database."""
+        self.db.close()
+        self.tmp.cleanup()
+    
+    def write(self, name: str, text: str) -> str:
+        """Write an input file and return its path."""
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        return path
+    
+    def test_csv_with_column_map(self):
+        """Test a bank-style CSV with mapped columns, dates and decimal commas."""
+        path = self.write('bank.csv', (
+            'Buchungstag;Kategorie;Betrag;Text\n'
+            '01.03.2024;Rowing;1.234,50;"Boat,\nsecond hand"\n'
+            '02.03.2024;Rowing;12,00;Oars\n'
+        ))
+        spec = IngestSpec(entry_type='expense', input_format='csv',
+                          columns=parse_column_map('date=Buchungstag,hobby=Kategorie,amount=Betrag,description=Text'),
+                          date_format='%d.%m.%Y', decimal_comma=True, delimiter=';')
+        stats = ingest_file(self.db, path, spec, workers=0)
+        
+        self.assertEqual((stats['rows'], stats['added'], stats['rejected']), (2, 2, 0))
+        self.assertIsNone(stats['rejects_path'])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'bank.rejects.csv')))
+        expenses = self.db.list_expenses()
+        self.assertEqual([e.amount for e in expenses], [12.0, 1234.5])
+        self.assertEqual(expenses[1].description, 'Boat,\nsecond hand')
+        self.assertEqual(expenses[1].date, datetime(2024, 3, 1))
+        self.assertEqual(expenses[1].hobby_id, self.rowing_id)
+    
+    def test_rejects_file(self):
+        """Test that bad rows and unknown hobbies go to the rejects file with their line."""
+        path = self.write('expenses.csv', (
+            'hobby_name,amount,date,description\n'
+            'Rowing,12.5,2024-03-01T09:00:00,"Two\nlines"\n'
+            'Rowing,abc,2024-03-02,Bad amount\n'
+            'Chess,3,2024-03-03,Unknown hobby\n'
+            'Rowing,4\n'
+            'Rowing,5,yesterday,Bad date\n'
+        ))
+        spec = IngestSpec(entry_type='expense', input_format='csv')
+        stats = ingest_file(self.db, path, spec, workers=0, chunk_size=2)
+        
+        self.assertEqual((stats['rows'], stats['added'], stats['rejected']), (5, 1, 4))
+        with open(stats['rejects_path'], encoding='utf-8', newline='') as f:
+            rejects = list(csv.reader(f))
+        self.assertEqual(rejects[0], ['_line', '_error', 'hobby_name', 'amount', 'date', 'description'])
+        self.assertEqual([row[0] for row in rejects[1:]], ['4', '5', '6', '7'])
+        self.assertEqual(rejects[2], ['5', 'unknown hobby: Chess', 'Chess', '3', '2024-03-03', 'Unknown hobby'])
+        self.assertEqual(len(self.db.list_expenses()), 1)
+    
+    def test_rejects_with_wrong_field_count(self):
+        """Test that short and long rows keep their line and error in the named columns."""
+        path = self.write('expenses.csv', (
+            'hobby_name,amount,date,description\n'
+            'Rowing,4,2024-01-04\n'
+            'Rowing,5,2024-01-05,Oars,extra\n'
+        ))
+        stats = ingest_file(self.db, path, IngestSpec(entry_type='expense', input_format='csv'), workers=0)
+        with open(stats['rejects_path'], encoding='utf-8', newline='') as f:
+            rejects = list(csv.DictReader(f))
+        self.assertEqual([(r['_line'], r['_error']) for r in rejects],
+                         [('2', 'expected 4 fields, got 3'), ('3', 'expected 4 fields, got 5')])
+        self.assertEqual([r['amount'] for r in rejects], ['4', '5'])
+        self.assertIsNone(rejects[0]['description'])
+        self.assertEqual(rejects[1][None], ['extra'])
+    
+    def test_create_hobbies_from_jsonl(self):
+        """Test JSON lines activities with hobbies created on the way."""
+        lines = [json.dumps({'hobby_name': name, 'duration_hours': 1.5, 'date': f'2024-03-{day:02d}'})
+                 for day, name in enumerate(['Rowing', 'Chess', 'Chess'], 1)]
+        path = self.write('activities.jsonl', '\n'.join(lines + ['', '[1, 2]', '{"broken"']) + '\n')
+        spec = IngestSpec(entry_type='activity', input_format='jsonl')
+        stats = ingest_file(self.db, path, spec, workers=0, create_hobbies=True)
+        
+        self.assertEqual((stats['added'], stats['rejected'], stats['hobbies_created']), (3, 2, 1))
+        chess = self.db.get_hobby_by_name('Chess')
+        self.assertEqual(len(self.db.list_activities(hobby_id=chess.id)), 2)
+        with open(stats['rejects_path'], encoding='utf-8') as f:
+            rejects = [json.loads(line) for line in f]
+        self.assertEqual([r['line'] for r in rejects], [5, 6])
+        self.assertEqual(rejects[0]['record'], '[1, 2]')
+    
+    def test_rejects_keep_original_text(self):
+        """Test that rows rejected after parsing are written as they were read."""
+        path = self.write('bank.csv', 'Tag;Kategorie;Betrag\n01.03.2024;Chess;1.234,50\n')
+        spec = IngestSpec(entry_type='expense', input_format='csv',
+                          columns=parse_column_map('date=Tag,hobby=Kategorie,amount=Betrag'),
+                          date_format='%d.%m.%Y', decimal_comma=True, delimiter=';')
+        stats = ingest_file(self.db, path, spec, workers=0)
+        with open(stats['rejects_path'], encoding='utf-8', newline='') as f:
+            self.assertEqual(f.read(), '_line;_error;Tag;Kategorie;Betrag\n'
+                                       '2;unknown hobby: Chess;01.03.2024;Chess;1.234,50\n')
+        
+        line = '{"hobby_name": "Chess", "duration_hours": 1.50, "date": "2024-03-01", "extra": 1}'
+        path = self.write('activities.jsonl', line + '\n')
+        stats = ingest_file(self.db, path, IngestSpec(entry_type='activity', input_format='jsonl'), workers=0)
+        with open(stats['rejects_path'], encoding='utf-8') as f:
+            self.assertEqual(json.loads(f.read())['record'], line)
+    
+    def test_process_pool_keeps_file_order(self):
+        """Test that chunks parsed by worker processes are written in file order."""
+        rows = ''.join(f'Rowing,{i},2024-01-01T00:{i // 60:02d}:{i % 60:02d},Item {i}\n' for i in range(500))
+        path = self.write('many.csv', 'hobby_name,amount,date,description\n' + rows)
+        spec = IngestSpec(entry_type='expense', input_format='csv')
+        stats = ingest_file(self.db, path, spec, workers=2, chunk_size=37)
+        
+        self.assertEqual(stats['added'], 500)
+        ids = [e.id for e in sorted(self.db.list_expenses(), key=lambda e: e.amount)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertGreater(stats['rows_per_second'], 0)
+    
+    def test_default_hobby_and_missing_columns(self):
+        """Test --hobby for files without a hobby column, and header checks."""
+        path = self.write('rowing.csv', 'amount,date\n10,2024-03-01\n')
+        spec = IngestSpec(entry_type='expense', input_format='csv', default_hobby='Rowing')
+        self.assertEqual(ingest_file(self.db, path, spec, workers=0)['added'], 1)
+        
+        with self.assertRaises(IngestError):
+            ingest_file(self.db, path, IngestSpec(entry_type='expense', input_format='csv'), workers=0)
+        with self.assertRaises(IngestError):
+            parse_column_map('colour=Farbe')
+
+
+if __name__ == '__main__':
+    unittest.main()
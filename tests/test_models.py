@@ -0,0 +1,72 @@
+"""
+Tests for the data models.
+"""
+import unittest
+import pickle
+from dataclasses import asdict, replace
+from datetime import datetime
+
+from hobby_budget_tracker.models import Hobby, Expense, Activity, finite_float, isoformat
+
+
+class TestModels(unittest.TestCase):
+    """Test slotted models and lazily parsed dates."""
+    
+    def test_models_are_slotted(self):
+        """Test that instances carry no per-instance dict."""
+        for entry in (Hobby(id=None, name="Chess"),
+                      Expense(id=None, hobby_id=1, amount=2.0),
+                      Activity(id=None, hobby_id=1, duration_hours=1.5)):
+            with self.subTest(model=type(entry).__name__):
+                self.assertFalse(hasattr(entry, '__dict__'))
+                with self.assertRaises(AttributeError):
+                    entry.unknown = 1
+    
+    def test_lazy_date_is_parsed_on_access(self):
+        """Test that ISO text passed as a date reads back as a datetime."""
+        expense = Expense(1, 2, 9.5, "Chalk", "2024-03-01T18:30:00")
+        self.assertEqual(expense.date, datetime(2024, 3, 1, 18, 30))
+        self.assertEqual(expense, Expense(1, 2, 9.5, "Chalk", datetime(2024, 3, 1, 18, 30)))
+        hobby = Hobby(1, "Chess", "", "2023-05-06T07:08:09.123456")
+        self.assertEqual(hobby.created_at.microsecond, 123456)
+    
+    def test_from_row(self):
+        """Test that the row constructor matches the regular constructor."""
+        row = (4, 2, 1.25, "Chalk", "2024-03-01T18:30:00")
+        expense = Expense._from_row(*row)
+        self.assertEqual(expense, Expense(*row))
+        self.assertEqual(isoformat(expense, 'date'), row[4])
+        self.assertEqual(Activity._from_row(*row).duration_hours, 1.25)
+    
+    def test_isoformat_skips_parsing(self):
+        """Test that isoformat returns canonical text as stored."""
+        for text in ("2024-03-01T18:30:00", "2024-03-01T18:30:00.250000"):
+            activity = Activity(1, 2, 1.0, "", text)
+            self.assertEqual(isoformat(activity, 'date'), text)
+        # Non-canonical text is normalized like datetime.isoformat() does
+        activity = Activity(1, 2, 1.0, "", "2024-03-01 18:30:00.000000")
+        self.assertEqual(isoformat(activity, 'date'), "2024-03-01T18:30:00")
+        activity.date = datetime(2024, 1, 2, 3, 4, 5)
+        self.assertEqual(isoformat(activity, 'date'), "2024-01-02T03:04:05")
+    
+    def test_finite_float(self):
+        """Test that amounts and durations must be finite numbers."""
+        self.assertEqual(finite_float("12.5"), 12.5)
+        self.assertEqual(finite_float(3), 3.0)
+        for value in ("inf", "-Infinity", "nan", 1e309, "x", None):
+            with self.assertRaises((ValueError, TypeError)):
+                finite_float(value)
+    
+    def test_dataclass_helpers(self):
+        """Test that slotted models still work with dataclass helpers and pickle."""
+        expense = Expense(1, 2, 9.5, "Chalk", "2024-03-01T18:30:00")
+        self.assertEqual(replace(expense, amount=1.0).amount, 1.0)
+        self.assertEqual(asdict(expense)['date'], datetime(2024, 3, 1, 18, 30))
+        self.assertEqual(pickle.loads(pickle.dumps(expense)), expense)
+        self.assertEqual(repr(Hobby(3, "Go", created_at=datetime(2024, 1, 1))),
+                         "Hobby(id=3, name='Go', description='', "
+                         "created_at=datetime.datetime(2024, 1, 1, 0, 0), target_value=None)")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for the database connection pool.
+"""
+import unittest
+import tempfile
+import os
+import threading
+
+from hobby_budget_tracker.pool import DatabasePool
+from hobby_budget_tracker.web import create_app
+from hobby_budget_tracker.models import Hobby
+
+
+class TestDatabasePool(unittest.TestCase):
+    """Test connection pool behaviour."""
+    
+    def setUp(self):
+        """Set up test pool."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.pool = DatabasePool(self.temp_db.name, size=2)
+    
+    def tearDown(self):
+        """Clean up test pool."""
+        self.pool.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_released_connection_is_reused(self):
+        """Test that a released connection is handed out again."""
+        db = self.pool.acquire()
+        self.pool.release(db)
+        self.assertIs(self.pool.acquire(), db)
+    
+    def test_idle_connections_are_bounded(self):
+        """Test that connections beyond the pool size are closed on release."""
+        dbs = [self.pool.acquire() for _ in range(3)]
+        for db in dbs:
+            self.pool.release(db)
+        self.assertEqual(self.pool.idle_count(), 2)
+    
+    def test_release_rolls_back_open_transaction(self):
+        """Test that uncommitted work does not leak into the next checkout."""
+        db = self.pool.acquire()
+        db.conn.execute("INSERT INTO hobbies (name, created_at) VALUES ('Leak', '2024-01-01')")
+        self.pool.release(db)
+        
+        db = self.pool.acquire()
+        self.assertIsNone(db.get_hobby_by_name('Leak'))
+    
+    def test_connection_usable_from_other_thread(self):
+        """Test that pooled connections can move between threads."""
+        db = self.pool.acquire()
+        db.add_hobby(Hobby(id=None, name='Climbing'))
+        self.pool.release(db)
+        
+        result = []
+        
+        def worker():
+            conn = self.pool.acquire()
+            result.append(conn.get_hobby_by_name('Climbing'))
+            self.pool.release(conn)
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(result[0].name, 'Climbing')
+    
+    def test_acquire_after_close_fails(self):
+        """Test that a closed pool refuses checkouts."""
+        self.pool.close()
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire()
+    
+    def test_invalid_size(self):
+        """Test that a pool needs room for at least one connection."""
+        with self.assertRaises(ValueError):
+            DatabasePool(self.temp_db.name, size=0)
+
+
+class TestWebPool(unittest.TestCase):
+    """Test connection pooling in the web app."""
+    
+    def setUp(self):
+        """Set up test client."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        os.unlink(self.temp_db.name)
+    
+    def test_requests_share_pooled_connection(self):
+        """Test that consecutive requests reuse one warm connection."""
+        app = create_app(self.temp_db.name, pool_size=2)
+        client = app.test_client()
+        client.post('/api/hobbies', json={'name': 'Hiking'})
+        client.get('/api/hobbies')
+        
+        pool = app.extensions['db_pool']
+        self.assertEqual(pool.idle_count(), 1)
+        pool.close()
+    
+    def test_streamed_export_holds_its_connection(self):
+        """Test that an export keeps its connection until the stream is closed."""
+        app = create_app(self.temp_db.name, pool_size=2)
+        client = app.test_client()
+        client.get('/api/hobbies')
+        pool = app.extensions['db_pool']
+        
+        response = client.get('/api/export', buffered=False)
+        chunks = iter(response.response)
+        next(chunks)
+        self.assertEqual(pool.idle_count(), 0)
+        
+        b''.join(chunks)
+        response.close()
+        self.assertEqual(pool.idle_count(), 1)
+        pool.close()
+    
+    def test_storage_profile_is_applied(self):
+        """Test that pooled connections use the configured storage profile."""
+        app = create_app(self.temp_db.name, pool_size=2, storage_profile='wal')
+        client = app.test_client()
+        self.assertEqual(client.post('/api/hobbies', json={'name': 'Golf'}).status_code, 201)
+        
+        pool = app.extensions['db_pool']
+        db = pool.acquire()
+        self.assertEqual(db.conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        pool.release(db)
+        pool.close()
+        
+        with self.assertRaises(ValueError):
+            DatabasePool(self.temp_db.name, storage_profile='turbo')
+    
+    def test_pool_disabled(self):
+        """Test that a pool size of 0 opens a connection per request."""
+        app = create_app(self.temp_db.name, pool_size=0)
+        client = app.test_client()
+        response = client.get('/api/hobbies')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('db_pool', app.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
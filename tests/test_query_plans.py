@@ -0,0 +1,145 @@
+"""
+Query plan regression tests.
+
+Every statement issued by the Database methods is captured and run through
+EXPLAIN QUERY PLAN, so a query change that silently falls back to a full
+table scan fails here. When adding a Database method, exercise it in
+``exercise_database`` below.
+"""
+import unittest
+import tempfile
+import os
+import re
+from datetime import date, datetime
+
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.models import Hobby, Expense, Activity
+
+
+# Plan lines such as "SCAN expenses" (no index) are rejected, while
+# "SCAN expenses USING INDEX ..." and scans of subqueries are fine.
+FULL_SCAN = re.compile(r"^SCAN (?!\(subquery|CONSTANT ROW)(\w+)(?!.*\bUSING\b)")
+
+# Tables with one row per hobby (and the aliases database.py gives them) may
+# be read in full; only expenses and activities grow with usage.
+PER_HOBBY_TABLES = {"hobbies", "h", "hobby_totals", "t"}
+
+# Bookkeeping tables with one row per versioned table, read in full as well
+PER_TABLE_TABLES = {"table_versions", "v", "sqlite_sequence", "s"}
+
+QUERY_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+class TracingDatabase(Database):
+    """Database that records every SQL statement it executes."""
+    
+    def _connect(self):
+        super()._connect()
+        self.statements = []
+        self.conn.set_trace_callback(self.statements.append)
+
+
+def exercise_database(db: Database):
+    """Call every Database query method at least once."""
+    hobby_id = db.add_hobby(Hobby(id=None, name="Photography", target_value=10.0))
+    other_id = db.add_hobby(Hobby(id=None, name="Hiking"))
+    db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=100.0, date=datetime(2024, 1, 1)))
+    db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=5.0, date=datetime(2024, 1, 2)))
+    
+    expense_id = db.add_expense(Expense(id=None, hobby_id=hobby_id, amount=20.0, date=datetime(2024, 1, 3)))
+    activity_id = db.add_activity(Activity(id=None, hobby_id=hobby_id, duration_hours=1.0,
+                                           date=datetime(2024, 1, 3)))
+    db.update_expense(expense_id, amount=25.0)
+    db.update_activity(activity_id, hobby_id=other_id)
+    db.delete_expense(expense_id)
+    db.delete_activity(activity_id)
+    
+    db.get_hobby(hobby_id)
+    db.get_hobby_by_name("Photography")
+    db.list_hobbies()
+    db.update_hobby(hobby_id, description="Taking photos")
+    db.list_expenses()
+    db.list_expenses(hobby_id)
+    db.list_activities()
+    db.list_activities(hobby_id)
+    db.list_expenses(limit=10, before=("2024-06-01", 3))
+    db.list_expenses(hobby_id, limit=10, before=("2024-06-01", 3))
+    db.list_activities(limit=10, before=("2024-06-01", 3))
+    db.list_activities(hobby_id, limit=10, before=("2024-06-01", 3))
+    db.get_total_expenses(hobby_id)
+    db.get_total_hours(hobby_id)
+    db.get_expense_per_hour(hobby_id)
+    db.get_hobby_totals(hobby_id)
+    db.list_expenses(start=date(2024, 1, 1), end=date(2024, 1, 31))
+    db.list_expenses(hobby_id, start=date(2024, 1, 1))
+    db.list_activities(end=date(2024, 1, 31))
+    db.list_activities(hobby_id, limit=10, start=date(2024, 1, 1), end=date(2024, 1, 31))
+    db.get_total_expenses(hobby_id, start=date(2024, 1, 1), end=date(2024, 1, 31))
+    db.get_total_hours(hobby_id, end=date(2024, 1, 31))
+    db.get_expense_per_hour(hobby_id, start=date(2024, 1, 1))
+    db.get_summary()
+    db.get_dashboard()
+    list(db.iter_expenses_with_hobby(hobby_id, start=date(2024, 1, 1), limit=10))
+    list(db.iter_activities_with_hobby(before=("2024-06-01", 3)))
+    db.verify_hobby_totals()
+    db.rebuild_hobby_totals()
+    db.get_expense_per_hour_time_series(hobby_id)
+    db.get_daily_totals()
+    db.get_daily_totals(hobby_id)
+    db.get_table_versions()
+    db.list_expenses_json()
+    db.list_expenses_json(hobby_id, limit=10, before=("2024-06-01", 3), start=date(2024, 1, 1))
+    db.list_activities_json(end=date(2024, 1, 31))
+    db.list_activities_json(hobby_id, limit=10)
+    db.delete_hobby(other_id)
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Test that queries are served by indexes."""
+    
+    def setUp(self):
+        """Set up a traced test database."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db = TracingDatabase(self.temp_db.name)
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.db.close()
+        os.unlink(self.temp_db.name)
+    
+    def _captured_queries(self):
+        """Return the distinct queries issued while exercising the database."""
+        self.db.statements.clear()
+        exercise_database(self.db)
+        self.db.conn.set_trace_callback(None)
+        queries = []
+        for statement in self.db.statements:
+            if statement.lstrip().upper().startswith(QUERY_PREFIXES) and statement not in queries:
+                queries.append(statement)
+        return queries
+    
+    def test_no_full_table_scans(self):
+        """Test that no query plan contains an unindexed table scan."""
+        queries = self._captured_queries()
+        self.assertTrue(queries)
+        for query in queries:
+            plan = [row[3] for row in self.db.conn.execute("EXPLAIN QUERY PLAN " + query)]
+            for line in plan:
+                match = FULL_SCAN.match(line)
+                with self.subTest(query=" ".join(query.split())):
+                    self.assertTrue(match is None or match.group(1) in PER_HOBBY_TABLES | PER_TABLE_TABLES,
+                                    f"Full table scan: {line}")
+    
+    def test_totals_use_covering_index(self):
+        """Test that per-hobby sums are answered from the index alone."""
+        for query in ("SELECT SUM(amount) FROM expenses WHERE hobby_id = 1",
+                      "SELECT SUM(duration_hours) FROM activities WHERE hobby_id = 1",
+                      "SELECT SUM(amount), COUNT(*) FROM expenses "
+                      "WHERE hobby_id = 1 AND date >= '2024-01-01' AND date < '2024-02-01'"):
+            plan = " ".join(row[3] for row in self.db.conn.execute("EXPLAIN QUERY PLAN " + query))
+            self.assertIn("COVERING INDEX", plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
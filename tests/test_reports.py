@@ -0,0 +1,107 @@
+"""
+Tests for the report process pool.
+"""
+import unittest
+import tempfile
+import os
+import sqlite3
+import time
+from datetime import date, datetime
+
+from hobby_budget_tracker.analytics import build_report
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.models import Hobby, Expense, Activity
+from hobby_budget_tracker.reports import ReportExecutor, ReportTimeoutError
+from hobby_budget_tracker.web import create_app
+
+
+def _add_hobby(db, name):
+    """Report that tries to write."""
+    return db.add_hobby(Hobby(id=None, name=name))
+
+
+def _slow_count(db, seconds):
+    """Report that takes ``seconds`` before counting hobbies."""
+    time.sleep(seconds)
+    return len(db.list_hobbies())
+
+
+class TestReportExecutor(unittest.TestCase):
+    """Test running reports in worker processes."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test database and one worker shared by all tests."""
+        cls.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        cls.temp_db.close()
+        cls.db = Database(cls.temp_db.name)
+        cls.hobby_id = cls.db.add_hobby(Hobby(id=None, name="Climbing"))
+        cls.db.add_expense(Expense(id=None, hobby_id=cls.hobby_id, amount=60.0, date=datetime(2024, 6, 10)))
+        cls.db.add_activity(Activity(id=None, hobby_id=cls.hobby_id, duration_hours=2.0, date=datetime(2024, 6, 11)))
+        cls.executor = ReportExecutor(cls.temp_db.name, workers=1)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the worker and clean up the test database."""
+        cls.executor.close()
+        cls.db.close()
+        os.unlink(cls.temp_db.name)
+    
+    def test_matches_inline_report(self):
+        """Test that a worker computes the same report as the calling process."""
+        self.assertEqual(
+            self.executor.run(build_report, as_of=date(2024, 6, 30), use_numpy=False),
+            build_report(self.db, as_of=date(2024, 6, 30), use_numpy=False),
+        )
+        self.assertEqual(
+            self.executor.run(Database.get_expense_per_hour_time_series, self.hobby_id),
+            self.db.get_expense_per_hour_time_series(self.hobby_id),
+        )
+    
+    def test_workers_are_read_only(self):
+        """Test that a report cannot modify the database."""
+        with self.assertRaises(sqlite3.OperationalError):
+            self.executor.run(_add_hobby, "Chess")
+        self.assertEqual(len(self.db.list_hobbies()), 1)
+    
+    def test_timeout(self):
+        """Test that a slow report raises ReportTimeoutError."""
+        with self.assertRaises(ReportTimeoutError):
+            self.executor.run(_slow_count, 1.0, timeout=0.05)
+        # The worker is still usable once the slow report has finished
+        self.assertEqual(self.executor.run(_slow_count, 0), 1)
+    
+    def test_invalid_workers_and_closed(self):
+        """Test argument validation and submitting after close."""
+        with self.assertRaises(ValueError):
+            ReportExecutor(self.temp_db.name, workers=0)
+        executor = ReportExecutor(self.temp_db.name, workers=1)
+        executor.close()
+        with self.assertRaises(RuntimeError):
+            executor.submit(_slow_count, 0)
+    
+    def test_web_reports_in_workers(self):
+        """Test that the web app serves charts and analytics from workers."""
+        app = create_app(self.temp_db.name, report_workers=1)
+        app.config['TESTING'] = True
+        try:
+            client = app.test_client()
+            response = client.get(f'/api/hobbies/{self.hobby_id}/chart-data')
+            self.assertEqual(response.status_code, 200)
+            response = client.get('/api/analytics?as_of=2024-06-30')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['hobbies'][0]['rolling'][0]['expense_per_hour'], 30.0)
+            
+            # Keep the only worker busy so the next report cannot finish in time
+            busy = app.extensions['report_executor'].submit(_slow_count, 1.0)
+            app.config['REPORT_TIMEOUT'] = 0.05
+            response = client.get('/api/analytics')
+            self.assertEqual(response.status_code, 504)
+            self.assertEqual(response.get_json(), {'error': 'Report timed out'})
+            busy.result()
+        finally:
+            app.extensions['report_executor'].close()
+
+
+if __name__ == '__main__':
+    unittest.main()
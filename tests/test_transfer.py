@@ -0,0 +1,125 @@
+"""
+Tests for streaming import.
+"""
+import unittest
+import tempfile
+import os
+import io
+import json
+
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.models import Hobby
+from hobby_budget_tracker.transfer import (
+    InvalidImportError, _JsonStreamReader, import_stream, iter_object_members
+)
+
+
+def as_stream(document) -> io.BytesIO:
+    """Encode a document as a binary JSON stream."""
+    return io.BytesIO(json.dumps(document).encode('utf-8'))
+
+
+class TestJsonStreaming(unittest.TestCase):
+    """Test the incremental JSON parser."""
+    
+    def test_members_across_tiny_reads(self):
+        """Test values split at every possible read boundary."""
+        document = {
+            'version': '1.0',
+            'count': 12345,
+            'hobbies': [{'id': 1, 'name': 'Café ☕'}, {'id': 2, 'name': 'Zürich'}],
+            'nested': {'a': [1, 2.5, None, True]},
+        }
+        for read_size in (1, 2, 3, 7):
+            members = []
+            for key, value in iter_object_members(as_stream(document), read_size=read_size):
+                members.append((key, list(value) if key == 'hobbies' else value))
+            self.assertEqual(dict(members), document, f"read_size={read_size}")
+    
+    def test_unconsumed_sections_are_skipped(self):
+        """Test that advancing past a streamed section skips its elements."""
+        document = {'hobbies': [{'id': i} for i in range(5)], 'version': '1.0'}
+        keys = [key for key, _ in iter_object_members(as_stream(document), read_size=4)]
+        self.assertEqual(keys, ['hobbies', 'version'])
+    
+    def test_buffer_stays_bounded(self):
+        """Test that walking a long array keeps only a small buffer."""
+        data = json.dumps([{'id': i, 'description': 'x' * 20} for i in range(5000)]).encode()
+        reader = _JsonStreamReader(io.BytesIO(data), read_size=256)
+        largest = 0
+        count = 0
+        for _ in reader.array_items():
+            count += 1
+            largest = max(largest, len(reader._buffer))
+        self.assertEqual(count, 5000)
+        self.assertLess(largest, 1024)
+    
+    def test_malformed_input(self):
+        """Test that broken documents raise InvalidImportError."""
+        for text in (b'', b'[1, 2]', b'{"version": "1.0"', b'{"hobbies": [1 2]}', b'{"a": 1} trailing'):
+            with self.subTest(text=text):
+                with self.assertRaises(InvalidImportError):
+                    for key, value in iter_object_members(io.BytesIO(text), read_size=3):
+                        if key == 'hobbies':
+                            list(value)
+
+
+class TestImportStream(unittest.TestCase):
+    """Test importing exports from a stream."""
+    
+    def setUp(self):
+        """Set up test database."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db = Database(self.temp_db.name)
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.db.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_import_in_batches(self):
+        """Test importing more entries than one batch holds."""
+        document = {
+            'version': '1.0',
+            'hobbies': [{'id': 5, 'name': 'Running', 'created_at': '2023-01-01T00:00:00'}],
+            'expenses': [{'id': i, 'hobby_id': 5, 'amount': 2.0, 'date': '2024-01-01T00:00:00'}
+                         for i in range(25)],
+            'activities': [{'id': 1, 'hobby_id': 5, 'duration_hours': 10.0, 'date': '2024-01-01T00:00:00'}],
+        }
+        counts = import_stream(self.db, as_stream(document), batch_size=4)
+        
+        self.assertEqual(counts, {'hobbies_imported': 1, 'expenses_imported': 25, 'activities_imported': 1})
+        hobby = self.db.get_hobby_by_name('Running')
+        self.assertEqual(hobby.created_at.year, 2023)
+        self.assertEqual(self.db.get_expense_per_hour(hobby.id), 5.0)
+    
+    def test_entries_before_hobbies_are_remapped(self):
+        """Test that member order does not change the ID remapping."""
+        existing_id = self.db.add_hobby(Hobby(id=None, name='Chess'))
+        text = (b'{"expenses": [{"id": 1, "hobby_id": 3, "amount": 9.5, "date": "2024-01-01T00:00:00"}],'
+                b' "hobbies": [{"id": 3, "name": "Chess"}], "version": "1.0"}')
+        counts = import_stream(self.db, io.BytesIO(text))
+        
+        self.assertEqual(counts['hobbies_imported'], 0)
+        self.assertEqual(counts['expenses_imported'], 1)
+        self.assertEqual(self.db.get_total_expenses(existing_id), 9.5)
+    
+    def test_non_finite_values_import_nothing(self):
+        """Test that infinite or NaN amounts, which JSON cannot return, are rejected."""
+        text = (b'{"version": "1.0", "hobbies": [{"id": 1, "name": "Go"}],'
+                b' "expenses": [{"id": 1, "hobby_id": 1, "amount": Infinity, "date": "2024-01-01T00:00:00"}]}')
+        with self.assertRaises(ValueError):
+            import_stream(self.db, io.BytesIO(text))
+        self.assertEqual(self.db.list_hobbies(), [])
+    
+    def test_missing_version_imports_nothing(self):
+        """Test that a document without version is rejected and rolled back."""
+        document = {'hobbies': [{'id': 1, 'name': 'Go'}]}
+        with self.assertRaises(InvalidImportError):
+            import_stream(self.db, as_stream(document))
+        self.assertEqual(self.db.list_hobbies(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
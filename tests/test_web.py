@@ -5,7 +5,9 @@ import unittest
 import tempfile
 import os
 import json
+from datetime import datetime
 
+from hobby_budget_tracker.database import Database
 from hobby_budget_tracker.web import create_app
 from hobby_budget_tracker.models import Hobby, Expense, Activity
 
@@ -215,7 +217,408 @@ class TestWebInterface(unittest.TestCase):
         """Test deleting a hobby that doesn't exist."""
         response = self.client.delete('/api/hobbies/999')
         self.assertEqual(response.status_code, 404)
-
+    
+    def test_import_data(self):
+        """Test importing hobbies, expenses and activities with ID remapping."""
+        self.client.post('/api/hobbies', json={'name': 'Chess'})
+        response = self.client.post('/api/import', json={
+            'version': '1.0',
+            'hobbies': [
+                {'id': 7, 'name': 'Chess', 'description': ''},
+                {'id': 8, 'name': 'Go', 'description': 'Board game', 'created_at': '2023-05-01T12:00:00'},
+                {'id': 9, 'name': 'Go', 'description': 'Duplicate in file'},
+            ],
+            'expenses': [
+                {'id': 1, 'hobby_id': 7, 'amount': 20.0, 'date': '2024-01-01T10:00:00'},
+                {'id': 2, 'hobby_id': 9, 'amount': 30.0, 'date': '2024-01-02T10:00:00'},
+                {'id': 3, 'hobby_id': 99, 'amount': 40.0, 'date': '2024-01-03T10:00:00'},
+            ],
+            'activities': [
+                {'id': 1, 'hobby_id': 8, 'duration_hours': 3.0, 'date': '2024-01-02T10:00:00'},
+            ],
+        })
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['hobbies_imported'], 1)
+        self.assertEqual(data['expenses_imported'], 2)
+        self.assertEqual(data['activities_imported'], 1)
+        
+        summary = {entry['name']: entry for entry in json.loads(self.client.get('/api/summary').data)}
+        self.assertEqual(summary['Chess']['total_expenses'], 20.0)
+        self.assertEqual(summary['Go']['expense_per_hour'], 10.0)
+    
+    def test_import_failure_rolls_back(self):
+        """Test that an import error leaves the database unchanged."""
+        response = self.client.post('/api/import', json={
+            'version': '1.0',
+            'hobbies': [{'id': 1, 'name': 'Go'}],
+            'expenses': [{'id': 1, 'hobby_id': 1, 'amount': 20.0, 'date': 'not a date'}],
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Import failed', json.loads(response.data)['error'])
+        self.assertEqual(json.loads(self.client.get('/api/hobbies').data), [])
+    
+    def test_import_requires_version(self):
+        """Test that files without a version are rejected."""
+        response = self.client.post('/api/import', json={'hobbies': []})
+        self.assertEqual(response.status_code, 400)
+    
+    def _add_export_data(self):
+        """Add two hobbies with entries on different days."""
+        response = self.client.post('/api/hobbies', json={'name': 'Café', 'description': 'Espresso ☕'})
+        cafe_id = json.loads(response.data)['id']
+        response = self.client.post('/api/hobbies', json={'name': 'Archery'})
+        archery_id = json.loads(response.data)['id']
+        for day, amount in ((1, 10.5), (2, 0.1), (3, 1e-7)):
+            self.client.post('/api/expenses', json={'hobby_id': cafe_id, 'amount': amount,
+                                                    'date': f'2024-01-0{day}T10:00:00'})
+        self.client.post('/api/expenses', json={'hobby_id': archery_id, 'amount': 99.0,
+                                                'date': '2024-01-02T12:30:00.250000'})
+        self.client.post('/api/activities', json={'hobby_id': cafe_id, 'duration_hours': 1.5,
+                                                  'date': '2024-01-02T08:00:00'})
+        return cafe_id, archery_id
+    
+    def test_export_is_identical_to_jsonify(self):
+        """Test that the streamed export matches the jsonify encoding byte for byte."""
+        from flask import jsonify
+        self._add_export_data()
+        
+        response = self.client.get('/api/export')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        export_date = json.loads(response.data)['export_date']
+        
+        with self.app.app_context():
+            from hobby_budget_tracker.database import Database
+            db = Database(self.temp_db.name)
+            expected = jsonify({
+                'version': '1.0',
+                'export_date': export_date,
+                'hobbies': [{'id': h.id, 'name': h.name, 'description': h.description,
+                             'created_at': h.created_at.isoformat()} for h in db.list_hobbies()],
+                'expenses': [{'id': e.id, 'hobby_id': e.hobby_id, 'amount': e.amount,
+                              'description': e.description, 'date': e.date.isoformat()}
+                             for e in db.list_expenses()],
+                'activities': [{'id': a.id, 'hobby_id': a.hobby_id, 'duration_hours': a.duration_hours,
+                                'description': a.description, 'date': a.date.isoformat()}
+                               for a in db.list_activities()],
+            }).get_data()
+            db.close()
+        self.assertEqual(response.data, expected)
+    
+    def test_export_filters(self):
+        """Test exporting one hobby and a date range."""
+        cafe_id, archery_id = self._add_export_data()
+        
+        data = json.loads(self.client.get(f'/api/export?hobby_id={archery_id}').data)
+        self.assertEqual([h['name'] for h in data['hobbies']], ['Archery'])
+        self.assertEqual([e['amount'] for e in data['expenses']], [99.0])
+        self.assertEqual(data['activities'], [])
+        
+        data = json.loads(self.client.get('/api/export?from=2024-01-02&to=2024-01-02').data)
+        self.assertEqual(len(data['hobbies']), 2)
+        self.assertEqual(sorted(e['amount'] for e in data['expenses']), [0.1, 99.0])
+        self.assertEqual(len(data['activities']), 1)
+        
+        response = self.client.get('/api/export?from=yesterday')
+        self.assertEqual(response.status_code, 400)
+    
+    def test_export_connection_and_cache(self):
+        """Test that the export takes its connection lazily and leaves the cache alone."""
+        self._add_export_data()
+        self.client.get('/api/summary')
+        pool = self.app.extensions['db_pool']
+        cache = self.app.extensions['query_cache']
+        idle, writes = pool.idle_count(), cache.writes
+        
+        # Called directly, as the test client always reads the first fragment
+        from werkzeug.test import EnvironBuilder
+        body = self.app(EnvironBuilder(path='/api/export').get_environ(), lambda status, headers: None)
+        self.assertEqual(pool.idle_count(), idle)
+        body.close()
+        self.assertEqual(pool.idle_count(), idle)
+        
+        body = self.app(EnvironBuilder(path='/api/export').get_environ(), lambda status, headers: None)
+        next(iter(body))
+        self.assertEqual(pool.idle_count(), idle - 1)
+        body.close()
+        self.assertEqual(pool.idle_count(), idle)
+        self.assertEqual(cache.writes, writes)
+    
+    def test_export_round_trip(self):
+        """Test that an export can be imported into another database."""
+        self._add_export_data()
+        exported = self.client.get('/api/export').data
+        
+        other_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        other_db.close()
+        try:
+            other = create_app(other_db.name).test_client()
+            response = other.post('/api/import', data=exported, content_type='application/json')
+            self.assertEqual(json.loads(response.data)['expenses_imported'], 4)
+            summary = json.loads(other.get('/api/summary').data)
+            self.assertEqual([entry['name'] for entry in summary], ['Archery', 'Café'])
+        finally:
+            os.unlink(other_db.name)
+    
+    def test_paginated_expenses(self):
+        """Test fetching expenses page by page with cursors."""
+        response = self.client.post('/api/hobbies', json={'name': 'Sailing'})
+        hobby_id = json.loads(response.data)['id']
+        for day in range(1, 6):
+            self.client.post('/api/expenses', json={'hobby_id': hobby_id, 'amount': float(day),
+                                                    'date': f'2024-02-0{day}T09:00:00'})
+        
+        amounts = []
+        cursor = None
+        pages = 0
+        while True:
+            url = f'/api/expenses?hobby_id={hobby_id}&limit=2' + (f'&cursor={cursor}' if cursor else '')
+            data = json.loads(self.client.get(url).data)
+            amounts.extend(item['amount'] for item in data['items'])
+            pages += 1
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        
+        self.assertEqual(pages, 3)
+        self.assertEqual(amounts, [5.0, 4.0, 3.0, 2.0, 1.0])
+    
+    def test_date_range_queries(self):
+        """Test from/to filters on listings and hobby stats."""
+        response = self.client.post('/api/hobbies', json={'name': 'Fencing'})
+        hobby_id = json.loads(response.data)['id']
+        for day, amount in ((1, 10.0), (2, 20.0), (3, 40.0)):
+            self.client.post('/api/expenses', json={'hobby_id': hobby_id, 'amount': amount,
+                                                    'date': f'2024-05-0{day}T20:00:00'})
+        self.client.post('/api/activities', json={'hobby_id': hobby_id, 'duration_hours': 3.0,
+                                                  'date': '2024-05-02T10:00:00'})
+        
+        data = json.loads(self.client.get('/api/expenses?from=2024-05-02&to=2024-05-02').data)
+        self.assertEqual([e['amount'] for e in data], [20.0])
+        data = json.loads(self.client.get('/api/expenses?from=2024-05-02&limit=1').data)
+        self.assertEqual([e['amount'] for e in data['items']], [40.0])
+        data = json.loads(self.client.get(f'/api/expenses?from=2024-05-02&limit=1&cursor={data["next_cursor"]}').data)
+        self.assertEqual([e['amount'] for e in data['items']], [20.0])
+        self.assertIsNone(data['next_cursor'])
+        data = json.loads(self.client.get('/api/activities?to=2024-05-01').data)
+        self.assertEqual(data, [])
+        
+        data = json.loads(self.client.get(f'/api/hobbies/{hobby_id}/stats?from=2024-05-02&to=2024-05-02').data)
+        self.assertEqual(data['total_expenses'], 20.0)
+        self.assertEqual(data['total_hours'], 3.0)
+        self.assertAlmostEqual(data['expense_per_hour'], 20.0 / 3.0)
+        
+        self.assertEqual(self.client.get('/api/expenses?from=May').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/hobbies/{hobby_id}/stats?to=2024-13-01').status_code, 400)
+    
+    def test_analytics(self):
+        """Test the KPI report endpoint."""
+        response = self.client.post('/api/hobbies', json={'name': 'Kayaking'})
+        hobby_id = json.loads(response.data)['id']
+        self.client.post('/api/expenses', json={'hobby_id': hobby_id, 'amount': 90.0,
+                                                'date': '2024-06-01T10:00:00'})
+        self.client.post('/api/activities', json={'hobby_id': hobby_id, 'duration_hours': 3.0,
+                                                  'date': '2024-06-02T10:00:00'})
+        
+        response = self.client.get(f'/api/analytics?as_of=2024-06-30&months=3&hobby_id={hobby_id}')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['as_of'], '2024-06-30')
+        hobby = data['hobbies'][0]
+        self.assertEqual(hobby['rolling'][0], {'days': 30, 'expenses': 90.0, 'hours': 3.0,
+                                               'expense_per_hour': 30.0})
+        self.assertEqual([month['month'] for month in hobby['monthly']], ['2024-04', '2024-05', '2024-06'])
+        self.assertEqual(len(hobby['weekdays']), 7)
+        
+        self.assertEqual(self.client.get('/api/analytics?as_of=June').status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics?months=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics?hobby_id=999').status_code, 404)
+    
+    def test_paginated_list_errors(self):
+        """Test invalid limit and cursor values."""
+        self.assertEqual(self.client.get('/api/activities?limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/activities?limit=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/activities?limit=5&cursor=@@').status_code, 400)
+        data = json.loads(self.client.get('/api/activities?limit=5').data)
+        self.assertEqual(data, {'items': [], 'next_cursor': None})
+    
+    def test_conditional_get(self):
+        """Test ETags and 304 Not Modified responses."""
+        response = self.client.get('/api/hobbies')
+        etag = response.headers['ETag']
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        response = self.client.get('/api/hobbies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        
+        hobby_id = json.loads(self.client.post('/api/hobbies', json={'name': 'Chess'}).data)['id']
+        response = self.client.get('/api/hobbies', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        
+        # Expenses are unaffected by the new hobby, the summary is not
+        expenses_etag = self.client.get('/api/expenses').headers['ETag']
+        summary_etag = self.client.get('/api/summary').headers['ETag']
+        self.client.post('/api/activities', json={'hobby_id': hobby_id, 'duration_hours': 1.0,
+                                                  'date': '2024-01-01'})
+        self.assertEqual(self.client.get('/api/expenses', headers={'If-None-Match': expenses_etag}).status_code, 304)
+        self.assertEqual(self.client.get('/api/summary', headers={'If-None-Match': summary_etag}).status_code, 200)
+        
+        # Errors are not tagged
+        response = self.client.get('/api/hobbies/999/stats')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+    
+    def test_sql_json_matches_serializers(self):
+        """Test that SQLite-built list responses match the serializers field for field."""
+        db = Database(self.temp_db.name)
+        climbing = db.add_hobby(Hobby(id=None, name="Climbing"))
+        reading = db.add_hobby(Hobby(id=None, name="Reading"))
+        for i in range(7):
+            db.add_expense(Expense(id=None, hobby_id=climbing if i % 2 else reading, amount=i / 3 + 0.1,
+                                   description="Crêpes \"and\" chalk" if i % 3 else None,
+                                   date=datetime(2024, 1, 1 + i, 12, 30, 0, 250000 * (i % 2))))
+            db.add_activity(Activity(id=None, hobby_id=climbing, duration_hours=i + 20 / 60,
+                                     description="Session ✓", date=datetime(2024, 1, 1 + i % 3)))
+        db.close()
+        
+        fast_app = create_app(self.temp_db.name, sql_json=True)
+        fast_client = fast_app.test_client()
+        for path in ('/api/expenses', '/api/activities'):
+            for query in ('', f'?hobby_id={climbing}', '?from=2024-01-02&to=2024-01-04', '?hobby_id=999'):
+                with self.subTest(url=path + query):
+                    expected = self.client.get(path + query)
+                    actual = fast_client.get(path + query)
+                    self.assertEqual(actual.content_type, 'application/json')
+                    self.assertEqual(json.loads(actual.data), json.loads(expected.data))
+            
+            # Walk all pages with both apps
+            pages_by_client = {}
+            for client in (self.client, fast_client):
+                pages = []
+                cursor = ''
+                while cursor is not None:
+                    pages.append(json.loads(client.get(f'{path}?limit=3{cursor and "&cursor=" + cursor}').data))
+                    cursor = pages[-1]['next_cursor']
+                pages_by_client[client] = pages
+            self.assertEqual(pages_by_client[fast_client], pages_by_client[self.client])
+            self.assertEqual(len(pages_by_client[self.client]), 3)
+        
+        amounts = [item['amount'] for item in json.loads(fast_client.get('/api/expenses').data)]
+        self.assertTrue(all(isinstance(amount, float) for amount in amounts))
+        
+        # JSON has no infinities, so no write path may store one
+        for value in ('inf', '-Infinity', 'nan', 1e309):
+            with self.subTest(value=value):
+                response = fast_client.post('/api/expenses', json={'hobby_id': climbing, 'amount': value})
+                self.assertEqual(response.status_code, 400)
+                response = fast_client.post('/api/activities', json={'hobby_id': climbing, 'duration_hours': value})
+                self.assertEqual(response.status_code, 400)
+                response = fast_client.post('/api/batch', json={'operations': [
+                    {'op': 'create', 'type': 'expense', 'data': {'hobby_id': climbing, 'amount': value}}]})
+                self.assertEqual(response.status_code, 400)
+                response = fast_client.post('/api/batch', json={'operations': [
+                    {'op': 'update', 'type': 'activity', 'id': 1, 'data': {'duration_hours': value}}]})
+                self.assertEqual(response.status_code, 400)
+        for path in ('/api/expenses', '/api/activities'):
+            response = fast_client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(json.loads(response.data), json.loads(self.client.get(path).data))
+    
+    def test_batch(self):
+        """Test applying several operations in one request."""
+        hobby_id = json.loads(self.client.post('/api/hobbies', json={'name': 'Rowing'}).data)['id']
+        expense_id = json.loads(self.client.post('/api/expenses', json={
+            'hobby_id': hobby_id, 'amount': 10.0, 'date': '2024-03-01T09:00:00'}).data)['id']
+        
+        response = self.client.post('/api/batch', json={'operations': [
+            {'op': 'create', 'type': 'hobby', 'data': {'name': 'Sailing', 'target_value': '8'}},
+            {'op': 'create', 'type': 'expense', 'data': {'hobby_id': '$0', 'amount': 50}},
+            {'op': 'create', 'type': 'activity', 'data': {'hobby_id': '$0', 'duration_hours': 2.5,
+                                                          'date': '2024-03-02T10:00:00'}},
+            {'op': 'update', 'type': 'expense', 'id': expense_id, 'data': {'amount': 12.5}},
+            {'op': 'update', 'type': 'hobby', 'id': hobby_id, 'data': {'description': 'On water'}},
+            {'op': 'delete', 'type': 'activity', 'id': '$2'},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.data)['results']
+        self.assertEqual([result['status'] for result in results], [201, 201, 201, 200, 200, 200])
+        self.assertEqual([result.get('type') for result in results[:3]], ['hobby', 'expense', 'activity'])
+        sailing_id = results[0]['id']
+        
+        summary = {item['name']: item for item in json.loads(self.client.get('/api/summary').data)}
+        self.assertEqual(summary['Sailing']['total_expenses'], 50.0)
+        self.assertEqual(summary['Sailing']['total_hours'], 0.0)
+        self.assertEqual(summary['Rowing']['total_expenses'], 12.5)
+        stats = json.loads(self.client.get(f'/api/hobbies/{sailing_id}/stats').data)
+        self.assertEqual(stats['hobby']['target_value'], 8.0)
+        
+        # Invalid target values are ignored, as by the single-item endpoints
+        response = self.client.post('/api/batch', json={'operations': [
+            {'op': 'create', 'type': 'hobby', 'data': {'name': 'Kiting', 'target_value': 'lots'}},
+            {'op': 'update', 'type': 'hobby', 'id': sailing_id, 'data': {'target_value': 'more'}},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        hobbies = {h['name']: h for h in json.loads(self.client.get('/api/hobbies').data)}
+        self.assertIsNone(hobbies['Kiting']['target_value'])
+        self.assertEqual(hobbies['Sailing']['target_value'], 8.0)
+    
+    def test_batch_is_all_or_nothing(self):
+        """Test that a failing operation rolls back the whole batch."""
+        hobby_id = json.loads(self.client.post('/api/hobbies', json={'name': 'Rowing'}).data)['id']
+        before = self.client.get('/api/summary').data
+        
+        for operations, status, index in (
+            ([{'op': 'create', 'type': 'expense', 'data': {'hobby_id': hobby_id, 'amount': 5}},
+              {'op': 'delete', 'type': 'expense', 'id': 999}], 404, 1),
+            ([{'op': 'create', 'type': 'hobby', 'data': {'name': 'Sailing'}},
+              {'op': 'create', 'type': 'hobby', 'data': {'name': 'Rowing'}}], 400, 1),
+            ([{'op': 'create', 'type': 'activity', 'data': {'hobby_id': hobby_id}}], 400, 0),
+            ([{'op': 'create', 'type': 'expense', 'data': {'hobby_id': '$0', 'amount': 5}}], 400, 0),
+            ([{'op': 'create', 'type': 'expense', 'data': {'hobby_id': hobby_id, 'amount': 5}},
+              {'op': 'create', 'type': 'activity', 'data': {'hobby_id': '$0', 'duration_hours': 1}}], 400, 1),
+            ([{'op': 'create', 'type': 'expense', 'data': {'hobby_id': hobby_id, 'amount': 5}},
+              {'op': 'delete', 'type': 'activity', 'id': '$0'}], 400, 1),
+            ([{'op': 'rename', 'type': 'hobby', 'id': hobby_id}], 400, 0),
+        ):
+            with self.subTest(operations=operations):
+                response = self.client.post('/api/batch', json={'operations': operations})
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(json.loads(response.data)['index'], index)
+        
+        self.assertEqual(self.client.post('/api/batch', json={'operations': []}).status_code, 400)
+        self.assertEqual(self.client.post('/api/batch', data='oops').status_code, 400)
+        self.assertEqual(self.client.get('/api/summary').data, before)
+    
+    def test_dashboard(self):
+        """Test that the dashboard bundles hobbies, summary and recent entries."""
+        hobby_id = json.loads(self.client.post('/api/hobbies', json={'name': 'Rowing'}).data)['id']
+        for day in (1, 2, 3):
+            self.client.post('/api/expenses', json={'hobby_id': hobby_id, 'amount': day,
+                                                    'date': f'2024-03-0{day}T09:00:00'})
+        self.client.post('/api/activities', json={'hobby_id': hobby_id, 'duration_hours': 2,
+                                                  'date': '2024-03-01T10:00:00'})
+        
+        response = self.client.get('/api/dashboard?limit=2')
+        self.assertEqual(response.status_code, 200)
+        dashboard = json.loads(response.data)
+        self.assertEqual(dashboard['hobbies'], json.loads(self.client.get('/api/hobbies').data))
+        self.assertEqual(dashboard['summary'], json.loads(self.client.get('/api/summary').data))
+        expenses = json.loads(self.client.get('/api/expenses?limit=2').data)['items']
+        self.assertEqual(dashboard['expenses'], [dict(e, hobby_name='Rowing') for e in expenses])
+        self.assertEqual([a['hobby_name'] for a in dashboard['activities']], ['Rowing'])
+        page = json.loads(self.client.get('/api/expenses?limit=2').data)
+        self.assertEqual(dashboard['expenses_next_cursor'], page['next_cursor'])
+        rest = json.loads(self.client.get(f"/api/expenses?limit=2&cursor={dashboard['expenses_next_cursor']}").data)
+        self.assertEqual([e['amount'] for e in rest['items']], [1.0])
+        self.assertIsNone(dashboard['activities_next_cursor'])
+        
+        etag = response.headers['ETag']
+        response = self.client.get('/api/dashboard?limit=2', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/api/dashboard?limit=0').status_code, 400)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for the group-commit batch writer.
+"""
+import unittest
+import tempfile
+import os
+import json
+import threading
+from datetime import datetime
+
+from hobby_budget_tracker.database import Database
+from hobby_budget_tracker.models import Hobby, Expense, Activity
+from hobby_budget_tracker.web import create_app
+from hobby_budget_tracker.writer import BatchWriter
+
+
+class TestBatchWriter(unittest.TestCase):
+    """Test batching of expense and activity inserts."""
+    
+    def setUp(self):
+        """Set up test database and writer."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.db = Database(self.temp_db.name)
+        self.hobby_id = self.db.add_hobby(Hobby(id=None, name="Cycling"))
+        self.writer = BatchWriter(self.temp_db.name, max_batch=10, max_delay_ms=20)
+    
+    def tearDown(self):
+        """Clean up writer and test database."""
+        self.writer.close()
+        self.db.close()
+        os.unlink(self.temp_db.name)
+    
+    def test_futures_resolve_to_row_ids(self):
+        """Test that every submitted entry is written and gets its own id."""
+        futures = []
+        for i in range(25):
+            futures.append(self.writer.submit(Expense(id=None, hobby_id=self.hobby_id, amount=float(i),
+                                                      date=datetime(2024, 1, 1))))
+        futures.append(self.writer.submit(Activity(id=None, hobby_id=self.hobby_id, duration_hours=4.0)))
+        ids = [future.result(timeout=5) for future in futures]
+        
+        expenses = {expense.id: expense.amount for expense in self.db.list_expenses()}
+        self.assertEqual([expenses[row_id] for row_id in ids[:25]], [float(i) for i in range(25)])
+        self.assertEqual(self.db.list_activities()[0].id, ids[25])
+        self.assertEqual(self.db.get_total_expenses(self.hobby_id), 300.0)
+    
+    def test_concurrent_submitters(self):
+        """Test that entries from many threads all end up committed."""
+        results = []
+        
+        def submit_many():
+            for _ in range(20):
+                future = self.writer.submit(Expense(id=None, hobby_id=self.hobby_id, amount=1.0))
+                results.append(future.result(timeout=5))
+        
+        threads = [threading.Thread(target=submit_many) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(results)), 100)
+        self.assertEqual(self.db.get_hobby_totals(self.hobby_id)['expense_count'], 100)
+    
+    def test_bad_entry_fails_alone(self):
+        """Test that an entry violating a constraint does not fail its batch."""
+        good = self.writer.submit(Expense(id=None, hobby_id=self.hobby_id, amount=5.0))
+        bad = self.writer.submit(Expense(id=None, hobby_id=None, amount=5.0))
+        self.assertIsInstance(good.result(timeout=5), int)
+        with self.assertRaises(Exception):
+            bad.result(timeout=5)
+        self.assertEqual(self.db.get_total_expenses(self.hobby_id), 5.0)
+    
+    def test_close_drains_queue(self):
+        """Test that closing writes queued entries and refuses new ones."""
+        futures = [self.writer.submit(Activity(id=None, hobby_id=self.hobby_id, duration_hours=1.0))
+                   for _ in range(50)]
+        self.writer.close()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(self.db.get_total_hours(self.hobby_id), 50.0)
+        with self.assertRaises(RuntimeError):
+            self.writer.submit(Activity(id=None, hobby_id=self.hobby_id, duration_hours=1.0))
+    
+    def test_rejects_other_objects(self):
+        """Test that only expenses and activities can be submitted."""
+        with self.assertRaises(TypeError):
+            self.writer.submit(Hobby(id=None, name="Chess"))
+
+
+class TestWebBatchWriter(unittest.TestCase):
+    """Test the web endpoints writing through the batch writer."""
+    
+    def setUp(self):
+        """Set up test client."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.app = create_app(self.temp_db.name, write_batch_size=50)
+        self.client = self.app.test_client()
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.app.extensions['batch_writer'].close()
+        self.app.extensions['db_pool'].close()
+        os.unlink(self.temp_db.name)
+    
+    def test_posts_use_writer(self):
+        """Test that posted entries are written by the batch writer."""
+        response = self.client.post('/api/hobbies', json={'name': 'Rowing'})
+        hobby_id = json.loads(response.data)['id']
+        response = self.client.post('/api/expenses', json={'hobby_id': hobby_id, 'amount': 30.0,
+                                                           'date': '2024-01-01T10:00:00'})
+        self.assertEqual(response.status_code, 201)
+        expense_id = json.loads(response.data)['id']
+        response = self.client.post('/api/activities', json={'hobby_id': hobby_id, 'duration_hours': 3.0,
+                                                             'date': '2024-01-01T10:00:00'})
+        self.assertEqual(response.status_code, 201)
+        
+        self.assertIn('batch_writer', self.app.extensions)
+        data = json.loads(self.client.get('/api/expenses').data)
+        self.assertEqual(data[0]['id'], expense_id)
+        data = json.loads(self.client.get(f'/api/hobbies/{hobby_id}/stats').data)
+        self.assertEqual(data['expense_per_hour'], 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,11 +17,37 @@ if project_home not in sys.path:
 # You can set DB_PATH environment variable to override
 db_path = os.environ.get('DB_PATH', os.path.join(project_home, 'hobby_budget.db'))
 
+# Number of warm database connections kept for reuse between requests
+# Set DB_POOL_SIZE=0 to open a new connection for every request
+pool_size = int(os.environ.get('DB_POOL_SIZE', '5'))
+
+# SQLite storage profile: 'default', 'wal' or 'wal-durable'
+# Use 'wal' when several workers write concurrently and the database lives
+# on a local disk (WAL does not work on network file systems)
+storage_profile = os.environ.get('DB_STORAGE_PROFILE', 'default')
+
+# Commit new expenses and activities in batches of up to this many entries
+# from a background writer thread; 0 writes each one directly
+write_batch_size = int(os.environ.get('WRITE_BATCH_SIZE', '0'))
+
+# Worker processes computing charts and reports on read-only connections
+# 0 computes them in the request thread
+report_workers = int(os.environ.get('REPORT_WORKERS', '0'))
+
+# Summary, stats and chart results kept in the query cache; 0 disables it
+cache_size = int(os.environ.get('CACHE_SIZE', '256'))
+
+# Let SQLite build the JSON of expense and activity lists; 0 uses the serializers
+sql_json = os.environ.get('SQL_JSON', '0') == '1'
+
 # Import the Flask app
 from hobby_budget_tracker.web import create_app
 
 # Create the application instance
-application = create_app(db_path=db_path)
+application = create_app(db_path=db_path, pool_size=pool_size, storage_profile=storage_profile,
+                         write_batch_size=write_batch_size, report_workers=report_workers,
+                         cache_size=cache_size, sql_json=sql_json)
+application.config['REPORT_TIMEOUT'] = float(os.environ.get('REPORT_TIMEOUT', '30'))
 
 # For debugging purposes (remove in production)
 # application.config['DEBUG'] = False